@@ -0,0 +1,106 @@
+"""
+Compares the previous per-contract option chain flattener with
+HelperFuncs._optionchain_to_dataframe on a synthetic SPX-sized chain.
+
+    python Examples/benchmark_chain_parser.py
+"""
+import random
+import timeit
+import tracemalloc
+import json
+import pandas as pd
+from schwab_api.chain_stream import ChainStreamParser
+from schwab_api.helper import HelperFuncs, OPTION_CONTRACT_SCHEMA
+
+
+def make_chain_fixture(n_expirations=60, n_strikes=200, seed=7):
+    rng = random.Random(seed)
+    underlying = {'symbol': '$SPX', 'description': 'S&P 500 INDEX', 'last': 4500.0, 'mark': 4500.0,
+                  'bid': 4499.5, 'ask': 4500.5, 'totalVolume': 0, 'delayed': False}
+    chain = {'symbol': '$SPX', 'status': 'SUCCESS', 'strategy': 'SINGLE', 'isIndex': True,
+             'underlyingPrice': 4500.0, 'interestRate': 5.0, 'volatility': 29.0,
+             'underlying': underlying, 'callExpDateMap': {}, 'putExpDateMap': {}}
+    for side, key in (('CALL', 'callExpDateMap'), ('PUT', 'putExpDateMap')):
+        for e in range(n_expirations):
+            exp_key = f"2025-{1 + e // 28:02d}-{1 + e % 28:02d}:{e}"
+            strikes = {}
+            for k in range(n_strikes):
+                strike = 3500.0 + 10 * k
+                contract = {}
+                for name, kind in OPTION_CONTRACT_SCHEMA.items():
+                    if kind == 'f':
+                        contract[name] = rng.random() * 10
+                    elif kind == 'i':
+                        contract[name] = rng.randrange(10 ** 6)
+                    elif kind == 'b':
+                        contract[name] = False
+                    else:
+                        contract[name] = 'X'
+                contract.update(putCall=side, strikePrice=strike, symbol=f"SPX {exp_key} {strike} {side[0]}",
+                                optionDeliverablesList=[{'symbol': '$SPX', 'assetType': 'INDEX',
+                                                         'deliverableUnits': 100.0}])
+                strikes[f"{strike}"] = [contract]
+            chain[key][exp_key] = strikes
+    return chain
+
+
+def legacy_optionchain_to_dataframe(json_data):
+    # the parser as it was before the columnar rewrite
+    rows = []
+    underlying_data = HelperFuncs._flatten_json(json_data.get("underlying", {}))
+    for side, key in (('CALL', 'callExpDateMap'), ('PUT', 'putExpDateMap')):
+        for exp_date, strikes in json_data.get(key, {}).items():
+            for options_list in strikes.values():
+                for option in options_list:
+                    row = underlying_data.copy()
+                    row.update(HelperFuncs._flatten_json(option))
+                    row.update(HelperFuncs._extract_specific_keys(option))
+                    row['exp_date_type'] = side
+                    row['exp_date'] = exp_date
+                    rows.append(row)
+    df = pd.DataFrame(rows)
+    return df.loc[:, ~df.columns.duplicated()]
+
+
+def parse_body(body):
+    # what get_option_chains does with a response body
+    return HelperFuncs()._optionchain_to_dataframe(json.loads(body))
+
+
+def stream_body(body, chunk_size=1 << 16):
+    # what iter_option_chains does: one expiration in memory at a time
+    contracts = 0
+    chunks = (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+    for side, exp_date, strikes in ChainStreamParser(chunks):
+        rows = [c for options_list in strikes.values() for c in options_list]
+        contracts += len(HelperFuncs._contracts_to_dataframe(rows, [side] * len(rows), [exp_date] * len(rows)))
+    return contracts
+
+
+def measure(fn, *args, repeat=3):
+    # best wall time of a few runs, then peak traced memory of one more run
+    elapsed = min(timeit.repeat(lambda: fn(*args), number=1, repeat=repeat))
+    tracemalloc.start()
+    result = fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == '__main__':
+    chain = make_chain_fixture()
+    helper = HelperFuncs()
+    legacy, legacy_time, legacy_peak = measure(legacy_optionchain_to_dataframe, chain)
+    columnar, columnar_time, columnar_peak = measure(helper._optionchain_to_dataframe, chain)
+    print(f"contracts: {len(columnar)}")
+    print(f"legacy:   {legacy_time * 1000:8.1f} ms  peak {legacy_peak / 2 ** 20:7.1f} MiB")
+    print(f"columnar: {columnar_time * 1000:8.1f} ms  peak {columnar_peak / 2 ** 20:7.1f} MiB")
+    print(f"speedup: {legacy_time / columnar_time:.1f}x, memory: {legacy_peak / columnar_peak:.1f}x lower")
+
+    body = json.dumps(chain).encode()
+    del chain, legacy, columnar
+    _, full_time, full_peak = measure(parse_body, body)
+    _, stream_time, stream_peak = measure(stream_body, body)
+    print(f"body: {len(body) / 2 ** 20:.1f} MiB")
+    print(f"json.loads + parse: {full_time * 1000:8.1f} ms  peak {full_peak / 2 ** 20:7.1f} MiB")
+    print(f"streamed:           {stream_time * 1000:8.1f} ms  peak {stream_peak / 2 ** 20:7.1f} MiB")
@@ -0,0 +1,34 @@
+"""
+Compares HelperFuncs._parse_json_to_dataframe with the columnar
+HelperFuncs._parse_quotes_to_dataframe on a synthetic 3,000-symbol quotes response.
+
+    python Examples/benchmark_quote_parser.py
+"""
+import random
+import timeit
+from schwab_api.helper import HelperFuncs, QUOTE_SCHEMA
+
+
+def make_quotes_fixture(n_symbols=3000, seed=7):
+    rng = random.Random(seed)
+    data = {}
+    for i in range(n_symbols):
+        quote = {name: (rng.random() * 100 if kind == 'f' else rng.randrange(10 ** 6) if kind == 'i' else 'X')
+                 for name, kind in QUOTE_SCHEMA['quote'].items()}
+        reference = {'cusip': f"{i:09d}", 'description': f"Company {i}", 'exchange': 'Q',
+                     'exchangeName': 'NASDAQ', 'isHardToBorrow': False, 'isShortable': True,
+                     'htbQuantity': 0, 'htbRate': 0.0}
+        data[f"SYM{i}"] = {'assetMainType': 'EQUITY', 'quoteType': 'NBBO', 'realtime': True, 'ssid': i,
+                           'symbol': f"SYM{i}", 'quote': quote, 'reference': reference}
+    return data
+
+
+if __name__ == '__main__':
+    fixture = make_quotes_fixture()
+    runs = 20
+    baseline = min(timeit.repeat(lambda: HelperFuncs._parse_json_to_dataframe(fixture), number=1, repeat=runs))
+    columnar = min(timeit.repeat(lambda: HelperFuncs._parse_quotes_to_dataframe(fixture, 'quote,reference'),
+                                 number=1, repeat=runs))
+    print(f"_parse_json_to_dataframe:   {baseline * 1000:8.2f} ms")
+    print(f"_parse_quotes_to_dataframe: {columnar * 1000:8.2f} ms")
+    print(f"speedup: {baseline / columnar:.1f}x")
@@ -0,0 +1,55 @@
+"""
+Compares building a DataFrame per LEVELONE_EQUITIES message with decoding the
+messages into a StreamDecoder and converting one batch at the end, on 20,000
+synthetic two-symbol messages.
+
+    python Examples/benchmark_stream_decoder.py
+"""
+import random
+import time
+import pandas as pd
+from schwab_api.stream_decode import StreamDecoder
+from schwab_api.stream_fields import DEFAULT_FIELDS, FIELDS, FIELD_KINDS
+
+
+def make_messages(n_messages=20000, n_symbols=500, seed=7):
+    rng = random.Random(seed)
+    fields = DEFAULT_FIELDS['LEVELONE_EQUITIES']
+    names, kinds = FIELDS['LEVELONE_EQUITIES'], FIELD_KINDS['LEVELONE_EQUITIES']
+    messages = []
+    for i in range(n_messages):
+        content = []
+        for _ in range(2):
+            entry = {'key': f"SYM{rng.randrange(n_symbols)}"}
+            for number in rng.sample(fields[1:], 4):
+                kind = kinds.get(names[number], 'f')
+                entry[str(number)] = rng.randrange(10 ** 6) if kind == 'i' else 'X' if kind == 'O' else rng.random()
+            content.append(entry)
+        messages.append({'service': 'LEVELONE_EQUITIES', 'timestamp': 1700000000000 + i, 'content': content})
+    return messages
+
+
+def per_message_frames(messages):
+    names = FIELDS['LEVELONE_EQUITIES']
+    for message in messages:
+        pd.DataFrame([{names[int(k)]: v for k, v in entry.items() if k.isdigit()} for entry in message['content']])
+
+
+def decoded(messages):
+    decoder = StreamDecoder('LEVELONE_EQUITIES')
+    for message in messages:
+        decoder.decode(message['content'], message['timestamp'])
+    return StreamDecoder.to_frame(decoder.drain())
+
+
+if __name__ == '__main__':
+    messages = make_messages()
+    started = time.perf_counter()
+    per_message_frames(messages)
+    baseline = time.perf_counter() - started
+    started = time.perf_counter()
+    frame = decoded(messages)
+    decoder = time.perf_counter() - started
+    print(f"DataFrame per message: {baseline:8.3f} s ({len(messages) / baseline:,.0f} msg/s)")
+    print(f"StreamDecoder + batch: {decoder:8.3f} s ({len(messages) / decoder:,.0f} msg/s, {len(frame)} ticks)")
+    print(f"speedup: {baseline / decoder:.1f}x")
@@ -5,15 +5,34 @@ from .market_data import MarketData
 from .fees import Fees
 from .helper import HelperFuncs
 from .urls import SchwabUrls
+from .session import SchwabSession
+from .rate_limit import RateLimiter, TokenBucket
+from .resilience import RetryPolicy, CircuitBreaker, CircuitBreakerRegistry
+from .cache import TTLCache, MarketDataCache
+from .coalesce import SingleFlight, AsyncSingleFlight
+from .option_chain import OptionChain
+from .chain_snapshot import ChainSnapshotStore, ChainDiff
+from .history_store import CandleStore, MmapCandleStore
+from .bulk_history import BulkHistoryJob
+from .scanner import OptionChainScanner, ScanResult
+from .exceptions import (SchwabAPIError, SchwabConnectionError, CircuitOpenError, SchwabHTTPError,
+                         SchwabClientError, SchwabAuthError, SchwabNotFoundError, SchwabRateLimitError,
+                         SchwabServerError, SchwabStreamError)
+from .async_session import AsyncSchwabSession, AsyncTokenProvider
+from .async_market_data import AsyncMarketData
+from .async_trades import AsyncTrader
+from .streamer import SchwabStreamer
+from .stream_decode import StreamDecoder
 from .auth import SchwabAuthe as HeadlessAuth
 
 class SchwabAPI:
-    def __init__(self, client_id, client_secret):
-        self.auth = SchwabAuth(client_id, client_secret)
-        self.trader = Trader(self.auth)
+    def __init__(self, client_id, client_secret, session=None):
+        self.session = session if session is not None else SchwabSession()
+        self.auth = SchwabAuth(client_id, client_secret, session=self.session)
+        self.trader = Trader(self.auth, session=self.session)
         self.strategies = Strategies(self.auth)
-        self.market_data = MarketData(self.auth)
-        self.fees = Fees(self.auth)
+        self.market_data = MarketData(self.auth, session=self.session)
+        self.fees = Fees(self.auth, session=self.session)
         self.helper = HelperFuncs()
         self.urls = SchwabUrls()
-        self.headless_auth = HeadlessAuth(client_id, client_secret)
+        self.headless_auth = HeadlessAuth(client_id, client_secret, session=self.session)
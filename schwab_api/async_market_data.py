@@ -0,0 +1,369 @@
+import asyncio
+import logging
+import time
+import pandas as pd
+from typing import Union
+from schwab_api.market_data import MarketData
+from schwab_api.async_session import AsyncSchwabSession, AsyncTokenProvider
+from schwab_api.utils import handle_response
+from schwab_api.cache import MISSING, MarketDataCache, make_key
+from schwab_api.option_chain import OptionChain
+from schwab_api.coalesce import AsyncSingleFlight
+from schwab_api.exceptions import SchwabAPIError
+from schwab_api.async_trades import AsyncTrader
+
+
+logger = logging.getLogger(__name__)
+
+
+def _sync_only(name, alternative):
+    def method(self, *args, **kwargs):
+        raise TypeError(f"{name} is only supported on the synchronous MarketData; {alternative}")
+
+    method.__name__ = name
+    method.__doc__ = f"""
+        Not available on AsyncMarketData; {alternative}.
+
+        :raises TypeError: Always
+        """
+    return method
+
+
+class AsyncMarketData(MarketData):
+    """
+    Awaitable counterpart of MarketData.
+
+    Every REST method has the same name and arguments as in MarketData but is a
+    coroutine, so many requests can be fanned out from one event loop with
+    ``asyncio.gather`` over a single pooled connector. ASYNC_METHODS lists the
+    supported public methods; the MarketData methods in SYNC_ONLY_METHODS raise
+    TypeError because their bodies need the blocking session.
+    """
+
+    ASYNC_METHODS = (
+        'get_symbol_quote', 'get_quotes', 'get_quotes_bulk', 'get_option_chains',
+        'get_option_chains_by_expiration', 'get_option_expiration_chain', 'get_historical_data',
+        'get_historical_range', 'get_active_gainers_losers', 'get_all_market_hours', 'get_market_hours',
+        'get_instruments', 'get_instrument_by_cusip', 'stream_real_time_data', 'close',
+    )
+    SYNC_ONLY_METHODS = ('iter_option_chains', 'stream_live_data', 'run_stream')
+
+    def __init__(self, auth, session: AsyncSchwabSession = None, token_provider: AsyncTokenProvider = None,
+                 cache: MarketDataCache = None):
+        """
+        Initializes AsyncMarketData with authentication object.
+
+        :param auth: SchwabAuth object for authentication
+        :param session: Shared AsyncSchwabSession used for HTTP calls; a private one is created if omitted
+        :param token_provider: AsyncTokenProvider wrapping auth; a private one is created if omitted
+        :param cache: MarketDataCache holding per-endpoint TTL caches; a private one is created if omitted
+        """
+        super().__init__(auth, session=session if session is not None else AsyncSchwabSession(), cache=cache)
+        self.token_provider = token_provider if token_provider is not None else AsyncTokenProvider(auth)
+        self.inflight = AsyncSingleFlight()
+
+    async def _get(self, url, params, description):
+        """
+        Sends an authenticated GET request and returns the decoded JSON body.
+
+        :raises SchwabAPIError: Typed error if the request fails after retries
+        """
+        headers = await self.token_provider.get_headers()
+        response = await self.session.get(url, headers=headers, params=params)
+        return handle_response(response, description)
+
+    async def _fetch_frame(self, endpoint, url, params, description, parse):
+        """
+        Returns a cached DataFrame or fetches and parses it, coalescing concurrent identical requests.
+        """
+        key = make_key(url, params)
+        df = self.cache.get(endpoint, key)
+        if df is MISSING:
+            df = await self.inflight.do(key, lambda: self._load_frame(endpoint, key, url, params, description, parse))
+        return df.copy()
+
+    async def _load_frame(self, endpoint, key, url, params, description, parse):
+        df = self.cache.get(endpoint, key)
+        if df is MISSING:
+            df = parse(await self._get(url, params, description))
+            self.cache.set(endpoint, key, df, self.cache.ttl_for(endpoint, params))
+        return df
+
+    async def get_symbol_quote(self, symbol: str,
+                               fields: Union[list, str] =['quote', 'reference']):
+        """
+        Retrieves quotes for a single symbol.
+
+        :param symbol: Symbol to retrieve quotes for
+        :param fields: Fields to include in the quote
+        :return: DataFrame containing symbol quotes
+        """
+        params = {'fields': self.helper._validate_fields(fields)}
+        data = await self._get(self.urls.get_symbol_quote_url(symbol), params, "fetching symbol quotes")
+        logger.info(f"Retrieved symbol quotes for {symbol}")
+        return self.helper._parse_quotes_to_dataframe(data, params['fields'])
+
+    async def get_quotes(self, symbols: Union[list, str],
+                         fields: Union[list, str] = 'quote, reference', indicative=False):
+        """
+        Retrieves quotes for multiple symbols.
+
+        :param symbols: List of symbols to retrieve quotes for
+        :param fields: Fields to include in the quotes
+        :param indicative: Boolean indicating if indicative prices should be included
+        :return: DataFrame containing quotes for multiple symbols
+        """
+        url = self.urls.get_quotes_url()
+        params = self._quotes_params(symbols, fields, indicative)
+        df = await self._fetch_frame('quotes', url, params, "fetching quotes",
+                                     lambda data: self.helper._parse_quotes_to_dataframe(data, params['fields']))
+        logger.info(f"Retrieved quotes for symbols: {params['symbols']}")
+        return df
+
+    async def get_quotes_bulk(self, symbols: Union[list, str], fields: Union[list, str] = 'quote, reference',
+                              indicative=False, batch_size: int = None, max_workers: int = 8):
+        """
+        Retrieves quotes for a large symbol universe in concurrent batches.
+
+        Takes the same arguments as MarketData.get_quotes_bulk, with max_workers
+        bounding the number of batches in flight.
+
+        :return: DataFrame containing quotes for all symbols, per-batch timings in ``df.attrs['batches']``
+        """
+        ordered, batches = self._quote_batches(symbols, batch_size)
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def fetch(index, batch):
+            async with semaphore:
+                start = time.perf_counter()
+                df = await self.get_quotes(','.join(batch), fields=fields, indicative=indicative)
+                return df, {'batch': index, 'symbols': len(batch), 'rows': len(df),
+                            'latency': time.perf_counter() - start}
+
+        results = await asyncio.gather(*[fetch(i, batch) for i, batch in enumerate(batches)])
+        logger.info(f"Retrieved quotes for {len(ordered)} symbols in {len(batches)} batches")
+        return self._merge_quote_batches(ordered, [df for df, _ in results], [stats for _, stats in results])
+
+    async def get_option_chains(self, symbol: str, contract_type: str, strike_count=None,
+                                includeUnderlyingQuote: bool =True, strategy=None, interval=None,
+                                strike_price=None, range=None, fromDate=None, toDate=None, volatility=None,
+                                underlying_price=None, interest_rate=None, daysToExpire=None,
+                                expMonth=None, option_type=None, entillment=None, indexed: bool = False):
+        """
+        Retrieves option chains for a specific symbol.
+
+        Takes the same arguments as MarketData.get_option_chains.
+
+        :param indexed: Return an OptionChain with indexed contract lookups instead of a DataFrame
+        :return: DataFrame (or OptionChain) containing option chains
+        """
+        params = self._option_chain_params(symbol, contract_type, strike_count, includeUnderlyingQuote,
+                                           strategy, interval, strike_price, range, fromDate, toDate,
+                                           volatility, underlying_price, interest_rate, daysToExpire,
+                                           expMonth, option_type, entillment)
+        url = self.urls.get_optionchains_url()
+        df = await self._fetch_frame('option_chains', url, params, "fetching option chains",
+                                     lambda data: self.helper._optionchain_to_dataframe(json_data=data))
+        logger.info(f"Retrieved option chains for {symbol}")
+        if indexed:
+            return OptionChain(df)
+        return df
+
+    async def get_option_chains_by_expiration(self, symbol: str, contract_type: str, fromDate=None, toDate=None,
+                                              expirations_per_request: int = None, max_workers: int = 8,
+                                              indexed: bool = False, **kwargs):
+        """
+        Retrieves an option chain as several concurrent requests split by expiration.
+
+        Takes the same arguments as MarketData.get_option_chains_by_expiration,
+        with max_workers bounding the number of requests in flight.
+
+        :return: DataFrame (or OptionChain) containing the merged chain
+        """
+        buckets = self._expiration_buckets(await self.get_option_expiration_chain(symbol), fromDate, toDate,
+                                           expirations_per_request, max_workers)
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def fetch(index, bucket):
+            async with semaphore:
+                start = time.perf_counter()
+                df = await self.get_option_chains(symbol, contract_type, fromDate=bucket[0], toDate=bucket[1],
+                                                  **kwargs)
+                return df, {'bucket': index, 'fromDate': bucket[0], 'toDate': bucket[1], 'contracts': len(df),
+                            'latency': time.perf_counter() - start}
+
+        results = await asyncio.gather(*[fetch(i, bucket) for i, bucket in enumerate(buckets)])
+        df = self._merge_chain_buckets([df for df, _ in results], [stats for _, stats in results])
+        logger.info(f"Retrieved option chains for {symbol} in {len(buckets)} expiration buckets")
+        if indexed:
+            return OptionChain(df)
+        return df
+
+    # AsyncSchwabSession reads whole bodies, so there is no response stream to parse incrementally
+    iter_option_chains = _sync_only('iter_option_chains',
+                                    "use AsyncMarketData.get_option_chains_by_expiration instead")
+    stream_live_data = _sync_only('stream_live_data', "use AsyncMarketData.stream_real_time_data instead")
+    # blocks on asyncio.run, which cannot be called from the event loop an async client lives on
+    run_stream = _sync_only('run_stream', "iterate AsyncMarketData.stream_real_time_data instead")
+
+    async def get_option_expiration_chain(self, symbol: str):
+        """
+        Retrieves option expiration chains for a symbol.
+
+        :param symbol: Symbol to retrieve option expiration chains for
+        :return: DataFrame containing option expiration chains
+        """
+        url = self.urls.get_optionchain_expiry_url()
+        df = await self._fetch_frame('option_expiration_chain', url, {'symbol': symbol},
+                                     "fetching option expiration chain",
+                                     lambda data: pd.DataFrame(data['expirationList']))
+        logger.info(f"Retrieved option expiration chain for {symbol}")
+        return df
+
+    async def get_historical_data(self, symbol, period_type=None, period=None, frequency_type=None,
+                                  frequency=None, start_date: Union[str, int] =None, end_date: Union[str, int]=None,
+                                  needExtendedHoursData=False, needPreviousClose=True):
+        """
+        Retrieves historical data for a symbol.
+
+        Takes the same arguments as MarketData.get_historical_data.
+
+        :return: DataFrame of candles on a tz-aware exchange-time index, metadata in ``df.attrs``
+        """
+        params = self._historical_params(symbol, period_type, period, frequency_type, frequency,
+                                         start_date, end_date, needExtendedHoursData, needPreviousClose)
+        url = self.urls.get_pricehistory_url()
+        df = await self._fetch_frame('historical_data', url, params, "fetching historical data",
+                                     self.helper._candles_to_dataframe)
+        logger.info(f"Retrieved historical data for {symbol}")
+        return df
+
+    async def get_historical_range(self, symbol, start_date, end_date=None, frequency_type='minute', frequency=1,
+                                   needExtendedHoursData=False, max_workers: int = 4):
+        """
+        Retrieves price history over a range longer than one request may cover.
+
+        Takes the same arguments as MarketData.get_historical_range, with
+        max_workers bounding the number of windows in flight.
+
+        :return: DataFrame with datetime, open, high, low, close and volume
+        """
+        windows = self._history_range_windows(start_date, end_date, frequency_type, frequency)
+        period_type = self.helper._history_period_type(frequency_type)
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def fetch(window):
+            async with semaphore:
+                start = time.perf_counter()
+                df = await self.get_historical_data(symbol, period_type=period_type, frequency_type=frequency_type,
+                                                    frequency=frequency, start_date=window[0], end_date=window[1],
+                                                    needExtendedHoursData=needExtendedHoursData,
+                                                    needPreviousClose=False)
+                return df, {'start': window[0], 'end': window[1], 'rows': len(df),
+                            'latency': time.perf_counter() - start}
+
+        results = await asyncio.gather(*[fetch(window) for window in windows])
+        logger.info(f"Retrieved historical data for {symbol} in {len(windows)} windows")
+        return self._merge_history_windows(symbol, [df for df, _ in results], [stats for _, stats in results])
+
+    async def get_active_gainers_losers(self, index_symbol: str = "$SPX", sort = "VOLUME", frequency = 5):
+        """
+        Retrieves active gainers and losers for a specified index.
+
+        :param index_symbol: Symbol of the index (e.g., '$SPX')
+        :param sort: Sort criteria (e.g., 'VOLUME')
+        :param frequency: Frequency of the data
+        :return: DataFrame containing active gainers and losers
+        """
+        params = {
+            'symbol_id': self.helper._validate_indexSymbol(index_symbol),
+            'sort': self.helper._validate_sort(sort),
+            'frequency': self.helper._validate_history_frequency(frequency)
+        }
+        url = self.urls.get_movers_url(index_symbol)
+        df = await self._fetch_frame('movers', url, params, "fetching active gainers/losers",
+                                     lambda data: pd.DataFrame(data['screeners']))
+        logger.info(f"Retrieved active gainers and losers for {index_symbol}")
+        return df
+
+    async def get_all_market_hours(self, date: str =None):
+        """
+        Retrieves market hours for all available markets.
+
+        :param date: Date for which to retrieve market hours
+        :return: DataFrame containing market hours
+        """
+        data = await self._get(self.urls.get_markethours_url(), {'date': date}, "fetching market hours")
+        logger.info(f"Retrieved market hours for all available markets")
+        return self.helper._parse_json_to_dataframe(data)
+
+    async def get_market_hours(self, market_id="option", date=None):
+        """
+        Retrieves market hours for a specific market.
+
+        :param market_id: ID of the market
+        :param date: Date for which to retrieve market hours
+        :return: JSON response containing market hours
+        """
+        params = {
+            'market_id': self.helper._validate_markets(market_id),
+            'date': date
+        }
+        data = await self._get(self.urls.get_markethours_url(), params, "fetching market hours")
+        logger.info(f"Retrieved market hours for market {market_id}")
+        return data
+
+    async def get_instruments(self, symbol, projection="symbol-search"):
+        """
+        Retrieves instrument details using different projections.
+
+        :param symbol: Symbol to retrieve instruments for
+        :param projection: Projection type (e.g., 'symbol-search', 'fundamental')
+        :return: JSON response containing instrument details
+        """
+        params = {
+            'symbol': symbol,
+            'projection': projection
+        }
+        data = await self._get(self.urls.get_instruments_url(), params, "fetching instruments")
+        logger.info(f"Retrieved instrument details for {symbol}")
+        return data
+
+    async def get_instrument_by_cusip(self, cusip):
+        """
+        Retrieves basic instrument details by CUSIP.
+
+        :param cusip: CUSIP of the instrument
+        :return: JSON response containing instrument details
+        """
+        data = await self._get(self.urls.get_instruments_url(), {'cusip': cusip}, "fetching instrument by CUSIP")
+        logger.info(f"Retrieved instrument details for CUSIP {cusip}")
+        return data
+
+    async def _chart_backfill(self, decoder, symbols, gap):
+        """
+        Returns CHART_EQUITY entries for the 1-minute bars that closed during a stream gap.
+        """
+        entries = []
+        for symbol in symbols:
+            start = self._backfill_start(decoder, symbol, gap)
+            try:
+                df = await self.get_historical_data(symbol, period_type='day', frequency_type='minute',
+                                                    frequency=1, start_date=start, end_date=gap['end'])
+            except SchwabAPIError as err:
+                logger.warning(f"Could not backfill {symbol} bars after the stream gap: {err}")
+                continue
+            entries.extend(self._backfill_entries(symbol, df, start, gap))
+        return entries
+
+    async def _fetch_chart_backfill(self, decoder, symbols, gap):
+        return await self._chart_backfill(decoder, symbols, gap)
+
+    def _streamer_trader(self):
+        return AsyncTrader(self.auth, session=self.session, token_provider=self.token_provider)
+
+    async def close(self):
+        """
+        Closes the underlying async session.
+        """
+        await self.session.close()
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import logging
+import time
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency, only needed for the async clients
+    aiohttp = None
+
+from schwab_api.exceptions import SchwabConnectionError
+from schwab_api.rate_limit import RateLimiter
+from schwab_api.resilience import CircuitBreakerRegistry, RetryPolicy, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+def _clean_params(params):
+    """
+    Drops None values and lower-cases booleans so aiohttp can encode the query string.
+    """
+    if not params:
+        return None
+    cleaned = {}
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = str(value).lower()
+        cleaned[key] = value
+    return cleaned
+
+
+class AsyncResponse:
+    """
+    Fully read HTTP response returned by AsyncSchwabSession.
+    """
+
+    def __init__(self, status, reason, headers, content, url, request_info=None):
+        self.status = status
+        self.status_code = status
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.request = request_info
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncSchwabSession:
+    """
+    Async HTTP transport for the Schwab API built on a pooled aiohttp connector.
+
+    The underlying ``aiohttp.ClientSession`` is created lazily on first use so the
+    object can be built outside of a running event loop.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 50, keepalive_timeout: float = 30,
+                 timeout: float = 30, connect_timeout: float = 5, headers: dict = None,
+                 rate_limiter: RateLimiter = None, rate_limit: bool = True,
+                 retry_policy: RetryPolicy = None, circuit_breakers: CircuitBreakerRegistry = None):
+        """
+        Initializes the async session.
+
+        :param limit: Maximum number of simultaneous connections
+        :param limit_per_host: Maximum number of simultaneous connections to api.schwabapi.com
+        :param keepalive_timeout: Seconds an idle connection is kept in the pool
+        :param timeout: Default total timeout per request in seconds
+        :param connect_timeout: Default connect timeout in seconds
+        :param headers: Default headers sent with every request
+        :param rate_limiter: RateLimiter shared with other sessions; a default one is created if omitted
+        :param rate_limit: Set to False to disable client-side rate limiting
+        :param retry_policy: RetryPolicy deciding retries and backoff; RetryPolicy(max_retries=0) disables retries
+        :param circuit_breakers: CircuitBreakerRegistry shared with other sessions; a default one is created if omitted
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncSchwabSession requires aiohttp. Install it with 'pip install schwab_api[async]'.")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self.headers = {'Accept': 'application/json'}
+        if headers:
+            self.headers.update(headers)
+        if rate_limiter is None and rate_limit:
+            rate_limiter = RateLimiter()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breakers = circuit_breakers if circuit_breakers is not None else CircuitBreakerRegistry()
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout,
+                                                  headers=self.headers)
+        return self._session
+
+    async def request(self, method: str, url: str, params: dict = None, **kwargs):
+        """
+        Sends a request and reads the full body.
+
+        Applies the same rate limiting, circuit breaking and retry rules as
+        SchwabSession.request.
+
+        :param method: HTTP method (e.g. 'GET', 'POST')
+        :param url: Full request URL
+        :param params: Query parameters; None values are dropped
+        :param kwargs: Any keyword accepted by ``aiohttp.ClientSession.request``
+        :return: AsyncResponse
+        :raises CircuitOpenError: If the endpoint's circuit is open
+        :raises SchwabConnectionError: If the API could not be reached after all retries
+        """
+        params = _clean_params(params)
+        policy = self.retry_policy
+        breaker = self.circuit_breakers.get(url)
+        attempt = 0
+        while True:
+            trial = breaker.before_request()
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire_async(method, url)
+                session = self._get_session()
+                async with session.request(method, url, params=params, **kwargs) as raw:
+                    content = await raw.read()
+                    response = AsyncResponse(raw.status, raw.reason, raw.headers, content,
+                                             str(raw.url), raw.request_info)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                breaker.record_failure()
+                if attempt >= policy.max_retries or not policy.should_retry_error(method):
+                    raise SchwabConnectionError(f"Could not reach {url}: {err}") from err
+                delay = policy.backoff(attempt)
+                logger.warning(f"{method} {url} failed ({err}); retrying in {delay:.2f}s")
+            except BaseException:
+                if trial:
+                    breaker.release_trial()
+                raise
+            else:
+                if response.status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if attempt >= policy.max_retries or not policy.should_retry_status(method, response.status):
+                    return response
+                delay = policy.backoff(attempt, parse_retry_after(response.headers.get('Retry-After')))
+                logger.warning(f"{method} {url} returned {response.status}; retrying in {delay:.2f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url: str, **kwargs):
+        return await self.request('PUT', url, **kwargs)
+
+    async def delete(self, url: str, **kwargs):
+        return await self.request('DELETE', url, **kwargs)
+
+    async def close(self):
+        """
+        Closes all pooled connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+class AsyncTokenProvider:
+    """
+    Supplies authorization headers to async clients without blocking the event loop.
+
+    The cached bearer token is returned directly while it is valid; when it is missing
+    or about to expire, the blocking SchwabAuth refresh runs once in a worker thread
+    while concurrent callers wait on the same lock.
+    """
+
+    def __init__(self, auth, refresh_margin: float = 60):
+        """
+        :param auth: SchwabAuth object holding the OAuth tokens
+        :param refresh_margin: Seconds before expiry at which the token is refreshed
+        """
+        self.auth = auth
+        self.refresh_margin = refresh_margin
+        self._lock = None
+
+    def _token_valid(self):
+        if not self.auth.token:
+            return False
+        expires_at = getattr(self.auth, 'token_expires_at', 0)
+        if not expires_at:
+            return True
+        return time.time() < expires_at - self.refresh_margin
+
+    def _refresh_blocking(self):
+        if self.auth.token and self.auth.refresh_token:
+            self.auth.refresh()
+        else:
+            self.auth.get_headers()
+
+    async def get_headers(self):
+        """
+        Returns the authorization headers, refreshing the token off the loop if needed.
+        """
+        if not self._token_valid():
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if not self._token_valid():
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, self._refresh_blocking)
+        return {
+            'Authorization': f"Bearer {self.auth.token}"
+        }
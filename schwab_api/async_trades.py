@@ -0,0 +1,115 @@
+import logging
+from .trades import Trader
+from .async_session import AsyncSchwabSession, AsyncTokenProvider
+from .utils import handle_response
+
+logger = logging.getLogger(__name__)
+'''
+Awaitable object for placing trades on Charles Schwab.
+
+'''
+class AsyncTrader(Trader):
+    def __init__(self, auth, override_base_url=None, override_paper_account=None, session=None,
+                 token_provider=None):
+        super().__init__(auth, override_base_url=override_base_url,
+                         override_paper_account=override_paper_account,
+                         session=session if session is not None else AsyncSchwabSession())
+        self.token_provider = token_provider if token_provider is not None else AsyncTokenProvider(auth)
+
+    async def _request(self, method, url, description, **kwargs):
+        """
+        Send an authenticated request and return the decoded JSON body.
+
+        :raises SchwabAPIError: Typed error if the request fails after retries
+        """
+        headers = await self.token_provider.get_headers()
+        response = await self.session.request(method, url, headers=headers, **kwargs)
+        return handle_response(response, description)
+
+    async def place_order(self, account_id, asset_type='OPTION', trading_strategy='buy_market_stock', **kwargs):
+        """
+        Place an order for a specific trading strategy and asset type.
+        """
+        url = self._build_order_request(account_id, asset_type, trading_strategy, **kwargs)
+        data = await self._request('POST', url, "placing order", json=self.order_data)
+        logger.info(f"Placed order for account ID: {account_id}")
+        return data
+
+    async def get_order_status(self, account_id, order_id):
+        if self.is_paper_account:
+            raise TypeError('Paper account does not support order status')
+        else:
+            self.base_url = 'https://api.schwabapi.com/trader/v1/accounts'
+
+        url = f"{self.base_url}/{account_id}/orders/{order_id}"
+        return await self._request('GET', url, "retrieving order status")
+
+    async def get_account_info(self, account_id):
+        """
+        Retrieves information for a specific account.
+
+        :param account_id: ID of the account
+        :return: JSON response containing account information
+        """
+        data = await self._request('GET', f"{self.base_url}/accounts/{account_id}", "retrieving account info")
+        logger.info(f"Retrieved account info for account ID: {account_id}")
+        return data
+
+    async def get_all_accounts(self):
+        """
+        Retrieves information for all accounts.
+
+        :return: JSON response containing all account information
+        """
+        data = await self._request('GET', f"{self.base_url}/accounts/", "retrieving all accounts")
+        logger.info("Retrieved all account info")
+        return data
+
+    async def get_all_accountIDs(self):
+        """
+        Retrieves all account IDs.
+
+        :return: JSON response containing all account IDs
+        """
+        data = await self._request('GET', f"{self.base_url}/accounts/accountNumbers", "retrieving account IDs")
+        logger.info("Retrieved all account IDs")
+        return data
+
+    async def get_all_transactions(self, account_id):
+        """
+        Retrieves all transactions for a specific account.
+
+        :param account_id: ID of the account
+        :return: JSON response containing all transactions for the account
+        """
+        data = await self._request('GET', f"{self.base_url}/accounts/{account_id}/transactions",
+                                   "retrieving transactions")
+        logger.info(f"Retrieved all transactions for account ID: {account_id}")
+        return data
+
+    async def get_transaction(self, account_id, transaction_id):
+        """
+        Retrieves details for a specific transaction.
+
+        :param account_id: ID of the account
+        :param transaction_id: ID of the transaction
+        :return: JSON response containing transaction details
+        """
+        data = await self._request('GET', f"{self.base_url}/accounts/{account_id}/transactions/{transaction_id}",
+                                   "retrieving transaction")
+        logger.info(f"Retrieved transaction details for transaction ID: {transaction_id}")
+        return data
+
+    async def get_user_preferences(self):
+        """
+        Retrieves user preferences.
+
+        :return: JSON response containing user preferences
+        """
+        return await self._request('GET', f"{self.base_url}/userPreferences", "retrieving user preferences")
+
+    async def close(self):
+        """
+        Closes the underlying async session.
+        """
+        await self.session.close()
@@ -1,4 +1,3 @@
-import requests
 #import logging
 import base64
 import time
@@ -13,11 +12,15 @@ from selenium.webdriver.firefox.service import Service
 from webdriver_manager.firefox import GeckoDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from schwab_api.session import SchwabSession
+from schwab_api.exceptions import SchwabAuthError
+from schwab_api.utils import handle_response
 
 class SchwabAuthe:
     def __init__(self, client_id, client_secret, redirect_uri='https://127.0.0.1', username='', password='',
-                 refresh_token=None, is_paper_account=False): 
+                 refresh_token=None, is_paper_account=False, session=None): 
         self.client_id = client_id
+        self.session = session if session is not None else SchwabSession()
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
         self.username = username
@@ -26,6 +29,7 @@ class SchwabAuthe:
         self.session_id = None
         self.token = None
         self.token_expires_in = 0
+        self.token_expires_at = 0
         self.base_url = 'https://api.schwabapi.com/v1/oauth'
         self.refresh_token = refresh_token
         self.is_paper_account = is_paper_account
@@ -209,12 +213,12 @@ class SchwabAuthe:
             'code': self.auth_code,  # Ensure the code is URL decoded
             'redirect_uri': self.redirect_uri
         }
-        response = requests.post(f"{self.base_url}/token", headers=headers, data=data)
-        response.raise_for_status()
-        token_data = response.json()
+        response = self.session.post(f"{self.base_url}/token", headers=headers, data=data)
+        token_data = handle_response(response, "requesting access token")
         self.token = token_data.get('access_token')
         self.refresh_token = token_data.get('refresh_token', None)
         self.token_expires_in = token_data.get('expires_in', 1800)  # Default to 30 minutes if not provided
+        self.token_expires_at = time.time() + self.token_expires_in
         
         if not self.token:
             raise ValueError("Failed to exchange authorization code for access token.")
@@ -243,7 +247,7 @@ class SchwabAuthe:
         Step 4: Refresh Access Token - Automatically refresh the access token using the refresh token.
         """
         if not self.refresh_token:
-            raise SystemExit("No refresh token available. Please authenticate first.")
+            raise SchwabAuthError("No refresh token available. Please authenticate first.")
 
         headers = {
             'Authorization': self._get_auth_header(),
@@ -253,12 +257,12 @@ class SchwabAuthe:
             'grant_type': 'refresh_token',
             'refresh_token': self.refresh_token
         }
-        response = requests.post(f"{self.base_url}/token", headers=headers, data=data)
-        response.raise_for_status()
-        token_data = response.json()
+        response = self.session.post(f"{self.base_url}/token", headers=headers, data=data)
+        token_data = handle_response(response, "requesting access token")
         self.token = token_data.get('access_token')
         self.refresh_token = token_data.get('refresh_token', self.refresh_token)
         self.token_expires_in = token_data.get('expires_in', 1800)
+        self.token_expires_at = time.time() + self.token_expires_in
 
         self._start_auto_refresh()
 
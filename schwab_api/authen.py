@@ -9,14 +9,16 @@ from selenium.webdriver.support import expected_conditions as EC
 import threading
 import time
 import base64
-import requests
 import webbrowser
 from schwab_api.urls import SchwabUrls
+from schwab_api.session import SchwabSession
+from schwab_api.utils import handle_response
 
 class SchwabAuth:
     def __init__(self, client_id, client_secret, redirect_uri='https://127.0.0.1', username='', password='',
-                 refresh_token=None, is_paper_account=False): 
+                 refresh_token=None, is_paper_account=False, session=None): 
         self.client_id = client_id
+        self.session = session if session is not None else SchwabSession()
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
         self.urls = SchwabUrls()
@@ -26,6 +28,7 @@ class SchwabAuth:
         self.session_id = None
         self.token = None
         self.token_expires_in = 0
+        self.token_expires_at = 0
         self.refresh_token = refresh_token
         self.is_paper_account = is_paper_account
 
@@ -132,12 +135,12 @@ class SchwabAuth:
             'code': self.auth_code,
             'redirect_uri': self.redirect_uri
         }
-        response = requests.post(self.urls.get_token_url(), headers=headers, data=data)
-        response.raise_for_status()
-        token_data = response.json()
+        response = self.session.post(self.urls.get_token_url(), headers=headers, data=data)
+        token_data = handle_response(response, "requesting access token")
         self.token = token_data.get('access_token')
         self.refresh_token = token_data.get('refresh_token', None)
         self.token_expires_in = token_data.get('expires_in', 1800)
+        self.token_expires_at = time.time() + self.token_expires_in
 
         if not self.token:
             raise ValueError("Failed to exchange authorization code for access token.")
@@ -170,12 +173,12 @@ class SchwabAuth:
             'grant_type': 'refresh_token',
             'refresh_token': self.refresh_token
         }
-        response = requests.post(self.urls.get_token_url(), headers=headers, data=data)
-        response.raise_for_status()
-        token_data = response.json()
+        response = self.session.post(self.urls.get_token_url(), headers=headers, data=data)
+        token_data = handle_response(response, "requesting access token")
         self.token = token_data.get('access_token')
         self.refresh_token = token_data.get('refresh_token', self.refresh_token)
         self.token_expires_in = token_data.get('expires_in', 1800)
+        self.token_expires_at = time.time() + self.token_expires_in
 
     def get_headers(self):
         if not self.token:
@@ -0,0 +1,195 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from schwab_api.exceptions import SchwabAPIError
+from schwab_api.helper import HelperFuncs
+from schwab_api.history_store import CandleStore
+from schwab_api.utils import require_sync
+
+logger = logging.getLogger(__name__)
+
+
+class BulkHistoryJob:
+    """
+    Downloads price history for many symbols into a CandleStore.
+
+    Symbols are fetched concurrently. Each symbol's candles go to its own file
+    in the store, and a JSON manifest records which symbols finished or
+    failed. Running the same job again skips the finished symbols and retries
+    the failed ones, so an interrupted backfill resumes where it stopped.
+    One symbol failing is recorded in the manifest and does not stop the run.
+    """
+
+    MANIFEST_VERSION = 1
+
+    def __init__(self, market_data, root: str, symbols, start_date, end_date=None, frequency_type: str = 'daily',
+                 frequency: int = 1, extended_hours: bool = False, max_workers: int = 8, manifest: str = None,
+                 checkpoint_interval: float = 1.0, progress=None, store: CandleStore = None):
+        """
+        :param market_data: MarketData used for the downloads
+        :param root: Directory of the CandleStore the candles are written to
+        :param symbols: Symbols to download
+        :param start_date: Start of the window ('YYYY-MM-DD', datetime or epoch milliseconds)
+        :param end_date: End of the window; defaults to an open end, resolved to "now" on every run,
+                         so rerunning the default job resumes it instead of starting a new one
+        :param frequency_type: 'minute', 'daily', 'weekly' or 'monthly'
+        :param frequency: Bar width in frequency_type units
+        :param extended_hours: Include extended hours bars (minute bars only)
+        :param max_workers: Number of symbols downloaded at the same time
+        :param manifest: Path of the checkpoint manifest; defaults to a file in ``root`` named after the job
+        :param checkpoint_interval: Minimum seconds between manifest writes while running
+        :param progress: Optional callable receiving (symbol, error or None, stats dict) after each symbol
+        :param store: CandleStore (or MmapCandleStore) to write to; defaults to a CandleStore in ``root``.
+                      A store without a MarketData is given ``market_data``.
+        :raises ValueError: If ``store`` already downloads through a different MarketData
+        """
+        if store is None:
+            store = CandleStore(root, market_data)
+        elif market_data is not None and store.market_data is not None and store.market_data is not market_data:
+            raise ValueError("store downloads through a different MarketData than market_data")
+        elif store.market_data is None:
+            require_sync(market_data, 'get_historical_range', type(self).__name__)
+            store.market_data = market_data
+        self.store = store
+        self.symbols = list(dict.fromkeys(symbols))
+        self.start = HelperFuncs._date_format(start_date)
+        self.end = None if end_date is None else HelperFuncs._date_format(end_date)
+        self.frequency_type = frequency_type
+        self.frequency = frequency
+        self.extended_hours = extended_hours
+        self.max_workers = max_workers
+        series = CandleStore.series_key(frequency_type, frequency, extended_hours)
+        end = 'open' if self.end is None else self.end
+        self.manifest_path = manifest or os.path.join(root, f"manifest_{series}_{self.start}_{end}.json")
+        self.checkpoint_interval = checkpoint_interval
+        self.progress = progress
+        self.done = {}
+        self.failures = {}
+        self._lock = threading.Lock()
+        self._last_checkpoint = 0.0
+        self._reset()
+
+    def _reset(self):
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.rows = 0
+        self.bytes = 0
+        self.started_at = time.monotonic()
+        self.finished_at = None
+
+    def _job(self):
+        return {'start': self.start, 'end': 'open' if self.end is None else self.end,
+                'frequency_type': self.frequency_type,
+                'frequency': self.frequency, 'extended_hours': self.extended_hours}
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return
+        with open(self.manifest_path) as fh:
+            manifest = json.load(fh)
+        if manifest.get('job') != self._job():
+            raise ValueError(f"Manifest {self.manifest_path} belongs to a different job: {manifest.get('job')}")
+        self.done = dict(manifest.get('done', {}))
+        self.failures = dict(manifest.get('failed', {}))
+
+    def _write_manifest(self):
+        """
+        Writes the manifest atomically; the caller holds the lock.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.manifest_path)), exist_ok=True)
+        tmp = f"{self.manifest_path}.tmp"
+        with open(tmp, 'w') as fh:
+            json.dump({'version': self.MANIFEST_VERSION, 'job': self._job(), 'done': self.done,
+                       'failed': self.failures}, fh)
+        os.replace(tmp, self.manifest_path)
+        self._last_checkpoint = time.monotonic()
+
+    def _download(self, symbol):
+        path = self.store.path(symbol, CandleStore.series_key(self.frequency_type, self.frequency,
+                                                              self.extended_hours))
+        before = os.path.getsize(path) if os.path.exists(path) else 0
+        df = self.store.get(symbol, self.start, self.end, frequency_type=self.frequency_type,
+                            frequency=self.frequency, extended_hours=self.extended_hours)
+        after = os.path.getsize(path) if os.path.exists(path) else 0
+        # growth of the stored series, so candles stored by an earlier run do not count as downloaded
+        return len(df), max(after - before, 0)
+
+    def _finish(self, symbol, result=None, error=None):
+        with self._lock:
+            if error is None:
+                rows, size = result
+                self.done[symbol] = {'rows': rows, 'bytes': size}
+                self.failures.pop(symbol, None)
+                self.completed += 1
+                self.rows += rows
+                self.bytes += size
+            else:
+                self.failures[symbol] = f"{type(error).__name__}: {error}"
+                self.failed += 1
+            if time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+                self._write_manifest()
+        if self.progress is not None:
+            self.progress(symbol, error, self.stats())
+
+    def pending(self):
+        """
+        Returns the symbols that have not been downloaded yet according to the manifest.
+        """
+        self._load_manifest()
+        return [symbol for symbol in self.symbols if symbol not in self.done]
+
+    def stats(self):
+        """
+        Returns progress and throughput of the current or last run.
+
+        ``bytes`` is how much the run grew the stored series, not the size of the files.
+        """
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        elapsed = max(end - self.started_at, 1e-9)
+        return {
+            'total': len(self.symbols),
+            'completed': self.completed,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'elapsed': elapsed,
+            'symbols_per_sec': self.completed / elapsed,
+            'bytes_per_sec': self.bytes / elapsed,
+            'store': self.store.stats(),
+        }
+
+    def run(self):
+        """
+        Downloads every pending symbol and returns the run's stats.
+
+        Failures are listed per symbol in ``failures`` and in the manifest.
+        """
+        pending = self.pending()
+        self._reset()
+        self.skipped = len(self.symbols) - len(pending)
+        workers = max(1, min(self.max_workers, len(pending) or 1))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(self._download, symbol): symbol for symbol in pending}
+                for future in as_completed(futures):
+                    symbol = futures[future]
+                    try:
+                        result = future.result()
+                    except (SchwabAPIError, ValueError, KeyError, OSError) as err:
+                        logger.warning(f"History download for {symbol} failed: {err}")
+                        self._finish(symbol, error=err)
+                    else:
+                        self._finish(symbol, result)
+        finally:
+            self.finished_at = time.monotonic()
+            with self._lock:
+                self._write_manifest()
+        stats = self.stats()
+        logger.info(f"Downloaded history for {stats['completed']} symbols ({stats['failed']} failed, "
+                    f"{stats['skipped']} already done) at {stats['symbols_per_sec']:.1f} symbols/s")
+        return stats
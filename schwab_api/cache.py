@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+
+MISSING = object()
+EXCHANGE_TZ = 'America/New_York'
+
+
+def make_key(*parts):
+    """
+    Builds a hashable, order-stable cache key from request arguments.
+
+    Lists become tuples, dicts become sorted item tuples with None values dropped
+    and strings are stripped, so equivalent calls share one entry.
+    """
+    return tuple(_normalize(part) for part in parts)
+
+
+def _normalize(value):
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _normalize(v)) for k, v in value.items() if v is not None))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, set):
+        return tuple(sorted(_normalize(v) for v in value))
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def seconds_until_end_of_day(tz: str = EXCHANGE_TZ):
+    """
+    Returns the number of seconds until midnight in the exchange time zone.
+    """
+    now = pd.Timestamp.now(tz=tz)
+    midnight = now.normalize() + pd.Timedelta(days=1)
+    return max((midnight - now).total_seconds(), 1.0)
+
+
+def _epoch_seconds(value):
+    # price history dates are epoch milliseconds; plain seconds are accepted too
+    value = float(value)
+    return value / 1000.0 if value > 1e11 else value
+
+
+def history_ttl(params: dict, max_ttl: float = None):
+    """
+    Returns how long a price history response stays valid.
+
+    A window that ended in the past will not change again and is kept until the
+    end of the day. Otherwise the response is valid until the current bar closes:
+    the next multiple of the bar width for minute bars, the end of the day for
+    daily and longer bars.
+    """
+    eod = seconds_until_end_of_day()
+    max_ttl = eod if max_ttl is None else min(max_ttl, eod)
+    end_date = params.get('endDate')
+    now = time.time()
+    if end_date is not None and _epoch_seconds(end_date) < now:
+        return max_ttl
+    if params.get('frequencyType') == 'minute' or (params.get('frequencyType') is None
+                                                   and params.get('periodType') == 'day'):
+        width = int(params.get('frequency') or 1) * 60
+        return min(width - (now % width), max_ttl)
+    return max_ttl
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a per-entry TTL.
+    """
+
+    def __init__(self, maxsize: int = 256, default_ttl: float = 60, name: str = ''):
+        """
+        :param maxsize: Maximum number of entries; the least recently used entry is evicted beyond it
+        :param default_ttl: TTL in seconds used when set() is called without one
+        :param name: Name reported in stats()
+        """
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.name = name
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=MISSING):
+        """
+        Returns the cached value, or ``default`` if the key is missing or expired.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl: float = None):
+        """
+        Stores a value; a TTL of zero or less means the value is not cached.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """
+        Returns hit/miss statistics for the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class MarketDataCache:
+    """
+    One TTLCache per market data endpoint.
+
+    ``ttls`` maps endpoint name to a TTL in seconds. The expiration chain and
+    price history use dynamic TTLs (end of day, close of the current bar); their
+    entry here is an upper bound. Set an endpoint's TTL to 0 to disable caching for it.
+    """
+
+    DEFAULT_TTLS = {
+        'quotes': 5,
+        'option_chains': 15,
+        'option_expiration_chain': 24 * 3600,
+        'historical_data': 24 * 3600,
+        'movers': 60,
+    }
+
+    def __init__(self, maxsize: int = 256, ttls: dict = None):
+        """
+        :param maxsize: Maximum number of entries per endpoint
+        :param ttls: Per-endpoint TTL overrides merged over DEFAULT_TTLS
+        """
+        self.ttls = dict(self.DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.caches = {name: TTLCache(maxsize=maxsize, default_ttl=ttl, name=name)
+                       for name, ttl in self.ttls.items()}
+
+    def get(self, endpoint: str, key):
+        return self.caches[endpoint].get(key)
+
+    def set(self, endpoint: str, key, value, ttl: float = None):
+        limit = self.ttls[endpoint]
+        ttl = limit if ttl is None else min(ttl, limit)
+        self.caches[endpoint].set(key, value, ttl)
+
+    def ttl_for(self, endpoint: str, params: dict = None):
+        """
+        Returns the TTL for a request, applying the dynamic rules for expirations and history.
+        """
+        limit = self.ttls[endpoint]
+        if endpoint == 'option_expiration_chain':
+            return min(limit, seconds_until_end_of_day())
+        if endpoint == 'historical_data':
+            return history_ttl(params or {}, limit)
+        return limit
+
+    def clear(self):
+        for cache in self.caches.values():
+            cache.clear()
+
+    def stats(self):
+        return {name: cache.stats() for name, cache in self.caches.items()}
@@ -0,0 +1,159 @@
+import threading
+import numpy as np
+import pandas as pd
+from schwab_api.option_chain import OptionChain
+
+DEFAULT_DIFF_COLUMNS = ('bid', 'ask', 'last', 'mark', 'bidSize', 'askSize', 'totalVolume', 'openInterest',
+                        'volatility', 'delta', 'gamma', 'theta', 'vega', 'rho')
+
+
+class _Snapshot:
+    """
+    The parts of a chain needed for the next diff: the contract index and the
+    watched columns as float arrays.
+    """
+
+    def __init__(self, index: pd.Index, values: dict):
+        self.index = index
+        self.values = values
+
+
+class ChainDiff:
+    """
+    Difference between two snapshots of one underlying's chain.
+
+    ``added`` holds the full rows of contracts that appeared and ``removed``
+    the last known watched values of contracts that disappeared. ``changed``
+    holds the new watched values of contracts present in both snapshots with
+    at least one watched value moved; ``changed_mask`` flags which ones.
+    All frames are indexed by contract symbol.
+    """
+
+    def __init__(self, underlying: str, added: pd.DataFrame, removed: pd.DataFrame, changed: pd.DataFrame,
+                 changed_mask: pd.DataFrame, unchanged: int):
+        self.underlying = underlying
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.changed_mask = changed_mask
+        self.unchanged = unchanged
+
+    @property
+    def empty(self):
+        return not (len(self.added) or len(self.removed) or len(self.changed))
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def __repr__(self):
+        return (f"ChainDiff({self.underlying!r}, added={len(self.added)}, removed={len(self.removed)}, "
+                f"changed={len(self.changed)}, unchanged={self.unchanged})")
+
+
+class ChainSnapshotStore:
+    """
+    Keeps the last option chain per underlying and diffs each new one against it.
+
+    The comparison is vectorized: the new contract index is aligned to the
+    previous one with a single get_indexer call, and every watched column is
+    compared as a float array. Only the watched columns of the previous
+    snapshot are kept, not the whole frame.
+    """
+
+    def __init__(self, columns=DEFAULT_DIFF_COLUMNS, key: str = 'symbol', tolerance: float = 0.0):
+        """
+        :param columns: Columns whose changes are reported; columns missing from a chain are skipped
+        :param key: Column identifying a contract
+        :param tolerance: Absolute change at or below which a value counts as unchanged
+        """
+        self.columns = tuple(columns)
+        self.key = key
+        self.tolerance = tolerance
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def _frame(self, chain):
+        if isinstance(chain, OptionChain):
+            chain = chain.to_dataframe()
+        frame = chain.set_index(self.key, drop=False)
+        if not frame.index.is_unique:
+            frame = frame[~frame.index.duplicated(keep='last')]
+        return frame
+
+    def _values(self, frame, columns):
+        return {name: frame[name].to_numpy(dtype=np.float64, na_value=np.nan) for name in columns}
+
+    def update(self, underlying: str, chain):
+        """
+        Stores ``chain`` as the latest snapshot of ``underlying`` and returns what changed.
+
+        The first snapshot of an underlying reports every contract as added.
+
+        :param underlying: Underlying symbol the chain belongs to
+        :param chain: DataFrame from get_option_chains, or an OptionChain
+        :return: ChainDiff
+        """
+        frame = self._frame(chain)
+        columns = [name for name in self.columns if name in frame.columns]
+        values = self._values(frame, columns)
+        snapshot = _Snapshot(frame.index, values)
+        with self._lock:
+            previous = self._snapshots.get(underlying)
+            self._snapshots[underlying] = snapshot
+        return self._diff(underlying, previous, frame, snapshot, columns)
+
+    def _diff(self, underlying, previous, frame, snapshot, columns):
+        empty_mask = pd.DataFrame({name: pd.Series(dtype=bool) for name in columns},
+                                  index=frame.index[:0])
+        if previous is None:
+            return ChainDiff(underlying, frame, frame.iloc[:0], frame.iloc[:0][columns], empty_mask, 0)
+
+        positions = previous.index.get_indexer(snapshot.index)
+        common = np.flatnonzero(positions >= 0)
+        old_rows = positions[common]
+        added = frame.iloc[np.flatnonzero(positions < 0)]
+        removed_rows = np.flatnonzero(~previous.index.isin(snapshot.index))
+        removed = pd.DataFrame({name: values[removed_rows] for name, values in previous.values.items()},
+                               index=previous.index[removed_rows])
+
+        masks = {}
+        any_changed = np.zeros(len(common), dtype=bool)
+        for name in columns:
+            new = snapshot.values[name][common]
+            old = previous.values.get(name)
+            if old is None:
+                continue
+            old = old[old_rows]
+            new_nan, old_nan = np.isnan(new), np.isnan(old)
+            with np.errstate(invalid='ignore'):
+                moved = np.abs(new - old) > self.tolerance
+            mask = moved | (new_nan != old_nan)
+            masks[name] = mask
+            any_changed |= mask
+
+        rows = common[any_changed]
+        changed = frame.iloc[rows][list(masks)]
+        changed_mask = pd.DataFrame({name: mask[any_changed] for name, mask in masks.items()},
+                                    index=changed.index)
+        return ChainDiff(underlying, added, removed, changed, changed_mask, int(len(common) - len(rows)))
+
+    def get(self, underlying: str):
+        """
+        Returns the contract symbols of the stored snapshot, or None.
+        """
+        snapshot = self._snapshots.get(underlying)
+        return None if snapshot is None else snapshot.index
+
+    def drop(self, underlying: str):
+        with self._lock:
+            self._snapshots.pop(underlying, None)
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+    def __contains__(self, underlying):
+        return underlying in self._snapshots
+
+    def __len__(self):
+        return len(self._snapshots)
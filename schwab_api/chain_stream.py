@@ -0,0 +1,167 @@
+import codecs
+import json
+import re
+from itertools import accumulate
+from schwab_api.exceptions import SchwabAPIError
+
+_WHITESPACE = ' \t\r\n'
+_DELIMITERS = ',:}] \t\r\n'
+_NOT_BRACKET = re.compile(r'[^{}\[\]]+')
+_DEPTH_DELTA = {'{': 1, '[': 1, '}': -1, ']': -1}
+_MAP_SIDES = {'callExpDateMap': 'CALL', 'putExpDateMap': 'PUT'}
+
+
+class ChainStreamParser:
+    """
+    Incrementally parses an option chain response body.
+
+    The body is read chunk by chunk. Top-level fields are decoded as they
+    arrive; inside callExpDateMap/putExpDateMap only one expiration's raw text
+    is buffered at a time, decoded, handed out and dropped, so memory stays
+    bounded by the largest expiration rather than the whole chain.
+
+    Iterating yields ``(side, exp_date, strikes)`` tuples where ``strikes`` is
+    the decoded ``{strike: [contract, ...]}`` mapping of one expiration.
+    Chain-level fields (status, underlying, underlyingPrice, ...) are collected
+    in ``meta``.
+    """
+
+    def __init__(self, chunks, encoding: str = 'utf-8'):
+        """
+        :param chunks: Iterable of bytes (or str) chunks, e.g. response.iter_content()
+        :param encoding: Encoding of byte chunks
+        """
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._decoder_json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._scanned = 0
+        self._depth = 0
+        self._eof = False
+        self.meta = {}
+
+    def _fill(self):
+        """
+        Appends the next chunk to the buffer; returns False at end of input.
+        """
+        while not self._eof:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._eof = True
+                tail = self._decoder.decode(b'', final=True)
+                if tail:
+                    self._buf += tail
+                    return True
+                return False
+            text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self._buf += text
+                return True
+        return False
+
+    def _compact(self):
+        # drop everything already consumed so the buffer only holds unread text
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+
+    def _error(self, message):
+        return SchwabAPIError(f"Invalid option chain stream: {message} at offset {self._pos}")
+
+    def _peek(self):
+        """
+        Skips whitespace and returns the next character without consuming it.
+        """
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            self._compact()
+            if not self._fill():
+                raise self._error("unexpected end of input")
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise self._error(f"expected {char!r}")
+        self._pos += 1
+
+    def _closes(self):
+        """
+        Scans newly buffered text and returns True once the bracket depth of the
+        value being read has returned to zero.
+
+        Only bracket characters are looked at, extracted and summed in C, so
+        the scan does not run Python code per token. Brackets inside strings
+        can skew the estimate; the decoder then fails or runs later than
+        needed, which costs time but never changes the result.
+        """
+        brackets = _NOT_BRACKET.sub('', self._buf[self._scanned:])
+        self._scanned = len(self._buf)
+        if not brackets:
+            return False
+        depths = list(accumulate(map(_DEPTH_DELTA.__getitem__, brackets), initial=self._depth))
+        self._depth = depths[-1]
+        return min(depths[1:]) <= 0
+
+    def _read_value(self):
+        """
+        Reads and decodes the next JSON value.
+
+        Objects and arrays are handed to the C decoder once their closing
+        bracket appears to be buffered, so a large value is normally decoded
+        exactly once rather than retried on every chunk.
+        """
+        self._peek()
+        start = self._pos
+        self._scanned = start
+        self._depth = 0
+        container = self._buf[start] in '{['
+        while True:
+            if not container or self._closes() or self._eof:
+                try:
+                    value, end = self._decoder_json.raw_decode(self._buf, start)
+                except ValueError as err:
+                    if self._eof:
+                        raise self._error(str(err)) from err
+                    # the estimate was thrown off by brackets in a string
+                    self._depth = max(self._depth, 1)
+                else:
+                    # a number cut off by the chunk boundary ('45' of '4500.0') decodes too early
+                    if self._eof or (end < len(self._buf) and (container or self._buf[end] in _DELIMITERS)):
+                        self._pos = end
+                        return value
+            if not self._fill() and not self._eof:
+                raise self._error("unexpected end of input")
+
+    def _members(self):
+        """
+        Yields the keys of the object at the current position, leaving the
+        position at each member's value.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._read_value()
+            self._expect(':')
+            yield key
+            char = self._peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise self._error("expected ',' or '}'")
+
+    def __iter__(self):
+        for key in self._members():
+            side = _MAP_SIDES.get(key)
+            if side is None:
+                self.meta[key] = self._read_value()
+                continue
+            for exp_date in self._members():
+                strikes = self._read_value()
+                self._compact()
+                yield side, exp_date, strikes
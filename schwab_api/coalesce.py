@@ -0,0 +1,116 @@
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight block and receive the same result (or exception) instead of
+    issuing their own request. Nothing is remembered once the call finishes;
+    caching is left to MarketDataCache.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Runs ``fn()`` once for all concurrent callers with the same key.
+
+        :param key: Hashable key identifying the call, e.g. cache.make_key(url, params)
+        :param fn: Zero-argument callable doing the work
+        :return: The result of fn
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self):
+        return len(self._calls)
+
+    def stats(self):
+        return {'executed': self.executed, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight; callers await one shared task.
+
+    The work runs in its own task, so cancelling any caller, the first one
+    included, leaves the call running for the others.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def _finished(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # mark retrieved so an exception nobody waits on is not reported
+            task.exception()
+
+    async def do(self, key, fn):
+        """
+        Awaits ``fn()`` once for all concurrent callers with the same key.
+
+        :param key: Hashable key identifying the call
+        :param fn: Zero-argument coroutine function doing the work
+        :return: The result of fn
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self.executed += 1
+            task.add_done_callback(lambda done: self._finished(key, done))
+        # shield so one cancelled caller does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def in_flight(self):
+        return len(self._calls)
+
+    def stats(self):
+        return {'executed': self.executed, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
@@ -0,0 +1,88 @@
+class SchwabAPIError(Exception):
+    """
+    Base class for all errors raised by the Schwab API client.
+    """
+
+
+class SchwabConnectionError(SchwabAPIError):
+    """
+    Raised when the API could not be reached (DNS, connect, read timeout) after all retries.
+    """
+
+
+class CircuitOpenError(SchwabAPIError):
+    """
+    Raised without sending a request while an endpoint's circuit breaker is open.
+    """
+
+    def __init__(self, endpoint, retry_in):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for {endpoint}; retry in {retry_in:.1f}s")
+
+
+class SchwabHTTPError(SchwabAPIError):
+    """
+    Raised for an HTTP error status returned by the API.
+    """
+
+    def __init__(self, message, status_code=None, url=None, method=None, body=None, retry_after=None):
+        self.status_code = status_code
+        self.url = url
+        self.method = method
+        self.body = body
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class SchwabClientError(SchwabHTTPError):
+    """
+    Raised for 4xx responses; the request itself was rejected.
+    """
+
+
+class SchwabAuthError(SchwabClientError):
+    """
+    Raised for 401/403 responses.
+    """
+
+
+class SchwabNotFoundError(SchwabClientError):
+    """
+    Raised for 404 responses.
+    """
+
+
+class SchwabRateLimitError(SchwabClientError):
+    """
+    Raised for 429 responses that are still throttled after all retries.
+    """
+
+
+class SchwabServerError(SchwabHTTPError):
+    """
+    Raised for 5xx responses that still fail after all retries.
+    """
+
+
+class SchwabStreamError(SchwabAPIError):
+    """
+    Raised when the streamer rejects a request, does not answer it, or the connection is lost.
+    """
+
+
+def error_for_status(status_code):
+    """
+    Returns the SchwabHTTPError subclass matching an HTTP status code.
+    """
+    if status_code in (401, 403):
+        return SchwabAuthError
+    if status_code == 404:
+        return SchwabNotFoundError
+    if status_code == 429:
+        return SchwabRateLimitError
+    if 400 <= status_code < 500:
+        return SchwabClientError
+    if status_code >= 500:
+        return SchwabServerError
+    return SchwabHTTPError
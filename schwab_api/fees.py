@@ -1,14 +1,15 @@
-import requests
+from .session import SchwabSession
 
 class Fees:
-    def __init__(self, auth):
+    def __init__(self, auth, session=None):
         self.auth = auth
+        self.session = session if session is not None else SchwabSession()
         self.fee_url = None
 
     '''def get_fees(self, trade_type):
         headers = self.auth.get_headers()
         params = {'tradeType': trade_type}
-        response = requests.get(self.fee_url, headers=headers, params=params)
+        response = self.session.get(self.fee_url, headers=headers, params=params)
         response.raise_for_status()
         return response.json()
         '''
@@ -0,0 +1,215 @@
+import math
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.special import ndtr as _ndtr
+except ImportError:
+    _ndtr = None
+
+_erf = np.frompyfunc(math.erf, 1, 1)
+_SQRT2 = math.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+YEAR_SECONDS = 365.0 * 24 * 3600
+MIN_TIME = 1.0 / (365.0 * 24 * 60)
+MIN_VOL = 1e-4
+MAX_VOL = 5.0
+
+
+def norm_cdf(x):
+    """
+    Standard normal CDF; uses scipy when installed, math.erf otherwise.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if _ndtr is not None:
+        return _ndtr(x)
+    return 0.5 * (1.0 + np.asarray(_erf(x / _SQRT2), dtype=np.float64))
+
+
+def norm_pdf(x):
+    return _INV_SQRT_2PI * np.exp(-0.5 * np.square(x))
+
+
+def _inputs(spot, strike, t, rate, vol, q):
+    spot, strike, t, rate, vol, q = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64)
+                                                          for v in (spot, strike, t, rate, vol, q)))
+    return spot, strike, np.maximum(t, MIN_TIME), rate, np.maximum(vol, MIN_VOL), q
+
+
+def _d1_d2(spot, strike, t, rate, vol, q):
+    sqrt_t = np.sqrt(t)
+    d1 = (np.log(spot / strike) + (rate - q + 0.5 * vol * vol) * t) / (vol * sqrt_t)
+    return d1, d1 - vol * sqrt_t, sqrt_t
+
+
+def bs_price(spot, strike, t, rate, vol, is_call, q=0.0):
+    """
+    Black-Scholes-Merton price of European options; all inputs broadcast.
+
+    :param spot: Underlying price
+    :param strike: Strike price
+    :param t: Time to expiration in years
+    :param rate: Continuously compounded risk-free rate (0.05 for 5%)
+    :param vol: Volatility (0.20 for 20%)
+    :param is_call: Boolean array, True for calls
+    :param q: Continuous dividend yield
+    :return: Array of option prices
+    """
+    spot, strike, t, rate, vol, q = _inputs(spot, strike, t, rate, vol, q)
+    d1, d2, _ = _d1_d2(spot, strike, t, rate, vol, q)
+    discounted_spot = spot * np.exp(-q * t)
+    discounted_strike = strike * np.exp(-rate * t)
+    call = discounted_spot * norm_cdf(d1) - discounted_strike * norm_cdf(d2)
+    put = discounted_strike * norm_cdf(-d2) - discounted_spot * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def bs_greeks(spot, strike, t, rate, vol, is_call, q=0.0):
+    """
+    Black-Scholes-Merton price and greeks for a batch of options.
+
+    Greeks follow the chain endpoint's conventions: theta is per calendar day,
+    vega and rho are per one percentage point.
+
+    :return: Dict of arrays: price, delta, gamma, theta, vega, rho
+    """
+    is_call, spot, strike, t, rate, vol, q = np.broadcast_arrays(np.asarray(is_call, dtype=bool),
+                                                                 spot, strike, t, rate, vol, q)
+    spot, strike, t, rate, vol, q = _inputs(spot, strike, t, rate, vol, q)
+    d1, d2, sqrt_t = _d1_d2(spot, strike, t, rate, vol, q)
+    dividend_discount = np.exp(-q * t)
+    rate_discount = np.exp(-rate * t)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1, cdf_d2 = norm_cdf(d1), norm_cdf(d2)
+    cdf_md1, cdf_md2 = 1.0 - cdf_d1, 1.0 - cdf_d2
+
+    price = np.where(is_call,
+                     spot * dividend_discount * cdf_d1 - strike * rate_discount * cdf_d2,
+                     strike * rate_discount * cdf_md2 - spot * dividend_discount * cdf_md1)
+    delta = np.where(is_call, dividend_discount * cdf_d1, -dividend_discount * cdf_md1)
+    gamma = dividend_discount * pdf_d1 / (spot * vol * sqrt_t)
+    vega = spot * dividend_discount * pdf_d1 * sqrt_t
+    decay = -spot * dividend_discount * pdf_d1 * vol / (2.0 * sqrt_t)
+    theta = np.where(is_call,
+                     decay - rate * strike * rate_discount * cdf_d2 + q * spot * dividend_discount * cdf_d1,
+                     decay + rate * strike * rate_discount * cdf_md2 - q * spot * dividend_discount * cdf_md1)
+    rho = np.where(is_call, strike * t * rate_discount * cdf_d2, -strike * t * rate_discount * cdf_md2)
+    return {'price': price, 'delta': delta, 'gamma': gamma, 'theta': theta / 365.0,
+            'vega': vega / 100.0, 'rho': rho / 100.0}
+
+
+def implied_volatility(price, spot, strike, t, rate, is_call, q=0.0, tol: float = 1e-8, max_iter: int = 100):
+    """
+    Solves Black-Scholes implied volatility for a batch of options at once.
+
+    Each contract keeps a bracket [lo, hi] around its root. A Newton step is
+    taken where it stays inside the bracket and vega is usable; otherwise the
+    step falls back to bisection, so every contract converges. Prices outside
+    the no-arbitrage bounds give NaN.
+
+    :param price: Observed option prices (e.g. the chain's mark)
+    :param tol: Absolute price tolerance
+    :param max_iter: Maximum iterations
+    :return: Array of implied volatilities
+    """
+    price, is_call, spot, strike, t, rate, q = np.broadcast_arrays(
+        np.asarray(price, dtype=np.float64), np.asarray(is_call, dtype=bool), spot, strike, t, rate, q)
+    spot, strike, t, rate, _, q = _inputs(spot, strike, t, rate, MIN_VOL, q)
+
+    discounted_spot = spot * np.exp(-q * t)
+    discounted_strike = strike * np.exp(-rate * t)
+    lower = np.where(is_call, np.maximum(discounted_spot - discounted_strike, 0.0),
+                     np.maximum(discounted_strike - discounted_spot, 0.0))
+    upper = np.where(is_call, discounted_spot, discounted_strike)
+    valid = np.isfinite(price) & (price > lower) & (price < upper)
+
+    lo = np.full(spot.shape, MIN_VOL)
+    hi = np.full(spot.shape, MAX_VOL)
+    # Brenner-Subrahmanyam start, kept inside the bracket
+    vol = np.clip(np.sqrt(2.0 * np.pi / t) * price / np.maximum(spot, 1e-12), 0.05, 2.0)
+    active = valid.copy()
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        sqrt_t = np.sqrt(t[idx])
+        d1, d2, _ = _d1_d2(spot[idx], strike[idx], t[idx], rate[idx], vol[idx], q[idx])
+        call = discounted_spot[idx] * norm_cdf(d1) - discounted_strike[idx] * norm_cdf(d2)
+        model = np.where(is_call[idx], call, call - discounted_spot[idx] + discounted_strike[idx])
+        diff = model - price[idx]
+        done = np.abs(diff) < tol
+        # price is increasing in vol, so the sign of diff tells which side of the root we are on
+        hi[idx] = np.where(diff > 0, vol[idx], hi[idx])
+        lo[idx] = np.where(diff < 0, vol[idx], lo[idx])
+        vega = discounted_spot[idx] * norm_pdf(d1) * sqrt_t
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = vol[idx] - diff / vega
+        inside = np.isfinite(newton) & (newton > lo[idx]) & (newton < hi[idx])
+        vol[idx] = np.where(done, vol[idx], np.where(inside, newton, 0.5 * (lo[idx] + hi[idx])))
+        active[idx[done]] = False
+        active[idx[hi[idx] - lo[idx] < 1e-12]] = False
+    return np.where(valid, vol, np.nan)
+
+
+def _time_to_expiration(chain: pd.DataFrame, now=None):
+    # prefer the exact expiration timestamp; fall back to whole days
+    now = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
+    if now.tzinfo is None:
+        now = now.tz_localize('UTC')
+    if 'expirationDate' in chain.columns:
+        expiration = pd.to_datetime(chain['expirationDate'], utc=True, errors='coerce')
+        t = ((expiration - now).dt.total_seconds() / YEAR_SECONDS).to_numpy(dtype=np.float64)
+        if not np.isnan(t).any():
+            return t
+    return chain['daysToExpiration'].to_numpy(dtype=np.float64) / 365.0
+
+
+def revalue_chain(chain: pd.DataFrame, spot: float = None, rate: float = None, q: float = 0.0,
+                  vol=None, price_column: str = 'mark', now=None):
+    """
+    Recomputes price and greeks for a whole chain at a new underlying price.
+
+    Volatilities are solved once from ``price_column`` at the spot the chain
+    was pulled at (``underlyingPrice`` in ``chain.attrs['underlying']``), then
+    every contract is revalued at ``spot`` with those volatilities.
+
+    :param chain: Output of HelperFuncs._optionchain_to_dataframe / get_option_chains
+    :param spot: New underlying price; defaults to the chain's underlying price
+    :param rate: Risk-free rate (0.05 for 5%); defaults to the chain's interestRate
+    :param q: Continuous dividend yield
+    :param vol: Volatilities to use instead of solving: an array, or 'server' for
+                the chain's own 'volatility' column
+    :param price_column: Column holding the observed option price
+    :param now: Valuation time; defaults to the current time
+    :return: DataFrame aligned with ``chain`` with columns bs_iv, bs_price,
+             bs_delta, bs_gamma, bs_theta, bs_vega and bs_rho
+    """
+    underlying = chain.attrs.get('underlying', {})
+    chain_spot = underlying.get('underlyingPrice', underlying.get('last'))
+    if spot is None:
+        spot = chain_spot
+    if spot is None:
+        raise ValueError("spot must be given when the chain has no underlying price")
+    if rate is None:
+        rate = float(underlying.get('interestRate', 0.0) or 0.0) / 100.0
+
+    strike = chain['strikePrice'].to_numpy(dtype=np.float64)
+    side = chain['putCall'] if 'putCall' in chain.columns else chain['exp_date_type']
+    is_call = (side == 'CALL').to_numpy()
+    t = _time_to_expiration(chain, now)
+
+    if vol is None:
+        iv = implied_volatility(chain[price_column].to_numpy(dtype=np.float64),
+                                chain_spot if chain_spot is not None else spot, strike, t, rate, is_call, q)
+    elif isinstance(vol, str) and vol == 'server':
+        iv = chain['volatility'].to_numpy(dtype=np.float64) / 100.0
+        # the chain sends -999 (or NaN) where it has no volatility
+        iv = np.where(np.isfinite(iv) & (iv > 0), iv, np.nan)
+    else:
+        iv = np.broadcast_to(np.asarray(vol, dtype=np.float64), strike.shape)
+
+    greeks = bs_greeks(spot, strike, t, rate, iv, is_call, q)
+    result = pd.DataFrame({'bs_iv': iv}, index=chain.index)
+    for name, values in greeks.items():
+        result[f"bs_{name}"] = np.where(np.isfinite(iv), values, np.nan)
+    return result
@@ -1,6 +1,142 @@
 import datetime
+import gc
+import math
+import operator
+import numpy as np
 import pandas as pd
+from urllib.parse import quote
+from contextlib import contextmanager
 from typing import Union
+from schwab_api.cache import EXCHANGE_TZ
+
+
+# Column schema of the quotes endpoint per ``fields`` section: name -> kind.
+# 'f' float, 'i' integer (epoch ms, sizes), 'b' boolean, 'O' string.
+QUOTE_SCHEMA = {
+    'quote': {
+        '52WeekHigh': 'f', '52WeekLow': 'f', 'askMICId': 'O', 'askPrice': 'f', 'askSize': 'i',
+        'askTime': 'i', 'bidMICId': 'O', 'bidPrice': 'f', 'bidSize': 'i', 'bidTime': 'i',
+        'closePrice': 'f', 'highPrice': 'f', 'lastMICId': 'O', 'lastPrice': 'f', 'lastSize': 'i',
+        'lowPrice': 'f', 'mark': 'f', 'markChange': 'f', 'markPercentChange': 'f', 'netChange': 'f',
+        'netPercentChange': 'f', 'openPrice': 'f', 'postMarketChange': 'f', 'postMarketPercentChange': 'f',
+        'quoteTime': 'i', 'securityStatus': 'O', 'totalVolume': 'i', 'tradeTime': 'i', 'volatility': 'f',
+    },
+    'reference': {
+        'cusip': 'O', 'description': 'O', 'exchange': 'O', 'exchangeName': 'O',
+        'isHardToBorrow': 'b', 'isShortable': 'b', 'htbQuantity': 'i', 'htbRate': 'f',
+    },
+    'fundamental': {
+        'avg10DaysVolume': 'f', 'avg1YearVolume': 'f', 'declarationDate': 'O', 'divAmount': 'f',
+        'divExDate': 'O', 'divFreq': 'i', 'divPayAmount': 'f', 'divPayDate': 'O', 'divYield': 'f',
+        'eps': 'f', 'fundLeverageFactor': 'f', 'lastEarningsDate': 'O', 'nextDivExDate': 'O',
+        'nextDivPayDate': 'O', 'peRatio': 'f',
+    },
+    'regular': {
+        'regularMarketLastPrice': 'f', 'regularMarketLastSize': 'i', 'regularMarketNetChange': 'f',
+        'regularMarketPercentChange': 'f', 'regularMarketTradeTime': 'i',
+    },
+    # extended-hours fields repeat quote field names and are prefixed with 'extended_'
+    'extended': {
+        'askPrice': 'f', 'askSize': 'i', 'bidPrice': 'f', 'bidSize': 'i', 'lastPrice': 'f',
+        'lastSize': 'i', 'mark': 'f', 'quoteTime': 'i', 'totalVolume': 'i', 'tradeTime': 'i',
+    },
+}
+QUOTE_META_SCHEMA = {'assetMainType': 'O', 'assetSubType': 'O', 'quoteType': 'O', 'realtime': 'b', 'ssid': 'i'}
+
+# Price history rules: periods per periodType, frequencyTypes per periodType, frequencies per frequencyType.
+HISTORY_PERIODS = {'day': [1, 2, 3, 4, 5, 10], 'month': [1, 2, 3, 6], 'year': [1, 2, 3, 5, 10, 15, 20], 'ytd': [1]}
+HISTORY_FREQUENCY_TYPES = {'day': ['minute'], 'month': ['daily', 'weekly'], 'year': ['daily', 'weekly', 'monthly'],
+                           'ytd': ['daily', 'weekly']}
+HISTORY_FREQUENCIES = {'minute': [1, 5, 10, 15, 30], 'daily': [1], 'weekly': [1], 'monthly': [1]}
+HISTORY_PERIOD_MS = {'day': 86_400_000, 'month': 28 * 86_400_000, 'year': 365 * 86_400_000, 'ytd': 365 * 86_400_000}
+
+# Fields of one candle of the price history endpoint.
+CANDLE_SCHEMA = {'open': 'f', 'high': 'f', 'low': 'f', 'close': 'f', 'volume': 'i', 'datetime': 'i'}
+
+# Fields of one contract in callExpDateMap/putExpDateMap of the chains endpoint.
+OPTION_CONTRACT_SCHEMA = {
+    'putCall': 'O', 'symbol': 'O', 'description': 'O', 'exchangeName': 'O', 'bid': 'f', 'ask': 'f',
+    'last': 'f', 'mark': 'f', 'bidSize': 'i', 'askSize': 'i', 'bidAskSize': 'O', 'lastSize': 'i',
+    'highPrice': 'f', 'lowPrice': 'f', 'openPrice': 'f', 'closePrice': 'f', 'totalVolume': 'i',
+    'tradeTimeInLong': 'i', 'quoteTimeInLong': 'i', 'netChange': 'f', 'volatility': 'f', 'delta': 'f',
+    'gamma': 'f', 'theta': 'f', 'vega': 'f', 'rho': 'f', 'openInterest': 'i', 'timeValue': 'f',
+    'theoreticalOptionValue': 'f', 'theoreticalVolatility': 'f', 'optionDeliverablesList': 'O',
+    'strikePrice': 'f', 'expirationDate': 'O', 'daysToExpiration': 'i', 'expirationType': 'O',
+    'lastTradingDay': 'i', 'multiplier': 'f', 'settlementType': 'O', 'deliverableNote': 'O',
+    'percentChange': 'f', 'markChange': 'f', 'markPercentChange': 'f', 'intrinsicValue': 'f',
+    'extrinsicValue': 'f', 'optionRoot': 'O', 'exerciseType': 'O', 'high52Week': 'f', 'low52Week': 'f',
+    'nonStandard': 'b', 'pennyPilot': 'b', 'inTheMoney': 'b', 'mini': 'b',
+}
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pauses the cyclic garbage collector while a large response is converted.
+
+    Building hundreds of thousands of short-lived tuples otherwise triggers
+    repeated collections that find nothing to free.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _columns_from_records(blocks, schema, columns, prefix=''):
+    """
+    Adds one typed column per schema field of ``blocks`` (a list of dicts) to ``columns``.
+
+    Complete blocks are read with a single itemgetter call and transposed;
+    fields outside the schema are added as object columns after the known ones.
+    """
+    names = list(schema)
+    getter = operator.itemgetter(*names)
+    empty = {}
+    blocks = [block or empty for block in blocks]
+    records = [getter(block) if schema.keys() <= block.keys() else tuple(map(block.get, names))
+               for block in blocks]
+    transposed = zip(*records) if records else [()] * len(names)
+    for name, values in zip(names, transposed):
+        columns[prefix + name] = _typed_column(schema[name], list(values))
+    extras = set().union(*blocks).difference(schema) if blocks else ()
+    for name in sorted(extras):
+        columns[prefix + name] = _typed_column('O', [block.get(name) for block in blocks])
+    return columns
+
+
+def _object_column(values):
+    # np.array would turn a column of lists (e.g. optionDeliverablesList) into a 2-d array
+    try:
+        return np.fromiter(values, dtype=object, count=len(values))
+    except (TypeError, ValueError):
+        column = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            column[i] = value
+        return column
+
+
+def _typed_column(kind, values):
+    # integer and boolean columns keep their exact dtype unless a value is missing
+    if kind == 'O':
+        return _object_column(values)
+    if kind == 'b':
+        if None in values:
+            return _object_column(values)
+        return np.array(values, dtype=bool)
+    try:
+        column = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        # value does not fit the schema type; keep the column as objects
+        return _object_column(values)
+    if kind == 'i' and not np.isnan(column).any():
+        integers = column.astype(np.int64)
+        if (integers == column).all():
+            return integers
+    return column
 
 
 class HelperFuncs:
@@ -54,6 +190,37 @@ class HelperFuncs:
             raise ValueError("Symbols parameter must be a string or list of strings")
 
     
+    @staticmethod
+    def _chunk_symbols(symbols: list, max_symbols: int, max_length: int):
+        """
+        Splits symbols into evenly sized batches that respect a per-call symbol
+        limit and a limit on the URL-encoded length of the symbols parameter.
+        
+        :param symbols: List of symbols
+        :param max_symbols: Maximum number of symbols per batch
+        :param max_length: Maximum encoded length of the joined symbols parameter
+        :return: List of symbol lists
+        """
+        if not symbols:
+            return []
+        # spread the symbols evenly instead of leaving a small trailing batch
+        target = math.ceil(len(symbols) / math.ceil(len(symbols) / max_symbols))
+        batches = []
+        batch = []
+        length = 0
+        for symbol in symbols:
+            # every symbol after the first is preceded by an encoded comma (%2C)
+            size = len(quote(symbol, safe='')) + (3 if batch else 0)
+            if batch and (len(batch) >= target or length + size > max_length):
+                batches.append(batch)
+                batch = []
+                length = 0
+                size -= 3
+            batch.append(symbol)
+            length += size
+        batches.append(batch)
+        return batches
+
     @staticmethod 
     def _validate_contractType(contractType: str):
         """
@@ -150,21 +317,11 @@ class HelperFuncs:
         
         :param period: The number of chart period types.
         """
-        day_valid_values = [1, 2, 3, 4, 5, 10]
-        month_valid_values = [1, 2, 3, 6]
-        year_valid_values = [1, 2, 3, 5, 10, 15, 20]
-        ytd_valid_value = [1]
         periodType = HelperFuncs._validate_periodType(periodType=periodType)
-        if periodType == 'day' and period not in day_valid_values:
-            raise ValueError("Due to your periodType being 'day', the Period parameter must be one of: " + ", ".join(day_valid_values))
-        elif periodType == 'month' and period not in month_valid_values:
-            raise ValueError("Due to your periodType being 'month', the Period parameter must be one of: " + ", ".join(month_valid_values))
-        elif periodType == 'year' and period not in year_valid_values:
-            raise ValueError("Due to your periodType being 'year', the Period parameter must be one of: " + ", ".join(year_valid_values))
-        elif periodType == 'ytd' and period not in ytd_valid_value:
-            raise ValueError("Due to your periodType being 'ytd', the Period parameter must be one of: " + ", ".join(ytd_valid_value))
-        else:
-            return period
+        if period not in HISTORY_PERIODS[periodType]:
+            raise ValueError(f"Due to your periodType being '{periodType}', the Period parameter must be one of: "
+                             + ", ".join(map(str, HISTORY_PERIODS[periodType])))
+        return period
         
     @staticmethod
     def _validate_frequencyType( frequencyType: str, periodType):
@@ -173,23 +330,11 @@ class HelperFuncs:
         
         :param frequencyType: The timefrequency with which a new candle is formed.
         """
-        day_valid_value = ['minute'] # valid values is minute
-        month_valid_values = ['daily', 'weekly']
-        year_valid_values = ['daily', 'weekly', 'monthly']
-        ytd_valid_values = ['daily', 'weekly']
-
         periodType = HelperFuncs._validate_periodType(periodType=periodType)
-
-        if periodType == 'day' and frequencyType not in day_valid_value:
-            raise ValueError("Due to your periodType being 'day', the FrequencyType parameter must be one of: " + ", ".join(day_valid_value))
-        elif periodType == 'month' and frequencyType not in month_valid_values:
-            raise ValueError("Due to your periodType being 'month', the FrequencyType parameter must be one of: " + ", ".join(month_valid_values))
-        elif periodType == 'year' and frequencyType not in year_valid_values:
-            raise ValueError("Due to your periodType being 'year', the FrequencyType parameter must be one of: " + ", ".join(year_valid_values))
-        elif periodType == 'ytd' and frequencyType not in ytd_valid_values:
-            raise ValueError("Due to your periodType being 'ytd', the FrequencyType parameter must be one of: " + ", ".join(ytd_valid_values))
-        else:
-            return frequencyType
+        if frequencyType not in HISTORY_FREQUENCY_TYPES[periodType]:
+            raise ValueError(f"Due to your periodType being '{periodType}', the FrequencyType parameter must be "
+                             "one of: " + ", ".join(HISTORY_FREQUENCY_TYPES[periodType]))
+        return frequencyType
 
 
     @staticmethod
@@ -198,32 +343,55 @@ class HelperFuncs:
         Validates the frequency parameter.
         """    
         frequencyType = HelperFuncs._validate_frequencyType(frequencyType=frequencyType, periodType=periodType)
-        
-        minute_valid_values = [1, 5, 10, 15, 30]
-        daily_valid_value = [1]
-        weekly_valid_value = [1]
-        monthly_valid_value = [1]
-        
-        if frequencyType == 'minute' and frequency not in minute_valid_values:
-            raise ValueError("Due to your frequencyType being 'minute', the Frequency parameter must be one of: " + ", ".join(minute_valid_values))
-        elif frequencyType == 'daily' and frequency not in daily_valid_value:
-            raise ValueError("Due to your frequencyType being 'daily', the Frequency parameter must be one of: " + ", ".join(daily_valid_value))
-        elif frequencyType == 'weekly' and frequency not in weekly_valid_value:
-            raise ValueError("Due to your frequencyType being 'weekly', the Frequency parameter must be one of: " + ", ".join(weekly_valid_value))
-        elif frequencyType == 'monthly' and frequency not in monthly_valid_value:
-            raise ValueError("Due to your frequencyType being 'monthly', the Frequency parameter must be one of: " + ", ".join(monthly_valid_value))
-        else:
-            return frequency    
+        if frequency not in HISTORY_FREQUENCIES[frequencyType]:
+            raise ValueError(f"Due to your frequencyType being '{frequencyType}', the Frequency parameter must be "
+                             "one of: " + ", ".join(map(str, HISTORY_FREQUENCIES[frequencyType])))
+        return frequency
 
     @staticmethod
-    def _date_format(date: Union[int, str]):
+    def _history_period_type(frequencyType: str):
         """
-        Formats the date parameter.
+        Returns the periodType that allows the longest window for a frequencyType.
         """
-        if isinstance(date, int):
-            return date
-        ndate = datetime.datetime.strptime(date, "%Y-%m-%d")
-        return int(ndate.timestamp())
+        for periodType in ('day', 'year', 'month', 'ytd'):
+            if frequencyType in HISTORY_FREQUENCY_TYPES[periodType]:
+                return periodType
+        raise ValueError("FrequencyType parameter must be one of: " + ", ".join(HISTORY_FREQUENCIES))
+
+    @staticmethod
+    def _history_windows(start: int, end: int, frequencyType: str, frequency: int):
+        """
+        Splits [start, end] (epoch milliseconds) into windows the price history endpoint serves in full.
+
+        The window is the longest period allowed for the periodType that goes
+        with ``frequencyType`` (10 days of minute bars, 20 years otherwise).
+
+        :return: List of (start, end) pairs covering the range without overlap
+        """
+        periodType = HelperFuncs._history_period_type(frequencyType)
+        HelperFuncs._validate_frequency(frequencyType=frequencyType, frequency=frequency, periodType=periodType)
+        width = max(HISTORY_PERIODS[periodType]) * HISTORY_PERIOD_MS[periodType]
+        bounds = list(range(int(start), int(end), width)) + [int(end)]
+        if len(bounds) == 1:
+            return [(int(start), int(end))]
+        return [(lo, hi - 1 if i < len(bounds) - 2 else hi) for i, (lo, hi) in enumerate(zip(bounds, bounds[1:]))]
+
+    @staticmethod
+    def _date_format(date: Union[int, str, datetime.datetime]):
+        """
+        Formats the date parameter as epoch milliseconds, as the price history endpoint expects.
+
+        Integers are taken to be epoch milliseconds already. 'YYYY-MM-DD' strings and
+        naive datetimes are read in exchange time (America/New_York).
+        """
+        if isinstance(date, (int, np.integer)):
+            return int(date)
+        if isinstance(date, str):
+            date = datetime.datetime.strptime(date, "%Y-%m-%d")
+        ndate = pd.Timestamp(date)
+        if ndate.tzinfo is None:
+            ndate = ndate.tz_localize(EXCHANGE_TZ)
+        return int(ndate.value // 1_000_000)
     
     @staticmethod
     def _parse_json_to_dataframe(json_file):
@@ -247,6 +415,40 @@ class HelperFuncs:
         
         return df
     
+    @staticmethod
+    def _parse_quotes_to_dataframe(json_data: dict, fields: Union[list, str] = 'quote,reference'):
+        """
+        Builds a quotes DataFrame column by column with a fixed schema.
+        
+        Each known field of the requested sections is pulled out as one column
+        and converted to a typed array, so there is no per-row dict merging and
+        a symbol missing a section simply gets missing values in those columns. Fields
+        not in QUOTE_SCHEMA are kept as extra object columns. The 'errors' entry
+        (e.g. invalid symbols) is moved to ``df.attrs['errors']``.
+        
+        :param json_data: Decoded JSON body of the quotes endpoint
+        :param fields: Sections requested from the endpoint
+        :return: DataFrame with one row per symbol
+        """
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        sections = [field.strip() for field in fields if field.strip() in QUOTE_SCHEMA]
+        errors = json_data.get('errors')
+        symbols = [symbol for symbol in json_data if symbol != 'errors']
+        rows = [json_data[symbol] for symbol in symbols]
+
+        with _gc_paused():
+            columns = {'symbol': _object_column(symbols)}
+            for section in sections:
+                _columns_from_records([row.get(section) for row in rows], QUOTE_SCHEMA[section], columns,
+                                      prefix='extended_' if section == 'extended' else '')
+            for name, kind in QUOTE_META_SCHEMA.items():
+                columns[name] = _typed_column(kind, [row.get(name) for row in rows])
+            df = pd.DataFrame(columns, copy=False)
+        if errors:
+            df.attrs['errors'] = errors
+        return df
+    
     @staticmethod
     def _validate_month(month: Union[int, str]):
         """
@@ -334,48 +536,110 @@ class HelperFuncs:
         return extracted_data
 
     
-    def _optionchain_to_dataframe(self,json_data):
-        # Load the JSON data from the file
+    @staticmethod
+    def _contracts_to_dataframe(contracts: list, sides: list, exp_dates: list):
+        """
+        Converts a list of option contract dicts into a typed DataFrame.
         
+        :param contracts: Contract dicts from an expiration map
+        :param sides: 'CALL' or 'PUT' per contract
+        :param exp_dates: Expiration map key per contract
+        :return: DataFrame with one row per contract
+        """
+        with _gc_paused():
+            columns = _columns_from_records(contracts, OPTION_CONTRACT_SCHEMA, {})
+            columns['exp_date_type'] = _object_column(sides)
+            columns['exp_date'] = _object_column(exp_dates)
+            return pd.DataFrame(columns, copy=False)
 
-        # Initialize a list to store all rows for the dataframe
-        rows = []
+    @staticmethod
+    def _chain_underlying(json_data: dict):
+        """
+        Returns the chain-level fields merged with the flattened 'underlying' block.
+        """
+        underlying = {k: v for k, v in json_data.items()
+                      if k not in ('callExpDateMap', 'putExpDateMap', 'underlying')}
+        underlying.update(HelperFuncs._flatten_json(json_data.get('underlying') or {}))
+        return underlying
 
-        # Flatten the "underlying" data
-        underlying_data = self._flatten_json(json_data.get("underlying", {}))
-
-        # Check and process callExpDateMap if present
-        if "callExpDateMap" in json_data:
-            call_exp_date_map = json_data["callExpDateMap"]
-            for exp_date, strikes in call_exp_date_map.items():
-                for  strike_price, options_list in strikes.items():
-                    for option in options_list:
-                        row = underlying_data.copy()
-                        row.update(self._flatten_json(option))
-                        row.update(self._extract_specific_keys(option))
-                        row['exp_date_type'] = "CALL"
-                        row['exp_date'] = exp_date
-                        rows.append(row)
-        
-        # Check and process putExpDateMap if present
-        if "putExpDateMap" in json_data:
-            put_exp_date_map = json_data["putExpDateMap"]
-            for exp_date, strikes in put_exp_date_map.items():
-                for strike_price, options_list in strikes.items():
-                    for option in options_list:
-                        row = underlying_data.copy()
-                        row.update(self._flatten_json(option))
-                        row.update(self._extract_specific_keys(option))
-                        row['exp_date_type'] = "PUT"
-                        row['exp_date'] = exp_date
-                        rows.append(row)
-
-        # Create a DataFrame
-        df = pd.DataFrame(rows)
+    @staticmethod
+    def _optionchain_to_frames(json_data: dict):
+        """
+        Parses an option chain response into a contracts frame and an underlying frame.
+        
+        callExpDateMap and putExpDateMap are walked once; contract fields go into
+        typed columns (OPTION_CONTRACT_SCHEMA) with the expiration key and side in
+        'exp_date' and 'exp_date_type'. Chain-level values and the flattened
+        'underlying' block form a separate single-row frame instead of being
+        repeated on every contract.
+        
+        :param json_data: Decoded JSON body of the chains endpoint
+        :return: Tuple of (contracts DataFrame, underlying DataFrame)
+        """
+        contracts = []
+        exp_dates = []
+        sides = []
+        with _gc_paused():
+            for side, key in (('CALL', 'callExpDateMap'), ('PUT', 'putExpDateMap')):
+                for exp_date, strikes in (json_data.get(key) or {}).items():
+                    start = len(contracts)
+                    for options_list in strikes.values():
+                        contracts.extend(options_list)
+                    count = len(contracts) - start
+                    exp_dates.extend([exp_date] * count)
+                    sides.extend([side] * count)
+
+            contracts_df = HelperFuncs._contracts_to_dataframe(contracts, sides, exp_dates)
+
+        underlying_df = pd.DataFrame([HelperFuncs._chain_underlying(json_data)])
+        return contracts_df, underlying_df
 
-        # Ensure all columns are unique
-        df = df.loc[:, ~df.columns.duplicated()]
+    def _optionchain_to_dataframe(self, json_data):
+        """
+        Parses an option chain response into one row per contract.
+        
+        The underlying's fields are attached once as a dict in
+        ``df.attrs['underlying']`` rather than copied into every row.
+        
+        :param json_data: Decoded JSON body of the chains endpoint
+        :return: DataFrame of contracts
+        """
+        contracts_df, underlying_df = self._optionchain_to_frames(json_data)
+        contracts_df.attrs['underlying'] = underlying_df.iloc[0].to_dict()
+        return contracts_df
 
+    @staticmethod
+    def _exchange_time_index(timestamps):
+        """
+        Converts epoch milliseconds to a tz-aware exchange-time DatetimeIndex named 'time'.
+        """
+        times = np.asarray(timestamps, dtype=np.int64)
+        return pd.DatetimeIndex(pd.to_datetime(times, unit='ms', utc=True).tz_convert(EXCHANGE_TZ), name='time')
+
+    @staticmethod
+    def _candles_to_dataframe(json_data: dict):
+        """
+        Parses a price history response into typed OHLCV columns on an exchange-time index.
+        
+        The epoch-millisecond 'datetime' column is kept. ``symbol``,
+        ``previousClose`` and ``previousCloseDate`` (as an exchange-time
+        Timestamp) go to ``df.attrs`` instead of being repeated on every row.
+        
+        :param json_data: Decoded JSON body of the price history endpoint
+        :return: DataFrame of candles
+        """
+        candles = json_data.get('candles') or []
+        with _gc_paused():
+            columns = _columns_from_records(candles, CANDLE_SCHEMA, {}) if candles else {
+                name: np.array([], dtype=np.float64 if kind == 'f' else np.int64)
+                for name, kind in CANDLE_SCHEMA.items()}
+        df = pd.DataFrame(columns, copy=False)
+        df.index = HelperFuncs._exchange_time_index(df['datetime'].to_numpy())
+        previous_close_date = json_data.get('previousCloseDate')
+        df.attrs['symbol'] = json_data.get('symbol')
+        df.attrs['previousClose'] = json_data.get('previousClose')
+        df.attrs['previousCloseDate'] = (None if previous_close_date is None
+                                         else HelperFuncs._exchange_time_index([previous_close_date])[0])
         return df
     
     @staticmethod
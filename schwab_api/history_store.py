@@ -0,0 +1,299 @@
+import json
+import logging
+import os
+import threading
+import time
+from urllib.parse import quote
+import numpy as np
+import pandas as pd
+from schwab_api.helper import HelperFuncs
+from schwab_api.utils import require_sync
+
+logger = logging.getLogger(__name__)
+
+CANDLE_COLUMNS = ('datetime', 'open', 'high', 'low', 'close', 'volume')
+_DTYPES = {'datetime': np.int64, 'open': np.float64, 'high': np.float64, 'low': np.float64,
+           'close': np.float64, 'volume': np.int64}
+# fixed-width row layout of MmapCandleStore files
+CANDLE_DTYPE = np.dtype([(name, dtype) for name, dtype in _DTYPES.items()])
+_BAR_MS = {'minute': 60_000, 'daily': 86_400_000, 'weekly': 7 * 86_400_000, 'monthly': 31 * 86_400_000}
+
+
+def empty_candles():
+    return pd.DataFrame({name: np.array([], dtype=dtype) for name, dtype in _DTYPES.items()})
+
+
+def normalize_candles(df: pd.DataFrame):
+    """
+    Returns the OHLCV columns of a candles frame with fixed dtypes, sorted by
+    time with duplicate timestamps removed (the last one wins).
+    """
+    if df is None or not len(df):
+        return empty_candles()
+    columns = {}
+    for name, dtype in _DTYPES.items():
+        values = df[name].to_numpy() if name in df.columns else np.zeros(len(df))
+        if dtype is np.int64:
+            values = np.nan_to_num(np.asarray(values, dtype=np.float64)).astype(np.int64)
+        columns[name] = np.asarray(values, dtype=dtype)
+    times = columns['datetime']
+    # keep the last occurrence of each timestamp, then order by time
+    _, last = np.unique(times[::-1], return_index=True)
+    keep = len(times) - 1 - last
+    return pd.DataFrame({name: values[keep] for name, values in columns.items()})
+
+
+class CandleStore:
+    """
+    On-disk price history cache keyed by (symbol, frequency).
+
+    Each series is one .npz file holding a typed array per column plus the
+    time range that has already been requested from the API. A request only
+    downloads the parts of its window outside that range, before and after
+    it. Bars that may still have been forming when stored are left outside the
+    covered range, so they are refreshed by the next request. Fetched bars are
+    merged, deduplicated on the timestamp and written back atomically.
+    """
+
+    EXTENSION = '.npz'
+
+    def __init__(self, root: str, market_data=None):
+        """
+        :param root: Directory holding the candle files
+        :param market_data: MarketData used to download missing ranges
+        """
+        require_sync(market_data, 'get_historical_range', type(self).__name__)
+        self.root = root
+        self.market_data = market_data
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self.requests = 0
+        self.bars_fetched = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def series_key(frequency_type: str = 'daily', frequency: int = 1, extended_hours: bool = False):
+        key = f"{frequency_type}_{frequency}"
+        return f"{key}_ext" if extended_hours and frequency_type == 'minute' else key
+
+    def path(self, symbol: str, series: str):
+        # symbols such as '$SPX' or '/ES' are quoted to stay valid file names
+        return os.path.join(self.root, series, f"{quote(symbol, safe='')}{self.EXTENSION}")
+
+    def _lock(self, symbol, series):
+        with self._locks_guard:
+            return self._locks.setdefault((symbol, series), threading.Lock())
+
+    def _read(self, symbol, series):
+        """
+        Returns (candles, covered_start, covered_end); the range is None for a new series.
+        """
+        path = self.path(symbol, series)
+        if not os.path.exists(path):
+            return empty_candles(), None, None
+        with np.load(path) as data:
+            df = pd.DataFrame({name: data[name] for name in CANDLE_COLUMNS})
+            return df, int(data['covered_start']), int(data['covered_end'])
+
+    def _write(self, symbol, series, df, covered_start, covered_end):
+        path = self.path(symbol, series)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as fh:
+            np.savez(fh, covered_start=np.int64(covered_start), covered_end=np.int64(covered_end),
+                     **{name: df[name].to_numpy() for name in CANDLE_COLUMNS})
+        os.replace(tmp, path)
+
+    def load(self, symbol: str, frequency_type: str = 'daily', frequency: int = 1, extended_hours: bool = False):
+        """
+        Returns every stored candle of a series without touching the API.
+        """
+        return self._read(symbol, self.series_key(frequency_type, frequency, extended_hours))[0]
+
+    @staticmethod
+    def missing_ranges(start: int, end: int, covered_start, covered_end):
+        """
+        Returns the (start, end) millisecond ranges of a request that are not covered yet.
+
+        The ranges always reach back to the covered range, so a request that
+        starts past it also fills the gap and coverage stays contiguous.
+        """
+        if covered_start is None:
+            return [(start, end)]
+        ranges = []
+        if start < covered_start:
+            ranges.append((start, covered_start))
+        if end > covered_end:
+            ranges.append((covered_end, end))
+        return ranges
+
+    def _count(self, **increments):
+        with self._locks_guard:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def _download(self, symbol, frequency_type, frequency, extended_hours, start, end):
+        # get_historical_range splits ranges longer than one request may cover
+        df = self.market_data.get_historical_range(
+            symbol, start_date=int(start), end_date=int(end), frequency_type=frequency_type,
+            frequency=frequency, needExtendedHoursData=extended_hours)
+        requests = len(df.attrs.get('windows', ())) or 1
+        df = normalize_candles(df)
+        self._count(requests=requests, bars_fetched=len(df))
+        return df
+
+    def get(self, symbol: str, start_date, end_date=None, frequency_type: str = 'daily', frequency: int = 1,
+            extended_hours: bool = False):
+        """
+        Returns the candles of ``symbol`` between two dates, downloading only what is not stored.
+
+        :param symbol: Symbol to retrieve
+        :param start_date: Start of the window ('YYYY-MM-DD', datetime or epoch milliseconds)
+        :param end_date: End of the window; defaults to now
+        :param frequency_type: 'minute', 'daily', 'weekly' or 'monthly'
+        :param frequency: Bar width in frequency_type units
+        :param extended_hours: Include extended hours bars (minute bars only)
+        :return: DataFrame with datetime (epoch ms), open, high, low, close and volume on an
+                 exchange-time index
+        """
+        if frequency_type not in _BAR_MS:
+            raise ValueError("frequency_type must be one of: " + ", ".join(_BAR_MS))
+        now = int(time.time() * 1000)
+        start = HelperFuncs._date_format(start_date)
+        end = now if end_date is None else HelperFuncs._date_format(end_date)
+        series = self.series_key(frequency_type, frequency, extended_hours)
+        if start > end:
+            raise ValueError("start_date must not be after end_date")
+
+        with self._lock(symbol, series):
+            df, covered_start, covered_end = self._read(symbol, series)
+            ranges = self.missing_ranges(start, end, covered_start, covered_end)
+            if not ranges:
+                self._count(cache_hits=1)
+            else:
+                if self.market_data is None:
+                    raise ValueError("CandleStore needs market_data to download missing candles")
+                frames = [df] + [self._download(symbol, frequency_type, frequency, extended_hours, s, e)
+                                 for s, e in ranges]
+                df = normalize_candles(pd.concat(frames, ignore_index=True))
+                # a bar still forming ends after ``closed``; leaving it uncovered gets it fetched again
+                closed = now - _BAR_MS[frequency_type] * (frequency if frequency_type == 'minute' else 1)
+                new_end = min(end, closed)
+                covered_start = start if covered_start is None else min(covered_start, start)
+                covered_end = new_end if covered_end is None else max(covered_end, new_end)
+                self._write(symbol, series, df, covered_start, max(covered_start, covered_end))
+                logger.info(f"Fetched {len(ranges)} missing range(s) of {series} candles for {symbol}")
+
+        times = df['datetime'].to_numpy()
+        lo, hi = np.searchsorted(times, start, 'left'), np.searchsorted(times, end, 'right')
+        df = df.iloc[lo:hi].copy()
+        df.index = HelperFuncs._exchange_time_index(times[lo:hi])
+        df.attrs['symbol'] = symbol
+        return df
+
+    def stats(self):
+        return {'requests': self.requests, 'bars_fetched': self.bars_fetched, 'cache_hits': self.cache_hits}
+
+
+class MmapCandleStore(CandleStore):
+    """
+    CandleStore whose series are memory-mapped arrays of fixed-width rows.
+
+    Each series is a .npy file of CANDLE_DTYPE records sorted by time, with the
+    covered range in a small JSON file next to it. open() maps the file
+    read-only, so any number of processes share the same pages without
+    copying, and slice() cuts a time range with two binary searches over the
+    timestamp index. Files are replaced atomically on update; a mapping that
+    is already open keeps seeing the previous version.
+    """
+
+    EXTENSION = '.npy'
+
+    def __init__(self, root: str, market_data=None):
+        super().__init__(root, market_data)
+        self._maps = {}
+
+    def _meta_path(self, path):
+        return f"{path[:-len(self.EXTENSION)]}.json"
+
+    def _read(self, symbol, series):
+        path = self.path(symbol, series)
+        rows = self._open(path)[0]
+        if not len(rows) and not os.path.exists(path):
+            return empty_candles(), None, None
+        df = pd.DataFrame({name: np.array(rows[name]) for name in CANDLE_COLUMNS})
+        try:
+            with open(self._meta_path(path)) as fh:
+                meta = json.load(fh)
+        except FileNotFoundError:
+            # bars without a covered range are kept, but the whole window is requested again
+            return df, None, None
+        return df, meta['covered_start'], meta['covered_end']
+
+    def _write(self, symbol, series, df, covered_start, covered_end):
+        path = self.path(symbol, series)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        rows = np.empty(len(df), dtype=CANDLE_DTYPE)
+        for name in CANDLE_COLUMNS:
+            rows[name] = df[name].to_numpy()
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(path + suffix, 'wb') as fh:
+            np.save(fh, rows)
+        os.replace(path + suffix, path)
+        # the covered range goes last: a crash in between only makes the next request fetch more
+        meta_path = self._meta_path(path)
+        with open(meta_path + suffix, 'w') as fh:
+            json.dump({'covered_start': int(covered_start), 'covered_end': int(covered_end)}, fh)
+        os.replace(meta_path + suffix, meta_path)
+
+    def _open(self, path):
+        """
+        Returns (rows, timestamps) for a file, reusing the mapping while the file is unchanged.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return np.empty(0, dtype=CANDLE_DTYPE), np.empty(0, dtype=np.int64)
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._locks_guard:
+            cached = self._maps.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+        rows = np.load(path, mmap_mode='r') if stat.st_size else np.empty(0, dtype=CANDLE_DTYPE)
+        if rows.dtype != CANDLE_DTYPE:
+            raise ValueError(f"{path} does not hold candle records")
+        # the datetime field is strided inside the records; a contiguous copy makes searchsorted copy-free
+        timestamps = np.ascontiguousarray(rows['datetime'])
+        with self._locks_guard:
+            self._maps[path] = (stamp, rows, timestamps)
+        return rows, timestamps
+
+    def open(self, symbol: str, frequency_type: str = 'daily', frequency: int = 1, extended_hours: bool = False):
+        """
+        Returns the read-only memory-mapped CANDLE_DTYPE records of a series.
+        """
+        return self._open(self.path(symbol, self.series_key(frequency_type, frequency, extended_hours)))[0]
+
+    def slice(self, symbol: str, start_date=None, end_date=None, frequency_type: str = 'daily', frequency: int = 1,
+              extended_hours: bool = False):
+        """
+        Returns the stored records between two dates as a view of the mapping, without downloading.
+
+        :param start_date: Start of the range ('YYYY-MM-DD', datetime or epoch milliseconds); None for the first bar
+        :param end_date: End of the range, inclusive; None for the last bar
+        :return: Read-only CANDLE_DTYPE array sharing memory with the file
+        """
+        path = self.path(symbol, self.series_key(frequency_type, frequency, extended_hours))
+        rows, timestamps = self._open(path)
+        lo = 0 if start_date is None else np.searchsorted(timestamps, HelperFuncs._date_format(start_date), 'left')
+        hi = len(rows) if end_date is None else np.searchsorted(timestamps, HelperFuncs._date_format(end_date),
+                                                                'right')
+        return rows[lo:hi]
+
+    @staticmethod
+    def to_frame(rows):
+        """
+        Copies CANDLE_DTYPE records into a candles DataFrame.
+        """
+        return pd.DataFrame({name: np.array(rows[name]) for name in CANDLE_COLUMNS})
+
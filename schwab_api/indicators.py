@@ -0,0 +1,366 @@
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+from schwab_api.cache import EXCHANGE_TZ
+
+# Vectorized indicators take candle columns as arrays: df['close'] from get_historical_data or
+# CandleStore, or rows['close'] from MmapCandleStore.slice. EMA-style averages are seeded with the
+# simple average of their first ``period`` inputs, so the incremental classes below reproduce them
+# exactly bar by bar.
+
+
+def _floats(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _has_field(bar, name):
+    # numpy records (np.void) hold their fields in the dtype; dicts and Series answer ``in`` directly
+    names = getattr(getattr(bar, 'dtype', None), 'names', None)
+    return name in names if names is not None else name in bar
+
+
+def _seeded_ewm(values, period: int, alpha: float):
+    """
+    Exponential average seeded with the mean of the first ``period`` values; NaN before that.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    tail = values[period - 1:].copy()
+    tail[0] = values[:period].mean()
+    out[period - 1:] = pd.Series(tail).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+
+def sma(values, period: int):
+    """
+    Simple moving average; the first ``period - 1`` values are NaN.
+    """
+    values = _floats(values)
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        csum = np.cumsum(np.r_[0.0, values])
+        out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def ema(values, period: int):
+    """
+    Exponential moving average with alpha 2 / (period + 1), seeded with the SMA of the first ``period`` values.
+    """
+    return _seeded_ewm(_floats(values), period, 2.0 / (period + 1))
+
+
+def rsi(close, period: int = 14):
+    """
+    Wilder's relative strength index (0-100); the first ``period`` values are NaN.
+    """
+    close = _floats(close)
+    out = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return out
+    change = np.diff(close)
+    avg_gain = _seeded_ewm(np.maximum(change, 0.0), period, 1.0 / period)
+    avg_loss = _seeded_ewm(np.maximum(-change, 0.0), period, 1.0 / period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # no losses in the window means RSI 100 (50 when price did not move at all)
+    value = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), value)
+    out[1:] = value
+    out[:period] = np.nan
+    return out
+
+
+def true_range(high, low, close):
+    """
+    True range; the first bar has no previous close and uses high - low.
+    """
+    high, low, close = _floats(high), _floats(low), _floats(close)
+    prev_close = np.r_[np.nan, close[:-1]]
+    ranges = np.vstack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    return np.nanmax(ranges, axis=0) if len(high) else np.array([])
+
+
+def atr(high, low, close, period: int = 14):
+    """
+    Wilder's average true range; the first ``period - 1`` values are NaN.
+    """
+    return _seeded_ewm(true_range(high, low, close), period, 1.0 / period)
+
+
+def session_ids(timestamps):
+    """
+    Numbers consecutive bars by their exchange-time trading date.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if not len(timestamps):
+        return np.array([], dtype=np.int64)
+    local = pd.to_datetime(timestamps, unit='ms', utc=True).tz_convert(EXCHANGE_TZ).tz_localize(None)
+    days = local.normalize().to_numpy()
+    return np.cumsum(np.r_[False, days[1:] != days[:-1]])
+
+
+def vwap(high, low, close, volume, timestamps=None):
+    """
+    Volume-weighted average of the typical price, restarting every trading day.
+
+    :param timestamps: Bar times in epoch milliseconds; without them the VWAP never restarts
+    """
+    typical = (_floats(high) + _floats(low) + _floats(close)) / 3.0
+    volume = _floats(volume)
+    pv, vol = np.cumsum(typical * volume), np.cumsum(volume)
+    if timestamps is not None and len(typical):
+        sessions = session_ids(timestamps)
+        first = np.flatnonzero(np.r_[True, sessions[1:] != sessions[:-1]])
+        # subtract the running totals from before each bar's session start
+        start = first[sessions]
+        pv = pv - np.r_[0.0, pv][start]
+        vol = vol - np.r_[0.0, vol][start]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(vol > 0, pv / vol, np.nan)
+
+
+class SMA:
+    """
+    Simple moving average updated one value at a time in O(1).
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self.value = math.nan
+
+    def update(self, value: float):
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(value)
+        self.total += value
+        if len(self.window) == self.period:
+            self.value = self.total / self.period
+        return self.value
+
+    def update_bar(self, bar):
+        return self.update(bar['close'])
+
+    @classmethod
+    def from_history(cls, close, period: int):
+        """
+        Builds the state from past values without replaying them one by one.
+        """
+        indicator = cls(period)
+        close = _floats(close)[-period:]
+        indicator.window.extend(close.tolist())
+        indicator.total = float(close.sum())
+        if len(close) == period:
+            indicator.value = indicator.total / period
+        return indicator
+
+
+class EMA:
+    """
+    Exponential moving average updated in O(1); matches ema() bar for bar.
+    """
+
+    def __init__(self, period: int, alpha: float = None):
+        self.period = period
+        self.alpha = 2.0 / (period + 1) if alpha is None else alpha
+        self.count = 0
+        self.seed_total = 0.0
+        self.value = math.nan
+
+    def update(self, value: float):
+        self.count += 1
+        if self.count < self.period:
+            self.seed_total += value
+        elif self.count == self.period:
+            self.value = (self.seed_total + value) / self.period
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+    def update_bar(self, bar):
+        return self.update(bar['close'])
+
+    @classmethod
+    def from_history(cls, values, period: int, alpha: float = None):
+        indicator = cls(period, alpha)
+        values = _floats(values)
+        indicator.count = len(values)
+        if len(values) < period:
+            indicator.seed_total = float(values.sum())
+        else:
+            indicator.value = float(_seeded_ewm(values, period, indicator.alpha)[-1])
+        return indicator
+
+
+class RSI:
+    """
+    Wilder's RSI updated in O(1); matches rsi() bar for bar.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.gain = EMA(period, alpha=1.0 / period)
+        self.loss = EMA(period, alpha=1.0 / period)
+        self.value = math.nan
+
+    def _value(self):
+        gain, loss = self.gain.value, self.loss.value
+        if math.isnan(gain):
+            return math.nan
+        if loss == 0:
+            return 50.0 if gain == 0 else 100.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+    def update(self, close: float):
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            self.gain.update(max(change, 0.0))
+            self.loss.update(max(-change, 0.0))
+            self.value = self._value()
+        self.prev_close = close
+        return self.value
+
+    def update_bar(self, bar):
+        return self.update(bar['close'])
+
+    @classmethod
+    def from_history(cls, close, period: int = 14):
+        indicator = cls(period)
+        close = _floats(close)
+        if len(close):
+            change = np.diff(close)
+            indicator.gain = EMA.from_history(np.maximum(change, 0.0), period, alpha=1.0 / period)
+            indicator.loss = EMA.from_history(np.maximum(-change, 0.0), period, alpha=1.0 / period)
+            indicator.prev_close = float(close[-1])
+            indicator.value = indicator._value()
+        return indicator
+
+
+class ATR:
+    """
+    Wilder's ATR updated in O(1); matches atr() bar for bar.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.average = EMA(period, alpha=1.0 / period)
+
+    @property
+    def value(self):
+        return self.average.value
+
+    def update(self, high: float, low: float, close: float):
+        tr = high - low
+        if self.prev_close is not None:
+            tr = max(tr, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        return self.average.update(tr)
+
+    def update_bar(self, bar):
+        return self.update(bar['high'], bar['low'], bar['close'])
+
+    @classmethod
+    def from_history(cls, high, low, close, period: int = 14):
+        indicator = cls(period)
+        tr = true_range(high, low, close)
+        indicator.average = EMA.from_history(tr, period, alpha=1.0 / period)
+        if len(tr):
+            indicator.prev_close = float(_floats(close)[-1])
+        return indicator
+
+
+class VWAP:
+    """
+    Session VWAP updated in O(1); restarts when a bar falls on a new trading day.
+    """
+
+    def __init__(self):
+        self.session = None
+        self.pv = 0.0
+        self.volume = 0.0
+        self.value = math.nan
+
+    @staticmethod
+    def _session(timestamp):
+        return pd.Timestamp(int(timestamp), unit='ms', tz='UTC').tz_convert(EXCHANGE_TZ).date()
+
+    def update(self, high: float, low: float, close: float, volume: float, timestamp=None):
+        if timestamp is not None:
+            session = self._session(timestamp)
+            if session != self.session:
+                self.session, self.pv, self.volume = session, 0.0, 0.0
+        self.pv += (high + low + close) / 3.0 * volume
+        self.volume += volume
+        self.value = self.pv / self.volume if self.volume > 0 else math.nan
+        return self.value
+
+    def update_bar(self, bar):
+        timestamp = bar['datetime'] if _has_field(bar, 'datetime') else None
+        return self.update(bar['high'], bar['low'], bar['close'], bar['volume'], timestamp)
+
+    @classmethod
+    def from_history(cls, high, low, close, volume, timestamps=None):
+        indicator = cls()
+        high, low, close, volume = _floats(high), _floats(low), _floats(close), _floats(volume)
+        if not len(close):
+            return indicator
+        start = 0
+        if timestamps is not None:
+            sessions = session_ids(timestamps)
+            start = int(np.searchsorted(sessions, sessions[-1]))
+            indicator.session = cls._session(np.asarray(timestamps)[-1])
+        typical = (high[start:] + low[start:] + close[start:]) / 3.0
+        indicator.pv = float(np.sum(typical * volume[start:]))
+        indicator.volume = float(np.sum(volume[start:]))
+        indicator.value = indicator.pv / indicator.volume if indicator.volume > 0 else math.nan
+        return indicator
+
+
+class IndicatorSet:
+    """
+    Named incremental indicators fed from the same bars, e.g. one set per symbol.
+    """
+
+    def __init__(self, indicators: dict):
+        """
+        :param indicators: Dict of name -> indicator object with update_bar()
+        """
+        self.indicators = indicators
+
+    @classmethod
+    def from_candles(cls, candles, sma_periods=(20,), ema_periods=(20,), rsi_period: int = 14,
+                     atr_period: int = 14, with_vwap: bool = True):
+        """
+        Builds the indicators' state from past candles in one vectorized pass.
+
+        :param candles: Candles DataFrame or CANDLE_DTYPE records
+        """
+        close = candles['close']
+        indicators = {}
+        for period in sma_periods:
+            indicators[f"sma_{period}"] = SMA.from_history(close, period)
+        for period in ema_periods:
+            indicators[f"ema_{period}"] = EMA.from_history(close, period)
+        if rsi_period:
+            indicators[f"rsi_{rsi_period}"] = RSI.from_history(close, rsi_period)
+        if atr_period:
+            indicators[f"atr_{atr_period}"] = ATR.from_history(candles['high'], candles['low'], close, atr_period)
+        if with_vwap:
+            indicators['vwap'] = VWAP.from_history(candles['high'], candles['low'], close, candles['volume'],
+                                                   candles['datetime'])
+        return cls(indicators)
+
+    def update(self, bar):
+        """
+        Feeds one bar (a dict, Series or CANDLE_DTYPE record with open/high/low/close/volume/datetime)
+        and returns the new values.
+        """
+        return {name: indicator.update_bar(bar) for name, indicator in self.indicators.items()}
+
+    def values(self):
+        return {name: indicator.value for name, indicator in self.indicators.items()}
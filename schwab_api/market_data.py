@@ -1,14 +1,25 @@
-import requests
-from datetime import datetime
 import json
 import logging
-import websockets
 import asyncio
+import inspect
+import math
+import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
-from functools import lru_cache
 from schwab_api.helper import HelperFuncs
 from schwab_api.urls import SchwabUrls
+from schwab_api.session import SchwabSession
+from schwab_api.utils import handle_response
+from schwab_api.exceptions import SchwabAPIError, SchwabStreamError
+from schwab_api.cache import MISSING, MarketDataCache, make_key
+from schwab_api.option_chain import OptionChain
+from schwab_api.coalesce import SingleFlight
+from schwab_api.chain_stream import ChainStreamParser
+from schwab_api.history_store import normalize_candles
+from schwab_api.stream_decode import StreamDecoder
+from schwab_api.streamer import SchwabStreamer
+from schwab_api.trades import Trader
 
 
 logger = logging.getLogger(__name__)
@@ -17,15 +28,57 @@ class MarketData():
     Provides methods to retrieve market data.
     """
 
-    def __init__(self, auth):
+    # per-call limits of the quotes endpoint used by get_quotes_bulk
+    QUOTE_BATCH_SIZE = 500
+    QUOTE_MAX_SYMBOLS_LENGTH = 4000
+
+    def __init__(self, auth, session: SchwabSession = None, cache: MarketDataCache = None):
         """
         Initializes MarketData with authentication object.
         
         :param auth: SchwabAuth object for authentication
+        :param session: Shared SchwabSession used for HTTP calls; a private one is created if omitted
+        :param cache: MarketDataCache holding per-endpoint TTL caches; a private one is created if omitted
         """
         self.auth = auth
+        self.session = session if session is not None else SchwabSession()
+        self.cache = cache if cache is not None else MarketDataCache()
+        self.inflight = SingleFlight()
         self.urls = SchwabUrls()
         self.helper = HelperFuncs()
+
+    def _fetch_frame(self, endpoint, url, params, description, parse):
+        """
+        Returns a cached DataFrame or fetches and parses it.
+
+        Concurrent identical requests are coalesced so only one HTTP call is in
+        flight per URL and params; every caller gets its own copy of the frame.
+
+        :param endpoint: MarketDataCache endpoint name
+        :param parse: Callable turning the decoded JSON body into a DataFrame
+        """
+        key = make_key(url, params)
+        df = self.cache.get(endpoint, key)
+        if df is MISSING:
+            df = self.inflight.do(key, lambda: self._load_frame(endpoint, key, url, params, description, parse))
+        return df.copy()
+
+    def _load_frame(self, endpoint, key, url, params, description, parse):
+        # a flight that finished just before this one started may have filled the cache
+        df = self.cache.get(endpoint, key)
+        if df is MISSING:
+            df = parse(self._get(url, params, description))
+            self.cache.set(endpoint, key, df, self.cache.ttl_for(endpoint, params))
+        return df
+
+    def _get(self, url, params, description):
+        """
+        Sends an authenticated GET request and returns the decoded JSON body.
+
+        :raises SchwabAPIError: Typed error if the request fails after retries
+        """
+        response = self.session.get(url, headers=self.auth.get_headers(), params=params)
+        return handle_response(response, description)
         
 
     def get_symbol_quote(self, symbol: str,
@@ -40,89 +93,120 @@ class MarketData():
         fields = self.helper._validate_fields(fields)
 
         url = self.urls.get_symbol_quote_url(symbol)
-        headers = self.auth.get_headers()
         params = {'fields': fields}
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            logger.info(f"Retrieved symbol quotes for {symbol}")
-            return self.helper._parse_json_to_dataframe(data)
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while fetching symbol quotes: {http_err}")
-            raise SystemExit(f"HTTP error occurred while fetching symbol quotes: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while fetching symbol quotes: {err}")
-            raise SystemExit(f"An error occurred while fetching symbol quotes: {err}")
-
-    @lru_cache(maxsize=128)    
-    def get_quotes(self, symbols: Union[list, str],
-                   fields: Union[list, str] = 'quote, reference', indicative=False):
+        data = self._get(url, params, "fetching symbol quotes")
+        logger.info(f"Retrieved symbol quotes for {symbol}")
+        return self.helper._parse_quotes_to_dataframe(data, fields)
+
+    def _quotes_params(self, symbols, fields, indicative):
         """
-        Retrieves quotes for multiple symbols.
-        
-        :param symbols: List of symbols to retrieve quotes for
-        :param fields: Fields to include in the quotes
-        :param indicative: Boolean indicating if indicative prices should be included
-        :return: DataFrame containing quotes for multiple symbols
+        Builds the query parameters for the quotes endpoint.
         """
         syms = self.helper._format_symbols(symbols=symbols)
         
         # Ensure fields are validated and converted to a string
         fields = self.helper._validate_fields(fields=fields)
         
-        url = self.urls.get_quotes_url()
-        headers = self.auth.get_headers()
-        
-        params = {
+        return {
             'symbols': syms, 
             'fields': fields, 
             'indicative': str(indicative).lower()
         }
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            logger.info(f"Retrieved quotes for symbols: {syms}")
-            return self.helper._parse_json_to_dataframe(data)
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while fetching quotes: {http_err}")
-            raise SystemExit(f"HTTP error occurred while fetching quotes: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while fetching quotes: {err}")
-            raise SystemExit(f"An error occurred while fetching quotes: {err}")
-
-
-    @lru_cache(maxsize=128)    
-    def get_option_chains(self, symbol: str, contract_type: str, strike_count=None, 
-                          includeUnderlyingQuote: bool =True, strategy=None, interval=None, 
-                          strike_price=None, range=None, fromDate=None, toDate=None, volatility=None, 
-                        underlying_price=None, interest_rate=None, daysToExpire=None, 
-                        expMonth=None,option_type=None, entillment=None):
+
+    def get_quotes(self, symbols: Union[list, str],
+                   fields: Union[list, str] = 'quote, reference', indicative=False):
         """
-        Retrieves option chains for a specific symbol.
+        Retrieves quotes for multiple symbols.
         
-        :param symbol: Symbol to retrieve option chains for
-        :param contract_type: Type of contract ('CALL' or 'PUT')
-        :param strike_count: Number of strikes to include
-        :param includeUnderlyingQuote: Boolean indicating if the underlying quote should be included
-        :param strategy: Strategy for the option chain
-        :param interval: Interval for the option chain
-        :param strike_price: Strike price for the option chain
-        :param range: Range for the option chain
-        :param fromDate: Start date for the option chain
-        :param toDate: End date for the option chain
-        :param volatility: Volatility for the option chain
-        :param underlying_price: Underlying price for the option chain
-        :param interest_rate: Interest rate for the option chain
-        :param daysToExpire: Days to expiration for the option chain
-        :param expMonth: Expiration month for the option chain
-        :param option_type: Type of option
-        :param entillment: Entitlement for the option chain
-        :return: DataFrame containing option chains
+        :param symbols: List of symbols to retrieve quotes for
+        :param fields: Fields to include in the quotes
+        :param indicative: Boolean indicating if indicative prices should be included
+        :return: DataFrame containing quotes for multiple symbols
+        """
+        url = self.urls.get_quotes_url()
+        params = self._quotes_params(symbols, fields, indicative)
+        syms = params['symbols']
+        df = self._fetch_frame('quotes', url, params, "fetching quotes",
+                               lambda data: self.helper._parse_quotes_to_dataframe(data, params['fields']))
+        logger.info(f"Retrieved quotes for symbols: {syms}")
+        return df
+
+
+    def _quote_batches(self, symbols, batch_size):
+        """
+        De-duplicates symbols in order and splits them into quote batches.
+        """
+        if isinstance(symbols, str):
+            symbols = symbols.split(',')
+        ordered = list(dict.fromkeys(symbol.strip() for symbol in symbols if symbol.strip()))
+        batch_size = min(batch_size or self.QUOTE_BATCH_SIZE, self.QUOTE_BATCH_SIZE)
+        return ordered, self.helper._chunk_symbols(ordered, batch_size, self.QUOTE_MAX_SYMBOLS_LENGTH)
+
+    @staticmethod
+    def _merge_quote_batches(ordered, frames, batch_stats):
+        """
+        Concatenates batch frames in the original symbol order and attaches per-batch stats.
+
+        pd.concat drops each frame's attrs, so the 'errors' of every batch
+        (e.g. invalid symbols) are merged into ``df.attrs['errors']`` here.
+        """
+        errors = {}
+        for df in frames:
+            for key, values in (df.attrs.get('errors') or {}).items():
+                errors.setdefault(key, []).extend(values)
+        frames = [df for df in frames if not df.empty]
+        if not frames:
+            df = pd.DataFrame()
+        else:
+            df = pd.concat(frames, ignore_index=True)
+            position = {symbol: i for i, symbol in enumerate(ordered)}
+            order = df['symbol'].map(position).fillna(len(ordered))
+            df = df.iloc[order.argsort(kind='stable')].reset_index(drop=True)
+        if errors:
+            df.attrs['errors'] = errors
+        df.attrs['batches'] = batch_stats
+        return df
+
+    def get_quotes_bulk(self, symbols: Union[list, str], fields: Union[list, str] = 'quote, reference',
+                        indicative=False, batch_size: int = None, max_workers: int = 8):
+        """
+        Retrieves quotes for a large symbol universe.
+        
+        Symbols are split into batches within the endpoint's symbol and URL length
+        limits, fetched concurrently over the shared session and merged in the
+        original order. Per-batch timings are stored in ``df.attrs['batches']`` and the
+        errors of all batches (e.g. invalid symbols) in ``df.attrs['errors']``.
+        
+        :param symbols: List of symbols to retrieve quotes for
+        :param fields: Fields to include in the quotes
+        :param indicative: Boolean indicating if indicative prices should be included
+        :param batch_size: Maximum symbols per request (capped at QUOTE_BATCH_SIZE)
+        :param max_workers: Number of batches fetched at the same time
+        :return: DataFrame containing quotes for all symbols
+        """
+        ordered, batches = self._quote_batches(symbols, batch_size)
+
+        def fetch(index, batch):
+            start = time.perf_counter()
+            df = self.get_quotes(','.join(batch), fields=fields, indicative=indicative)
+            return df, {'batch': index, 'symbols': len(batch), 'rows': len(df),
+                        'latency': time.perf_counter() - start}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches) or 1))) as executor:
+            results = list(executor.map(lambda args: fetch(*args), enumerate(batches)))
+
+        frames = [df for df, _ in results]
+        batch_stats = [stats for _, stats in results]
+        logger.info(f"Retrieved quotes for {len(ordered)} symbols in {len(batches)} batches")
+        return self._merge_quote_batches(ordered, frames, batch_stats)
+
+    def _option_chain_params(self, symbol, contract_type, strike_count, includeUnderlyingQuote,
+                             strategy, interval, strike_price, range, fromDate, toDate, volatility,
+                             underlying_price, interest_rate, daysToExpire, expMonth, option_type,
+                             entillment):
+        """
+        Validates the option chain arguments and builds the query parameters.
         """
-        url = self.urls.get_optionchains_url()
-        headers = self.auth.get_headers()
         if strategy is not None:
             strategy = self.helper._validate_strategy(strategy=strategy)
         
@@ -135,7 +219,7 @@ class MarketData():
         if expMonth is not None:
             expMonth = self.helper._validate_month(month=expMonth)    
 
-        params = {'symbol': symbol,
+        return {'symbol': symbol,
                     'contractType': contract_type,
                     'strikeCount': strike_count,
                     'includeUnderlyingQuote': includeUnderlyingQuote,
@@ -153,22 +237,162 @@ class MarketData():
                     'optionType': option_type,
                     'entitlement': entillment
                     }
+
+    def get_option_chains(self, symbol: str, contract_type: str, strike_count=None, 
+                          includeUnderlyingQuote: bool =True, strategy=None, interval=None, 
+                          strike_price=None, range=None, fromDate=None, toDate=None, volatility=None, 
+                        underlying_price=None, interest_rate=None, daysToExpire=None, 
+                        expMonth=None,option_type=None, entillment=None, indexed: bool = False):
+        """
+        Retrieves option chains for a specific symbol.
+        
+        :param symbol: Symbol to retrieve option chains for
+        :param contract_type: Type of contract ('CALL' or 'PUT')
+        :param strike_count: Number of strikes to include
+        :param includeUnderlyingQuote: Boolean indicating if the underlying quote should be included
+        :param strategy: Strategy for the option chain
+        :param interval: Interval for the option chain
+        :param strike_price: Strike price for the option chain
+        :param range: Range for the option chain
+        :param fromDate: Start date for the option chain
+        :param toDate: End date for the option chain
+        :param volatility: Volatility for the option chain
+        :param underlying_price: Underlying price for the option chain
+        :param interest_rate: Interest rate for the option chain
+        :param daysToExpire: Days to expiration for the option chain
+        :param expMonth: Expiration month for the option chain
+        :param option_type: Type of option
+        :param entillment: Entitlement for the option chain
+        :param indexed: Return an OptionChain with indexed contract lookups instead of a DataFrame
+        :return: DataFrame (or OptionChain) containing option chains
+        """
+        url = self.urls.get_optionchains_url()
+        params = self._option_chain_params(symbol, contract_type, strike_count, includeUnderlyingQuote,
+                                           strategy, interval, strike_price, range, fromDate, toDate,
+                                           volatility, underlying_price, interest_rate, daysToExpire,
+                                           expMonth, option_type, entillment)
+        df = self._fetch_frame('option_chains', url, params, "fetching option chains",
+                               lambda data: self.helper._optionchain_to_dataframe(json_data=data))
+        logger.info(f"Retrieved option chains for {symbol}")
+        
+        if indexed:
+            return OptionChain(df)
+        return df
+
+    def _expiration_buckets(self, expirations: pd.DataFrame, fromDate, toDate, expirations_per_request,
+                            max_workers):
+        """
+        Splits the expiration dates within [fromDate, toDate] into contiguous (from, to) ranges.
+        """
+        dates = sorted(set(str(d)[:10] for d in expirations.get('expirationDate', [])))
+        if fromDate is not None:
+            dates = [d for d in dates if d >= str(fromDate)[:10]]
+        if toDate is not None:
+            dates = [d for d in dates if d <= str(toDate)[:10]]
+        if not dates:
+            return []
+        size = expirations_per_request or math.ceil(len(dates) / max(1, max_workers))
+        return [(dates[i], dates[min(i + size, len(dates)) - 1]) for i in range(0, len(dates), size)]
+
+    @staticmethod
+    def _merge_chain_buckets(frames, bucket_stats):
+        """
+        Concatenates per-bucket chains, dropping contracts returned by more than one bucket.
+        """
+        frames = [df for df in frames if len(df)]
+        if not frames:
+            df = pd.DataFrame()
+        else:
+            df = pd.concat(frames, ignore_index=True)
+            if 'symbol' in df.columns:
+                df = df.drop_duplicates(subset='symbol', ignore_index=True)
+            df.attrs['underlying'] = frames[0].attrs.get('underlying', {})
+        df.attrs['buckets'] = bucket_stats
+        return df
+
+    def get_option_chains_by_expiration(self, symbol: str, contract_type: str, fromDate=None, toDate=None,
+                                        expirations_per_request: int = None, max_workers: int = 8,
+                                        indexed: bool = False, **kwargs):
+        """
+        Retrieves an option chain as several concurrent requests split by expiration.
+        
+        The expiration list is fetched first and the dates within
+        [fromDate, toDate] are split into contiguous buckets. Each bucket is
+        requested with its own fromDate/toDate on a thread pool and the results
+        are merged into one chain. Per-bucket timings are stored in
+        ``df.attrs['buckets']``.
+        
+        :param symbol: Symbol to retrieve option chains for
+        :param contract_type: Type of contract ('CALL', 'PUT' or 'ALL')
+        :param fromDate: First expiration to include (yyyy-MM-dd)
+        :param toDate: Last expiration to include (yyyy-MM-dd)
+        :param expirations_per_request: Expirations per request; defaults to spreading them over max_workers
+        :param max_workers: Number of requests in flight at the same time
+        :param indexed: Return an OptionChain instead of a DataFrame
+        :param kwargs: Other get_option_chains arguments (strike_count, range, ...)
+        :return: DataFrame (or OptionChain) containing the merged chain
+        """
+        buckets = self._expiration_buckets(self.get_option_expiration_chain(symbol), fromDate, toDate,
+                                           expirations_per_request, max_workers)
+
+        def fetch(index, bucket):
+            start = time.perf_counter()
+            df = self.get_option_chains(symbol, contract_type, fromDate=bucket[0], toDate=bucket[1], **kwargs)
+            return df, {'bucket': index, 'fromDate': bucket[0], 'toDate': bucket[1], 'contracts': len(df),
+                        'latency': time.perf_counter() - start}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(buckets) or 1))) as executor:
+            results = list(executor.map(lambda args: fetch(*args), enumerate(buckets)))
+
+        df = self._merge_chain_buckets([df for df, _ in results], [stats for _, stats in results])
+        logger.info(f"Retrieved option chains for {symbol} in {len(buckets)} expiration buckets")
+        if indexed:
+            return OptionChain(df)
+        return df
+
+    def iter_option_chains(self, symbol: str, contract_type: str, strike_count=None,
+                           includeUnderlyingQuote: bool =True, strategy=None, interval=None,
+                           strike_price=None, range=None, fromDate=None, toDate=None, volatility=None,
+                           underlying_price=None, interest_rate=None, daysToExpire=None,
+                           expMonth=None, option_type=None, entillment=None, chunk_size: int = 1 << 16):
+        """
+        Streams an option chain one expiration at a time.
+        
+        The response body is parsed incrementally with ChainStreamParser, so
+        the full chain is never held in memory at once. Takes the same arguments
+        as get_option_chains; results are not cached.
+        
+        :param chunk_size: Number of bytes read from the socket at a time
+        :yield: DataFrame of the contracts of one side and expiration, with
+                'exp_date', 'exp_date_type' and the chain-level 'underlying'
+                fields in ``df.attrs``
+        """
+        url = self.urls.get_optionchains_url()
+        params = self._option_chain_params(symbol, contract_type, strike_count, includeUnderlyingQuote,
+                                           strategy, interval, strike_price, range, fromDate, toDate,
+                                           volatility, underlying_price, interest_rate, daysToExpire,
+                                           expMonth, option_type, entillment)
+        response = self.session.get(url, headers=self.auth.get_headers(), params=params, stream=True)
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            logger.info(f"Retrieved option chains for {symbol}")
-            
-            return self.helper._optionchain_to_dataframe(json_data=data)
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while fetching option chains: {http_err}")
-            raise SystemExit(f"HTTP error occurred while fetching option chains: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while fetching option chains: {err}")
-            raise SystemExit(f"An error occurred while fetching option chains: {err}")
-
-
-    @lru_cache(maxsize=128)
+            if response.status_code >= 400:
+                handle_response(response, "streaming option chains")
+            parser = ChainStreamParser(response.iter_content(chunk_size=chunk_size),
+                                       encoding=response.encoding or 'utf-8')
+            expirations = 0
+            for side, exp_date, strikes in parser:
+                contracts = [contract for options_list in strikes.values() for contract in options_list]
+                df = self.helper._contracts_to_dataframe(contracts, [side] * len(contracts),
+                                                         [exp_date] * len(contracts))
+                df.attrs['exp_date'] = exp_date
+                df.attrs['exp_date_type'] = side
+                df.attrs['underlying'] = self.helper._chain_underlying(parser.meta)
+                expirations += 1
+                yield df
+            logger.info(f"Streamed option chains for {symbol} ({expirations} expirations)")
+        finally:
+            response.close()
+
+
     def get_option_expiration_chain(self, symbol: str):
         """
         Retrieves option expiration chains for a symbol.
@@ -178,40 +402,16 @@ class MarketData():
         """
         url = self.urls.get_optionchain_expiry_url()
         param ={'symbol': symbol}
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers, params=param)
-            response.raise_for_status()
-            logger.info(f"Retrieved option expiration chain for {symbol}")
-            data = response.json()['expirationList']
-            return pd.DataFrame(data)
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while fetching option expiration chain: {http_err}")
-            raise SystemExit(f"HTTP error occurred while fetching option expiration chain: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while fetching option expiration chain: {err}")
-            raise SystemExit(f"An error occurred while fetching option expiration chain: {err}")
-
-    @lru_cache(maxsize=128)    
-    def get_historical_data(self, symbol, period_type=None, period=None, frequency_type=None, 
-                            frequency=None, start_date:Union[str, int] =None, end_date: Union[str, int]=None, needExtendedHoursData=False,
-                            needPreviousClose=True):
+        df = self._fetch_frame('option_expiration_chain', url, param, "fetching option expiration chain",
+                               lambda data: pd.DataFrame(data['expirationList']))
+        logger.info(f"Retrieved option expiration chain for {symbol}")
+        return df
+
+    def _historical_params(self, symbol, period_type, period, frequency_type, frequency,
+                           start_date, end_date, needExtendedHoursData, needPreviousClose):
         """
-        Retrieves historical data for a symbol.
-        
-        :param symbol: Symbol to retrieve historical data for
-        :param period_type: Type of period (e.g., 'year', 'month')
-        :param period: Period for the historical data
-        :param frequency_type: Frequency type for the historical data (e.g., 'minute', 'daily')
-        :param frequency: Frequency for the historical data
-        :param start_date: Start date for the historical data
-        :param end_date: End date for the historical data
-        :param needExtendedHoursData: Boolean indicating if extended hours data is needed
-        :param needPreviousClose: Boolean indicating if previous close data is needed
-        :return: DataFrame containing historical data
+        Validates the price history arguments and builds the query parameters.
         """
-        url = self.urls.get_pricehistory_url()
-        headers = self.auth.get_headers()
         if period_type is not None:
             period_type = self.helper._validate_periodType(periodType=period_type)
         
@@ -237,7 +437,7 @@ class MarketData():
         if end_date is not None:
             end_date = self.helper._date_format(date=end_date)
 
-        params = {
+        return {
             'symbol': symbol,
             'periodType': period_type,
             'period': period,
@@ -249,29 +449,92 @@ class MarketData():
             'needPreviousClose': needPreviousClose
         }
 
+    def get_historical_data(self, symbol, period_type=None, period=None, frequency_type=None, 
+                            frequency=None, start_date:Union[str, int] =None, end_date: Union[str, int]=None, needExtendedHoursData=False,
+                            needPreviousClose=True):
+        """
+        Retrieves historical data for a symbol.
+        
+        :param symbol: Symbol to retrieve historical data for
+        :param period_type: Type of period (e.g., 'year', 'month')
+        :param period: Period for the historical data
+        :param frequency_type: Frequency type for the historical data (e.g., 'minute', 'daily')
+        :param frequency: Frequency for the historical data
+        :param start_date: Start date for the historical data
+        :param end_date: End date for the historical data
+        :param needExtendedHoursData: Boolean indicating if extended hours data is needed
+        :param needPreviousClose: Boolean indicating if previous close data is needed
+        :return: DataFrame of candles on a tz-aware exchange-time index, with symbol,
+                 previousClose and previousCloseDate in ``df.attrs``
+        """
+        url = self.urls.get_pricehistory_url()
+        params = self._historical_params(symbol, period_type, period, frequency_type, frequency,
+                                         start_date, end_date, needExtendedHoursData, needPreviousClose)
 
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            print(data)
-            df = pd.DataFrame(data['candles'])
-            """df['date'] = datetime.fromtimestamp(df['datetime']).strftime("%Y-%m-%d")
-            df['time'] = datetime.fromtimestamp(df['datetime']).strftime("%H:%M:%S")
-            df['previousClose'] = data['previousClose'].astype(float)
-            df['symbol'] = data['symbol']
-            df['previousCloseDate'] = data['previousCloseDate'].astype('datetime64[ns]')"""
-            logger.info(f"Retrieved historical data for {symbol}")
-            return df
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while fetching historical data: {http_err}")
-            raise SystemExit(f"HTTP error occurred while fetching historical data: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while fetching historical data: {err}")
-            raise SystemExit(f"An error occurred while fetching historical data: {err}") 
+        df = self._fetch_frame('historical_data', url, params, "fetching historical data",
+                               self.helper._candles_to_dataframe)
+        logger.info(f"Retrieved historical data for {symbol}")
+        return df
         
     
-    @lru_cache(maxsize=128)    
+    def _history_range_windows(self, start_date, end_date, frequency_type, frequency):
+        """
+        Converts a date range to epoch milliseconds and splits it into server-legal windows.
+        """
+        start = self.helper._date_format(date=start_date)
+        end = int(time.time() * 1000) if end_date is None else self.helper._date_format(date=end_date)
+        if start > end:
+            raise ValueError("start_date must not be after end_date")
+        return self.helper._history_windows(start, end, frequency_type, frequency)
+
+    @staticmethod
+    def _merge_history_windows(symbol, frames, window_stats):
+        """
+        Concatenates per-window candles into one sorted frame without duplicate timestamps.
+        """
+        df = normalize_candles(pd.concat(frames, ignore_index=True) if frames else None)
+        df.index = HelperFuncs._exchange_time_index(df['datetime'].to_numpy())
+        df.attrs['symbol'] = symbol
+        df.attrs['windows'] = window_stats
+        return df
+
+    def get_historical_range(self, symbol, start_date, end_date=None, frequency_type='minute', frequency=1,
+                             needExtendedHoursData=False, max_workers: int = 4):
+        """
+        Retrieves price history over a range longer than one request may cover.
+        
+        The range is split into the longest windows the endpoint serves for the
+        frequency (see HelperFuncs._history_windows), the windows are fetched
+        concurrently over the shared session and its rate limiter, and the
+        candles are merged into one sorted frame with overlapping bars removed.
+        
+        :param symbol: Symbol to retrieve historical data for
+        :param start_date: Start of the range ('YYYY-MM-DD', datetime or epoch milliseconds)
+        :param end_date: End of the range; defaults to now
+        :param frequency_type: 'minute', 'daily', 'weekly' or 'monthly'
+        :param frequency: Bar width in frequency_type units
+        :param needExtendedHoursData: Boolean indicating if extended hours data is needed
+        :param max_workers: Number of windows fetched at the same time
+        :return: DataFrame with datetime, open, high, low, close and volume; per-window
+                 timings in ``df.attrs['windows']``
+        """
+        windows = self._history_range_windows(start_date, end_date, frequency_type, frequency)
+        period_type = self.helper._history_period_type(frequency_type)
+
+        def fetch(window):
+            start = time.perf_counter()
+            df = self.get_historical_data(symbol, period_type=period_type, frequency_type=frequency_type,
+                                          frequency=frequency, start_date=window[0], end_date=window[1],
+                                          needExtendedHoursData=needExtendedHoursData, needPreviousClose=False)
+            return df, {'start': window[0], 'end': window[1], 'rows': len(df),
+                        'latency': time.perf_counter() - start}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(windows)))) as executor:
+            results = list(executor.map(fetch, windows))
+
+        logger.info(f"Retrieved historical data for {symbol} in {len(windows)} windows")
+        return self._merge_history_windows(symbol, [df for df, _ in results], [stats for _, stats in results])
+
     def get_active_gainers_losers(self, index_symbol: str = "$SPX", sort = "VOLUME", frequency = 5):
         """
         Retrieves active gainers and losers for a specified index.
@@ -287,19 +550,10 @@ class MarketData():
             'sort': self.helper._validate_sort(sort),
             'frequency': self.helper._validate_history_frequency(frequency)
         }
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            logger.info(f"Retrieved active gainers and losers for {index_symbol}")
-            data = response.json()['screeners']
-            return pd.DataFrame(data)
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while fetching active gainers/losers: {http_err}")
-            raise SystemExit(f"HTTP error occurred while fetching active gainers/losers: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while fetching active gainers/losers: {err}")
-            raise SystemExit(f"An error occurred while fetching active gainers/losers: {err}")
+        df = self._fetch_frame('movers', url, params, "fetching active gainers/losers",
+                               lambda data: pd.DataFrame(data['screeners']))
+        logger.info(f"Retrieved active gainers and losers for {index_symbol}")
+        return df
 
     def stream_live_data(self, symbols):
         """
@@ -309,49 +563,141 @@ class MarketData():
         :yield: DataFrame containing live data for each symbol
         """
         url = self.urls.get_livedata_url()
-        headers = self.auth.get_headers()
         params = {'symbols': ','.join(symbols)}
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            for line in response.iter_lines():
-                if line:
-                    data = json.loads(line.decode('utf-8'))
-                    logger.info(f"Streaming live data for symbols: {', '.join(symbols)}")
-                    yield self.helper._parse_json_to_dataframe([data])
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while streaming live data: {http_err}")
-            raise SystemExit(f"HTTP error occurred while streaming live data: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while streaming live data: {err}")
-            raise SystemExit(f"An error occurred while streaming live data: {err}")
-
-    async def stream_real_time_data(self, symbols):
-        """
-        Streams real-time data using WebSocket for a list of symbols.
-        """
-        async with websockets.connect(self.urls.get_livestream_url()) as websocket:
-            subscribe_message = json.dumps({
-                "action": "subscribe",
-                "symbols": symbols
-            })
-            await websocket.send(subscribe_message)
-            logger.info(f"Subscribed to real-time data for symbols: {', '.join(symbols)}")
-            async for message in websocket:
-                data = json.loads(message)
-                logger.info(f"Received real-time data: {data}")
-                yield self.helper._parse_json_to_dataframe(data)
+        response = self.session.get(url, headers=self.auth.get_headers(), params=params, stream=True)
+        if response.status_code >= 400:
+            handle_response(response, "streaming live data")
+        for line in response.iter_lines():
+            if line:
+                data = json.loads(line.decode('utf-8'))
+                logger.info(f"Streaming live data for symbols: {', '.join(symbols)}")
+                yield self.helper._parse_json_to_dataframe([data])
 
-    def run_stream(self, symbols):
+    @staticmethod
+    def _backfill_start(decoder, symbol, gap):
+        last = decoder.latest(symbol)
+        return int(last['chartTime']) + 60_000 if last is not None and last['chartTime'] else gap['start']
+
+    @staticmethod
+    def _backfill_entries(symbol, df, start, gap):
+        times = df['datetime'].to_numpy()
+        # only bars that closed before the stream came back; later ones arrive live
+        df = df[(times >= start) & (times + 60_000 <= gap['end'])]
+        return [{'key': symbol, '0': symbol, '1': row.open, '2': row.high, '3': row.low, '4': row.close,
+                 '5': row.volume, '6': 0, '7': row.datetime} for row in df.itertuples(index=False)]
+
+    def _chart_backfill(self, decoder, symbols, gap):
         """
-        Runs the real-time data stream using asyncio.
+        Returns CHART_EQUITY entries for the 1-minute bars that closed during a stream gap.
+        """
+        entries = []
+        for symbol in symbols:
+            start = self._backfill_start(decoder, symbol, gap)
+            try:
+                df = self.get_historical_data(symbol, period_type='day', frequency_type='minute', frequency=1,
+                                              start_date=start, end_date=gap['end'])
+            except SchwabAPIError as err:
+                logger.warning(f"Could not backfill {symbol} bars after the stream gap: {err}")
+                continue
+            entries.extend(self._backfill_entries(symbol, df, start, gap))
+        return entries
+
+    async def _fetch_chart_backfill(self, decoder, symbols, gap):
+        """
+        Runs _chart_backfill in a worker thread so the blocking requests stay off the event loop.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self._chart_backfill, decoder, symbols, gap)
+
+    def _streamer_trader(self):
+        """
+        Trader that supplies the streamerInfo when stream_real_time_data is not given one.
+        """
+        return Trader(self.auth, session=self.session)
+
+    async def stream_real_time_data(self, symbols, service: str = 'LEVELONE_EQUITIES', fields=None, trader=None,
+                                    as_frame: bool = False, on_gap=None, backfill: bool = False):
+        """
+        Streams real-time data for a list of symbols through the Schwab streamer.
+
+        Logs in with the streamerInfo of the user preferences and subscribes the
+        symbols to ``service``. Messages are decoded into a StreamDecoder; every
+        iteration yields the ticks received since the previous one, so a slow
+        consumer gets larger batches instead of falling behind.
+
+        A dropped connection is re-established with backoff and the
+        subscriptions are restored; the stream only ends if reconnecting gives
+        up, which raises SchwabStreamError once the last ticks are yielded.
+        Each outage is reported to ``on_gap``. With ``backfill`` the
+        CHART_EQUITY bars missed during an outage are fetched with
+        get_historical_data and yielded with the next batch (their sequence
+        is 0).
+
+        :param symbols: List of symbols to stream
+        :param service: 'LEVELONE_EQUITIES', 'LEVELONE_OPTIONS', 'LEVELONE_FUTURES' or 'CHART_EQUITY'
+        :param fields: Field names or numbers to request; defaults to the service's common fields
+        :param trader: Trader or AsyncTrader used to read the user preferences
+        :param as_frame: Yield each batch as a DataFrame instead of a NumPy structured array
+        :param on_gap: Optional callable (or coroutine function) receiving the gap dict of every reconnect;
+                       see SchwabStreamer.add_gap_handler
+        :param backfill: Fill CHART_EQUITY gaps from price history
+        :raises SchwabStreamError: If the connection is lost and cannot be re-established
         """
-        loop = asyncio.get_event_loop()
+        decoder = StreamDecoder(service, fields)
+        ready = asyncio.Event()
+
+        def on_data(_service, content, timestamp):
+            decoder.decode(content, timestamp)
+            ready.set()
+
+        async def on_reconnect(gap):
+            if backfill and service == 'CHART_EQUITY':
+                entries = await self._fetch_chart_backfill(decoder, gap['subscriptions'].get(service, []), gap)
+                decoder.decode(entries, gap['end'])
+                logger.info(f"Backfilled {len(entries)} bars missed during the stream gap")
+                ready.set()
+            if on_gap is not None:
+                result = on_gap(gap)
+                if inspect.isawaitable(result):
+                    await result
+
+        streamer = SchwabStreamer(self.auth, trader=trader or self._streamer_trader())
+        streamer.add_gap_handler(on_reconnect)
+        await streamer.start()
+        closed = asyncio.ensure_future(streamer.wait_closed())
         try:
-            loop.run_until_complete(self.stream_real_time_data(symbols))
+            await streamer.subscribe(service, symbols, fields, callback=on_data)
+            logger.info(f"Subscribed to real-time data for symbols: {', '.join(symbols)}")
+            while not closed.done():
+                waiter = asyncio.ensure_future(ready.wait())
+                await asyncio.wait({waiter, closed}, return_when=asyncio.FIRST_COMPLETED)
+                if not waiter.done():
+                    waiter.cancel()
+                    break
+                ready.clear()
+                ticks = decoder.drain()
+                yield decoder.to_frame(ticks) if as_frame else ticks
+            # ticks decoded just before the stream closed are still handed out
+            if len(decoder):
+                ticks = decoder.drain()
+                yield decoder.to_frame(ticks) if as_frame else ticks
+            error = closed.result()
+            if isinstance(error, SchwabStreamError):
+                raise error
+            if error is not None:
+                raise SchwabStreamError(f"Stream for {', '.join(symbols)} ended: {error!r}") from error
         finally:
-            loop.run_until_complete(loop.shutdown_asyncgens())
-            loop.close()
+            closed.cancel()
+            await streamer.stop()
+
+    def run_stream(self, symbols, **kwargs):
+        """
+        Runs the real-time data stream using asyncio, logging every message.
+        """
+        async def consume():
+            async for ticks in self.stream_real_time_data(symbols, **kwargs):
+                logger.info(f"Received {len(ticks)} real-time updates")
+
+        asyncio.run(consume())
 
     def get_all_market_hours(self, date: str =None):
         """
@@ -364,18 +710,9 @@ class MarketData():
         params = {
             'date': date
         }
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            logger.info(f"Retrieved market hours for all available markets")
-            return self.helper._parse_json_to_dataframe(response.json())
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while fetching market hours: {http_err}")
-            raise SystemExit(f"HTTP error occurred while fetching market hours: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while fetching market hours: {err}")
-            raise SystemExit(f"An error occurred while fetching market hours: {err}")
+        data = self._get(url, params, "fetching market hours")
+        logger.info(f"Retrieved market hours for all available markets")
+        return self.helper._parse_json_to_dataframe(data)
 
     def get_market_hours(self, market_id="option", date=None):
         """
@@ -390,18 +727,9 @@ class MarketData():
             'market_id': self.helper._validate_markets(market_id),
             'date': date
         }
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            logger.info(f"Retrieved market hours for market {market_id}")
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while fetching market hours: {http_err}")
-            raise SystemExit(f"HTTP error occurred while fetching market hours: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while fetching market hours: {err}")
-            raise SystemExit(f"An error occurred while fetching market hours: {err}")
+        data = self._get(url, params, "fetching market hours")
+        logger.info(f"Retrieved market hours for market {market_id}")
+        return data
 
     def get_instruments(self, symbol, projection="symbol-search"):
         """
@@ -416,18 +744,9 @@ class MarketData():
             'symbol': symbol,
             'projection': projection
         }
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            logger.info(f"Retrieved instrument details for {symbol}")
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while fetching instruments: {http_err}")
-            raise SystemExit(f"HTTP error occurred while fetching instruments: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while fetching instruments: {err}")
-            raise SystemExit(f"An error occurred while fetching instruments: {err}")
+        data = self._get(url, params, "fetching instruments")
+        logger.info(f"Retrieved instrument details for {symbol}")
+        return data
 
     def get_instrument_by_cusip(self, cusip):
         """
@@ -440,17 +759,8 @@ class MarketData():
         params = {
             'cusip': cusip
         }
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            logger.info(f"Retrieved instrument details for CUSIP {cusip}")
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while fetching instrument by CUSIP: {http_err}")
-            raise SystemExit(f"HTTP error occurred while fetching instrument by CUSIP: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while fetching instrument by CUSIP: {err}")
-            raise SystemExit(f"An error occurred while fetching instrument by CUSIP: {err}")
+        data = self._get(url, params, "fetching instrument by CUSIP")
+        logger.info(f"Retrieved instrument details for CUSIP {cusip}")
+        return data
 
     
\ No newline at end of file
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+from schwab_api.helper import HelperFuncs
+
+_SIDES = {'CALL': 'CALL', 'C': 'CALL', 'PUT': 'PUT', 'P': 'PUT'}
+
+
+def _expiration_key(value):
+    # '2024-01-19:5' (chain map key) and '2024-01-19T20:00:00.000+00:00' both map to '2024-01-19'
+    return str(value)[:10]
+
+
+def _side_key(put_call):
+    side = _SIDES.get(str(put_call).upper())
+    if side is None:
+        raise ValueError("put_call must be 'CALL' or 'PUT'")
+    return side
+
+
+class OptionChain:
+    """
+    Option chain held as sorted columns with an index on (expiration, strike, putCall).
+
+    Contracts are sorted by expiration, side and strike once, so every
+    (expiration, side) pair is a contiguous slice with an ascending strike
+    array. Exact lookups are dict hits; nearest strike and nearest delta are
+    binary searches over that slice.
+    """
+
+    def __init__(self, contracts: pd.DataFrame, underlying: dict = None):
+        """
+        :param contracts: One row per contract as returned by HelperFuncs._optionchain_to_dataframe
+        :param underlying: Chain-level and underlying fields; defaults to contracts.attrs['underlying']
+        """
+        self.underlying = underlying if underlying is not None else dict(contracts.attrs.get('underlying', {}))
+        side_column = 'putCall' if 'putCall' in contracts.columns else 'exp_date_type'
+        if len(contracts):
+            expirations = np.array([_expiration_key(v) for v in contracts['exp_date']], dtype=object)
+            sides = contracts[side_column].to_numpy(dtype=object)
+        else:
+            expirations = sides = np.array([], dtype=object)
+        strikes = contracts['strikePrice'].to_numpy(dtype=np.float64) if len(contracts) else np.array([])
+        order = np.lexsort((strikes, sides, expirations))
+
+        self.columns = {name: contracts[name].to_numpy()[order] for name in contracts.columns}
+        self._expirations = expirations[order]
+        self._sides = sides[order]
+        self._strikes = strikes[order]
+        self._index = {(exp, side, strike): i for i, (exp, side, strike)
+                       in enumerate(zip(self._expirations, self._sides, self._strikes.tolist()))}
+        self._groups = {}
+        for i, key in enumerate(zip(self._expirations, self._sides)):
+            start, _ = self._groups.get(key, (i, i))
+            self._groups[key] = (start, i + 1)
+        self._delta_order = {}
+
+    @classmethod
+    def from_json(cls, json_data: dict):
+        """
+        Builds an OptionChain from a decoded chains response.
+        """
+        contracts, underlying = HelperFuncs._optionchain_to_frames(json_data)
+        return cls(contracts, underlying.iloc[0].to_dict())
+
+    def __len__(self):
+        return len(self._strikes)
+
+    @property
+    def expirations(self):
+        """
+        Sorted expiration dates ('YYYY-MM-DD') present in the chain.
+        """
+        return sorted(set(self._expirations))
+
+    def _slice(self, expiration, put_call):
+        return self._groups.get((_expiration_key(expiration), _side_key(put_call)), (0, 0))
+
+    def strikes(self, expiration, put_call='CALL'):
+        """
+        Returns the ascending strike array of one expiration and side.
+        """
+        start, stop = self._slice(expiration, put_call)
+        return self._strikes[start:stop]
+
+    def row(self, i: int):
+        """
+        Returns contract ``i`` (position in the sorted chain) as a dict.
+        """
+        return {name: values[i] for name, values in self.columns.items()}
+
+    def locate(self, expiration, strike: float, put_call='CALL'):
+        """
+        Returns the position of a contract, or None if it is not in the chain.
+        """
+        return self._index.get((_expiration_key(expiration), _side_key(put_call), float(strike)))
+
+    def get(self, expiration, strike: float, put_call='CALL'):
+        """
+        Returns the contract with the exact expiration, strike and side, or None.
+
+        :param expiration: 'YYYY-MM-DD' or the chain's expiration map key
+        :param strike: Strike price
+        :param put_call: 'CALL' or 'PUT'
+        """
+        i = self.locate(expiration, strike, put_call)
+        return None if i is None else self.row(i)
+
+    def nearest_strike(self, expiration, strike: float, put_call='CALL'):
+        """
+        Returns the contract whose strike is closest to ``strike``, or None if
+        the expiration has no contracts on that side.
+        """
+        start, stop = self._slice(expiration, put_call)
+        if start == stop:
+            return None
+        strikes = self._strikes[start:stop]
+        pos = int(np.searchsorted(strikes, strike))
+        if pos == len(strikes) or (pos > 0 and strike - strikes[pos - 1] <= strikes[pos] - strike):
+            pos -= 1
+        return self.row(start + pos)
+
+    def _deltas(self, start, stop):
+        # per-slice delta sort order, built on first use; rows without a usable delta are left out
+        cached = self._delta_order.get(start)
+        if cached is None:
+            deltas = np.asarray(self.columns['delta'][start:stop], dtype=np.float64)
+            valid = np.flatnonzero(np.isfinite(deltas) & (np.abs(deltas) <= 1))
+            order = valid[np.argsort(deltas[valid], kind='stable')]
+            cached = self._delta_order[start] = (deltas[order], order)
+        return cached
+
+    def nearest_delta(self, expiration, delta: float, put_call='CALL'):
+        """
+        Returns the contract whose server delta is closest to ``delta``.
+
+        Put deltas are negative, so the 30-delta put is ``nearest_delta(exp, -0.30, 'PUT')``.
+        """
+        start, stop = self._slice(expiration, put_call)
+        if start == stop or 'delta' not in self.columns:
+            return None
+        deltas, order = self._deltas(start, stop)
+        if not len(deltas):
+            return None
+        pos = int(np.searchsorted(deltas, delta))
+        if pos == len(deltas) or (pos > 0 and delta - deltas[pos - 1] <= deltas[pos] - delta):
+            pos -= 1
+        return self.row(start + int(order[pos]))
+
+    def to_dataframe(self):
+        """
+        Returns the contracts as a DataFrame sorted by expiration, side and strike.
+        """
+        df = pd.DataFrame({name: values.copy() for name, values in self.columns.items()})
+        df.attrs['underlying'] = dict(self.underlying)
+        return df
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that queues callers instead of rejecting them.
+
+    Each call reserves a token immediately; when the bucket is empty the balance
+    goes negative and the caller sleeps until its reserved token has been refilled.
+    Callers are therefore served in the order they arrived, and the same bucket can
+    be used from threads (``acquire``) and from an event loop (``acquire_async``).
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        """
+        :param name: Name used in logs and metrics
+        :param rate: Tokens added per second
+        :param capacity: Maximum number of tokens the bucket holds (burst size)
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Rate and capacity must be positive.")
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.delayed_requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1):
+        """
+        Reserves tokens and returns how many seconds the caller must wait before using them.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.requests += 1
+            if wait > 0:
+                self.delayed_requests += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def acquire(self, tokens: float = 1):
+        """
+        Blocks the current thread until the tokens are available.
+
+        :return: Seconds spent waiting
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            logger.debug(f"Rate limit '{self.name}': waiting {wait:.3f}s")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1):
+        """
+        Suspends the current task until the tokens are available.
+
+        :return: Seconds spent waiting
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            logger.debug(f"Rate limit '{self.name}': waiting {wait:.3f}s")
+            await asyncio.sleep(wait)
+        return wait
+
+    @property
+    def tokens(self):
+        """
+        Current token balance; negative values are tokens already promised to queued callers.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def stats(self):
+        """
+        Returns fill level and wait-time metrics for the bucket.
+        """
+        tokens = self.tokens
+        return {
+            'name': self.name,
+            'rate': self.rate,
+            'capacity': self.capacity,
+            'tokens': tokens,
+            'fill_level': max(tokens, 0.0) / self.capacity,
+            'queued': max(-tokens, 0.0),
+            'requests': self.requests,
+            'delayed_requests': self.delayed_requests,
+            'total_wait': self.total_wait,
+            'max_wait': self.max_wait,
+            'avg_wait': self.total_wait / self.requests if self.requests else 0.0,
+        }
+
+
+class RateLimiter:
+    """
+    Client-side request budget for the Schwab API.
+
+    Requests are routed to one of three buckets: ``market_data`` for
+    /marketdata endpoints, ``orders`` for order placement, replacement and
+    cancellation, and ``trader`` for all other /trader endpoints. OAuth token
+    requests are not limited.
+    """
+
+    # requests allowed per period (seconds) for each bucket
+    DEFAULT_LIMITS = {
+        'market_data': (120, 60),
+        'trader': (120, 60),
+        'orders': (120, 60),
+    }
+
+    def __init__(self, limits: dict = None, burst: dict = None):
+        """
+        :param limits: Mapping of bucket name to (requests, period_seconds); merged over DEFAULT_LIMITS
+        :param burst: Mapping of bucket name to bucket capacity. Defaults to a tenth of the
+                      budget, and the refill rate is lowered so that burst plus refill never
+                      exceeds the budget within one period.
+        """
+        merged = dict(self.DEFAULT_LIMITS)
+        merged.update(limits or {})
+        burst = burst or {}
+        self.buckets = {}
+        for name, (requests, period) in merged.items():
+            capacity = burst.get(name, max(1, requests // 10))
+            rate = max(requests - capacity, 1) / period
+            self.buckets[name] = TokenBucket(name, rate, capacity)
+
+    @staticmethod
+    def bucket_name(method: str, url: str):
+        """
+        Returns the bucket name for a request, or None if it is not rate limited.
+        """
+        if '/marketdata/' in url:
+            return 'market_data'
+        if '/trader/' in url:
+            if method.upper() != 'GET' and '/orders' in url:
+                return 'orders'
+            return 'trader'
+        return None
+
+    def acquire(self, method: str, url: str):
+        """
+        Blocks until the request fits within its bucket's budget.
+
+        :return: Seconds spent waiting
+        """
+        name = self.bucket_name(method, url)
+        if name is None or name not in self.buckets:
+            return 0.0
+        return self.buckets[name].acquire()
+
+    async def acquire_async(self, method: str, url: str):
+        """
+        Awaitable version of acquire.
+
+        :return: Seconds spent waiting
+        """
+        name = self.bucket_name(method, url)
+        if name is None or name not in self.buckets:
+            return 0.0
+        return await self.buckets[name].acquire_async()
+
+    def stats(self):
+        """
+        Returns the metrics of every bucket keyed by bucket name.
+        """
+        return {name: bucket.stats() for name, bucket in self.buckets.items()}
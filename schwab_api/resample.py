@@ -0,0 +1,215 @@
+import logging
+import re
+import numpy as np
+import pandas as pd
+from schwab_api.cache import EXCHANGE_TZ
+from schwab_api.exceptions import SchwabAuthError, SchwabClientError, SchwabRateLimitError
+from schwab_api.history_store import empty_candles, normalize_candles
+from schwab_api.utils import require_sync
+
+logger = logging.getLogger(__name__)
+
+# Equity session times used when market hours are not available, as offsets from midnight in exchange time.
+REGULAR_SESSION = (pd.Timedelta(hours=9, minutes=30), pd.Timedelta(hours=16))
+EXTENDED_SESSION = (pd.Timedelta(hours=7), pd.Timedelta(hours=20))
+_RULE = re.compile(r'^\s*(\d*)\s*(min|m|t|h|d)\s*$', re.IGNORECASE)
+_RULE_MINUTES = {'min': 1, 'm': 1, 't': 1, 'h': 60}
+
+
+def parse_rule(rule):
+    """
+    Converts a bar width to minutes; None means one bar per session.
+
+    :param rule: Minutes as an int, or a string such as '5min', '15m', '1h' or '1d'
+    """
+    if isinstance(rule, (int, np.integer)):
+        if rule <= 0:
+            raise ValueError("rule must be a positive number of minutes")
+        return int(rule)
+    match = _RULE.match(str(rule))
+    if match is None:
+        raise ValueError(f"Unsupported resample rule {rule!r}; use e.g. '5min', '1h' or '1d'")
+    count = int(match.group(1) or 1)
+    unit = match.group(2).lower()
+    if unit == 'd':
+        if count != 1:
+            raise ValueError("Only single-day bars are supported")
+        return None
+    if count <= 0:
+        raise ValueError("rule must be a positive number of minutes")
+    return count * _RULE_MINUTES[unit]
+
+
+def _to_ms(values):
+    # via timedelta arithmetic so the result does not depend on the index's storage unit
+    index = pd.DatetimeIndex(values)
+    epoch = pd.Timestamp(0, tz='UTC') if index.tz is not None else pd.Timestamp(0)
+    return np.asarray((index - epoch) // pd.Timedelta(milliseconds=1), dtype=np.int64)
+
+
+def default_sessions(timestamps, extended_hours: bool = False):
+    """
+    Returns equity session bounds for every exchange-time date that has a bar.
+
+    :param timestamps: Bar times in epoch milliseconds
+    :param extended_hours: Use the 07:00-20:00 extended session instead of 09:30-16:00
+    :return: int64 array of shape (n, 2) with session [start, end) in epoch milliseconds
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if not len(timestamps):
+        return np.empty((0, 2), dtype=np.int64)
+    local = pd.to_datetime(timestamps, unit='ms', utc=True).tz_convert(EXCHANGE_TZ).tz_localize(None)
+    dates = pd.DatetimeIndex(np.unique(local.normalize()))
+    open_offset, close_offset = EXTENDED_SESSION if extended_hours else REGULAR_SESSION
+    # add the offsets to naive dates before localizing, so DST change days keep their wall-clock times
+    starts = _to_ms((dates + open_offset).tz_localize(EXCHANGE_TZ))
+    ends = _to_ms((dates + close_offset).tz_localize(EXCHANGE_TZ))
+    return np.column_stack([starts, ends])
+
+
+def sessions_from_market_hours(market_hours: dict, extended_hours: bool = False, product: str = None):
+    """
+    Extracts session bounds from a get_market_hours response.
+
+    :param market_hours: Response of MarketData.get_market_hours
+    :param extended_hours: Span preMarket through postMarket instead of regularMarket only
+    :param product: Product code to read (e.g. 'EQ'); defaults to the first one with session hours
+    :return: int64 array of shape (n, 2); empty if the market is closed
+    """
+    bounds = []
+    for products in market_hours.values():
+        for code, hours in (products or {}).items():
+            if product is not None and code != product:
+                continue
+            info = hours or {}
+            sessions = info.get('sessionHours') or {}
+            names = ('preMarket', 'regularMarket', 'postMarket') if extended_hours else ('regularMarket',)
+            spans = [span for name in names for span in sessions.get(name) or []]
+            if not info.get('isOpen', True) or not spans:
+                continue
+            start = min(pd.Timestamp(span['start']) for span in spans)
+            end = max(pd.Timestamp(span['end']) for span in spans)
+            bounds.append((start.value // 1_000_000, end.value // 1_000_000))
+            break
+        if bounds:
+            break
+    return np.array(bounds, dtype=np.int64).reshape(-1, 2)
+
+
+def market_sessions(market_data, dates, market_id: str = 'equity', extended_hours: bool = False):
+    """
+    Returns session bounds for a set of dates, from get_market_hours where it answers.
+
+    Dates the endpoint rejects with a 4xx status (it does not cover the distant
+    past) fall back to default_sessions; dates it reports as closed get no
+    session. Auth, rate-limit, server and connection errors are raised.
+
+    :param market_data: MarketData used for the requests
+    :param dates: Dates ('YYYY-MM-DD' strings or anything pandas can parse)
+    :return: int64 array of shape (n, 2) sorted by start
+    :raises SchwabAPIError: If the market hours cannot be fetched for another reason
+    """
+    require_sync(market_data, 'get_market_hours', 'market_sessions')
+    bounds = []
+    for date in sorted({pd.Timestamp(d).strftime('%Y-%m-%d') for d in dates}):
+        try:
+            hours = market_data.get_market_hours(market_id=market_id, date=date)
+        except (SchwabAuthError, SchwabRateLimitError):
+            raise
+        except SchwabClientError as err:
+            logger.info(f"Market hours for {date} unavailable ({err}); using the default session")
+            noon = pd.Timestamp(f"{date} 12:00", tz=EXCHANGE_TZ).value // 1_000_000
+            bounds.append(default_sessions([noon], extended_hours))
+            continue
+        bounds.append(sessions_from_market_hours(hours, extended_hours))
+    if not bounds:
+        return np.empty((0, 2), dtype=np.int64)
+    bounds = np.concatenate(bounds)
+    return bounds[np.argsort(bounds[:, 0], kind='stable')]
+
+
+def resample(candles: pd.DataFrame, rule, sessions=None, extended_hours: bool = False):
+    """
+    Builds coarser OHLCV bars from 1-minute candles.
+
+    Bars are anchored to the session open, so with a 09:30 open hourly bars
+    start at 09:30, 10:30, ... and the last bar of a session may be shorter.
+    Candles outside every session are dropped, which is how regular-hours
+    bars are cut from an extended-hours download. Daily bars ('1d') cover one
+    session and are stamped at midnight exchange time of the session's date.
+
+    :param candles: Candles with datetime (epoch ms), open, high, low, close and volume
+    :param rule: Bar width, e.g. 5, '15min', '1h' or '1d'
+    :param sessions: (n, 2) array of session [start, end) in epoch milliseconds, e.g. from
+                     market_sessions; defaults to default_sessions
+    :param extended_hours: Session type used when ``sessions`` is not given
+    :return: Candles DataFrame of the coarser bars
+    """
+    width = parse_rule(rule)
+    candles = normalize_candles(candles)
+    times = candles['datetime'].to_numpy()
+    if sessions is None:
+        sessions = default_sessions(times, extended_hours)
+    sessions = np.asarray(sessions, dtype=np.int64).reshape(-1, 2)
+    if not len(times) or not len(sessions):
+        return empty_candles()
+
+    session = np.searchsorted(sessions[:, 0], times, 'right') - 1
+    inside = session >= 0
+    inside[inside] = times[inside] < sessions[session[inside], 1]
+    rows = np.flatnonzero(inside)
+    if not len(rows):
+        return empty_candles()
+    times, session = times[rows], session[rows]
+    session_start = sessions[session, 0]
+
+    if width is None:
+        local = pd.to_datetime(session_start, unit='ms', utc=True).tz_convert(EXCHANGE_TZ)
+        buckets = _to_ms(local.normalize())
+    else:
+        step = width * 60_000
+        buckets = session_start + (times - session_start) // step * step
+
+    # candles are sorted, so each bucket is a contiguous run
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    columns = {name: candles[name].to_numpy()[rows] for name in ('open', 'high', 'low', 'close', 'volume')}
+    return pd.DataFrame({
+        'datetime': buckets[starts],
+        'open': columns['open'][starts],
+        'high': np.maximum.reduceat(columns['high'], starts),
+        'low': np.minimum.reduceat(columns['low'], starts),
+        'close': columns['close'][ends],
+        'volume': np.add.reduceat(columns['volume'], starts),
+    })
+
+
+def resample_many(candles: pd.DataFrame, rules, sessions=None, extended_hours: bool = False):
+    """
+    Resamples one set of 1-minute candles to several bar widths.
+
+    :return: Dict of rule -> candles DataFrame
+    """
+    candles = normalize_candles(candles)
+    if sessions is None:
+        sessions = default_sessions(candles['datetime'].to_numpy(), extended_hours)
+    return {rule: resample(candles, rule, sessions) for rule in rules}
+
+
+def resample_history(store, symbol: str, start_date, end_date=None, rules=('5min', '15min', '1h', '1d'),
+                     extended_hours: bool = False, sessions=None):
+    """
+    Fetches 1-minute candles once through a CandleStore and resamples them to every rule.
+
+    :param store: CandleStore (or MmapCandleStore) holding the 1-minute series
+    :param symbol: Symbol to retrieve
+    :param start_date: Start of the window
+    :param end_date: End of the window; defaults to now
+    :param rules: Bar widths to build
+    :param extended_hours: Resample the extended-hours series, as needExtendedHoursData=True would return
+    :param sessions: Session bounds; defaults to default_sessions for the requested hours
+    :return: Dict of rule -> candles DataFrame
+    """
+    candles = store.get(symbol, start_date, end_date, frequency_type='minute', frequency=1,
+                        extended_hours=extended_hours)
+    return resample_many(candles, rules, sessions, extended_hours)
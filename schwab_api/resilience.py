@@ -0,0 +1,182 @@
+import logging
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from schwab_api.exceptions import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header given either as seconds or as an HTTP date.
+
+    :return: Seconds to wait, or None if the header is missing or invalid
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests are retried and how long to back off.
+
+    Idempotent methods are retried on connection errors and on any status in
+    ``retry_statuses``. Other methods (order placement) are only retried on 429,
+    where the server guarantees the request was not processed.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.5, max_backoff: float = 30,
+                 retry_statuses=(429, 500, 502, 503, 504), max_retry_after: float = 60):
+        """
+        :param max_retries: Number of retries after the first attempt
+        :param backoff_factor: Base delay in seconds; attempt n sleeps up to backoff_factor * 2**n
+        :param max_backoff: Upper bound for the exponential delay
+        :param retry_statuses: HTTP statuses that are retried
+        :param max_retry_after: Upper bound for a server supplied Retry-After delay
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+        self.max_retry_after = max_retry_after
+
+    def should_retry_status(self, method: str, status_code: int):
+        if status_code not in self.retry_statuses:
+            return False
+        return status_code == 429 or method.upper() in self.IDEMPOTENT_METHODS
+
+    def should_retry_error(self, method: str):
+        return method.upper() in self.IDEMPOTENT_METHODS
+
+    def backoff(self, attempt: int, retry_after: float = None):
+        """
+        Returns the delay before the given retry attempt (0-based) using full jitter.
+
+        A Retry-After value from the server takes precedence as the minimum delay.
+        """
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+        if retry_after is not None:
+            delay = min(retry_after, self.max_retry_after) + random.uniform(0, self.backoff_factor)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and calls
+    fail fast with CircuitOpenError. Once ``recovery_timeout`` has passed a single
+    trial request is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, endpoint: str, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """
+        Raises CircuitOpenError if the request must not be sent.
+
+        :return: True if the request is the half-open trial; its outcome must be recorded or the
+                 trial released with release_trial()
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            elapsed = time.monotonic() - self.opened_at
+            if self.state == self.OPEN and elapsed >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            raise CircuitOpenError(self.endpoint, max(self.recovery_timeout - elapsed, 0.0))
+
+    def release_trial(self):
+        """
+        Frees the half-open trial slot of a request that ended without an outcome (e.g. cancelled).
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit opened for {self.endpoint} after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+class CircuitBreakerRegistry:
+    """
+    Holds one CircuitBreaker per endpoint.
+
+    Endpoints are keyed by host and path with identifier segments (anything
+    containing a digit other than the API version, e.g. account hashes or order
+    ids) collapsed, so all accounts share the breaker of the same endpoint.
+    """
+
+    _ID_SEGMENT = re.compile(r'\d')
+    _VERSION_SEGMENT = re.compile(r'v\d+')
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.breakers = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def endpoint_key(cls, url: str):
+        parts = urlsplit(url)
+        segments = ['{id}' if cls._ID_SEGMENT.search(segment) and not cls._VERSION_SEGMENT.fullmatch(segment)
+                    else segment for segment in parts.path.split('/')]
+        return f"{parts.netloc}{'/'.join(segments)}"
+
+    def get(self, url: str):
+        key = self.endpoint_key(url)
+        with self._lock:
+            breaker = self.breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(key, self.failure_threshold, self.recovery_timeout)
+                self.breakers[key] = breaker
+            return breaker
+
+    def states(self):
+        """
+        Returns the state of every known endpoint.
+        """
+        return {key: breaker.state for key, breaker in self.breakers.items()}
@@ -0,0 +1,220 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import pandas as pd
+from schwab_api.cache import EXCHANGE_TZ
+from schwab_api.exceptions import SchwabAPIError
+from schwab_api.helper import HelperFuncs
+from schwab_api.utils import require_sync
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_chain(json_data):
+    # module level so it can be sent to a worker process
+    return HelperFuncs()._optionchain_to_dataframe(json_data=json_data)
+
+
+def _timed_parse(json_data):
+    start = time.perf_counter()
+    chain = _parse_chain(json_data)
+    return chain, time.perf_counter() - start
+
+
+class ScanResult:
+    """
+    Outcome of scanning one underlying.
+    """
+
+    def __init__(self, symbol, chain=None, error=None, fetch_time=0.0, parse_time=0.0):
+        """
+        :param symbol: Underlying symbol
+        :param chain: Parsed chain DataFrame, or None if the scan failed
+        :param error: Exception raised while fetching or parsing, if any
+        :param fetch_time: Seconds spent on the HTTP request
+        :param parse_time: Seconds spent parsing (including the process hop when a pool is used)
+        """
+        self.symbol = symbol
+        self.chain = chain
+        self.error = error
+        self.fetch_time = fetch_time
+        self.parse_time = parse_time
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        status = 'ok' if self.ok else f"error={self.error!r}"
+        contracts = len(self.chain) if self.chain is not None else 0
+        return f"ScanResult({self.symbol!r}, contracts={contracts}, {status})"
+
+
+class OptionChainScanner:
+    """
+    Scans option chains for many underlyings concurrently.
+
+    Requests run on a thread pool over the MarketData session, so they share
+    its connection pool, rate limiter and retries. Parsing runs on the same
+    threads, or on a process pool when ``parse_processes`` is set, which keeps
+    large chains from serializing on the GIL. Results are yielded as each
+    underlying finishes; a failure is reported in its ScanResult and does not
+    stop the scan.
+    """
+
+    def __init__(self, market_data, contract_type: str = 'ALL', strike_count: int = None, range: str = None,
+                 min_dte: int = None, max_dte: int = None, max_workers: int = 8, parse_processes: int = 0,
+                 progress=None, **chain_kwargs):
+        """
+        :param market_data: MarketData used for the requests
+        :param contract_type: 'CALL', 'PUT' or 'ALL'
+        :param strike_count: Number of strikes around the money per expiration
+        :param range: Moneyness filter (e.g. 'ITM', 'OTM', 'NTM')
+        :param min_dte: Earliest expiration to include, in days from today
+        :param max_dte: Latest expiration to include, in days from today
+        :param max_workers: Number of requests in flight at the same time
+        :param parse_processes: Size of the parsing process pool; 0 parses on the request threads
+        :param progress: Optional callable receiving (ScanResult, stats dict) after each underlying
+        :param chain_kwargs: Other get_option_chains arguments
+        """
+        require_sync(market_data, '_get', 'OptionChainScanner')
+        self.market_data = market_data
+        self.contract_type = contract_type
+        self.chain_kwargs = dict(chain_kwargs, strike_count=strike_count, range=range)
+        self.min_dte = min_dte
+        self.max_dte = max_dte
+        self.max_workers = max_workers
+        self.parse_processes = parse_processes
+        self.progress = progress
+        self._lock = threading.Lock()
+        self._reset(0)
+
+    def _reset(self, total):
+        self.total = total
+        self.completed = 0
+        self.failed = 0
+        self.contracts = 0
+        self.fetch_time = 0.0
+        self.parse_time = 0.0
+        self.started_at = time.monotonic()
+        self.finished_at = None
+
+    def _date_window(self):
+        today = pd.Timestamp.now(tz=EXCHANGE_TZ).normalize()
+        from_date = None if self.min_dte is None else (today + pd.Timedelta(days=self.min_dte)).strftime('%Y-%m-%d')
+        to_date = None if self.max_dte is None else (today + pd.Timedelta(days=self.max_dte)).strftime('%Y-%m-%d')
+        return from_date, to_date
+
+    def _params(self, symbol):
+        from_date, to_date = self._date_window()
+        args = {'strike_count': None, 'includeUnderlyingQuote': True, 'strategy': None, 'interval': None,
+                'strike_price': None, 'range': None, 'volatility': None, 'underlying_price': None,
+                'interest_rate': None, 'daysToExpire': None, 'expMonth': None, 'option_type': None,
+                'entillment': None}
+        args.update(self.chain_kwargs)
+        return self.market_data._option_chain_params(
+            symbol, self.contract_type, args['strike_count'], args['includeUnderlyingQuote'], args['strategy'],
+            args['interval'], args['strike_price'], args['range'], from_date, to_date, args['volatility'],
+            args['underlying_price'], args['interest_rate'], args['daysToExpire'], args['expMonth'],
+            args['option_type'], args['entillment'])
+
+    def _fetch(self, symbol):
+        """
+        Fetches one chain; returns (symbol, decoded JSON, seconds).
+        """
+        start = time.perf_counter()
+        data = self.market_data._get(self.market_data.urls.get_optionchains_url(), self._params(symbol),
+                                     "fetching option chains")
+        return symbol, data, time.perf_counter() - start
+
+    def _fetch_and_parse(self, symbol):
+        symbol, data, fetch_time = self._fetch(symbol)
+        start = time.perf_counter()
+        chain = _parse_chain(data)
+        return ScanResult(symbol, chain, fetch_time=fetch_time, parse_time=time.perf_counter() - start)
+
+    def _record(self, result):
+        with self._lock:
+            self.completed += 1
+            if result.ok:
+                self.contracts += len(result.chain)
+            else:
+                self.failed += 1
+            self.fetch_time += result.fetch_time
+            self.parse_time += result.parse_time
+        if self.progress is not None:
+            self.progress(result, self.stats())
+        return result
+
+    def stats(self):
+        """
+        Returns progress and throughput of the current or last scan.
+        """
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        elapsed = max(end - self.started_at, 1e-9)
+        return {
+            'total': self.total,
+            'completed': self.completed,
+            'failed': self.failed,
+            'remaining': self.total - self.completed,
+            'contracts': self.contracts,
+            'elapsed': elapsed,
+            'symbols_per_sec': self.completed / elapsed,
+            'contracts_per_sec': self.contracts / elapsed,
+            'avg_fetch_time': self.fetch_time / self.completed if self.completed else 0.0,
+            'avg_parse_time': self.parse_time / self.completed if self.completed else 0.0,
+        }
+
+    def scan(self, symbols):
+        """
+        Scans every symbol and yields a ScanResult as each one finishes.
+
+        :param symbols: Underlying symbols
+        :yield: ScanResult per symbol, in completion order
+        """
+        symbols = list(dict.fromkeys(symbols))
+        self._reset(len(symbols))
+        workers = max(1, min(self.max_workers, len(symbols) or 1))
+        threads = ThreadPoolExecutor(max_workers=workers)
+        processes = ProcessPoolExecutor(max_workers=self.parse_processes) if self.parse_processes else None
+        pending = {}
+        try:
+            task = self._fetch if processes is not None else self._fetch_and_parse
+            for symbol in symbols:
+                pending[threads.submit(task, symbol)] = ('fetch', symbol, 0.0)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, symbol, fetch_time = pending.pop(future)
+                    try:
+                        value = future.result()
+                    except (SchwabAPIError, ValueError, KeyError, TypeError) as err:
+                        logger.warning(f"Scan of {symbol} failed: {err}")
+                        yield self._record(ScanResult(symbol, error=err, fetch_time=fetch_time))
+                        continue
+                    if stage == 'parse':
+                        chain, parse_time = value
+                        yield self._record(ScanResult(symbol, chain, fetch_time=fetch_time, parse_time=parse_time))
+                    elif processes is not None:
+                        symbol, data, fetch_time = value
+                        pending[processes.submit(_timed_parse, data)] = ('parse', symbol, fetch_time)
+                    else:
+                        yield self._record(value)
+        finally:
+            # the caller may stop iterating early; drop work that has not started
+            for future in pending:
+                future.cancel()
+            self.finished_at = time.monotonic()
+            threads.shutdown(wait=False)
+            if processes is not None:
+                processes.shutdown(wait=False)
+        stats = self.stats()
+        logger.info(f"Scanned {stats['completed']} underlyings ({stats['failed']} failed) in "
+                    f"{stats['elapsed']:.1f}s, {stats['symbols_per_sec']:.1f} symbols/s")
+
+    def scan_all(self, symbols):
+        """
+        Scans every symbol and returns {symbol: ScanResult}.
+        """
+        return {result.symbol: result for result in self.scan(symbols)}
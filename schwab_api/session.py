@@ -0,0 +1,130 @@
+import logging
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from schwab_api.exceptions import SchwabConnectionError
+from schwab_api.rate_limit import RateLimiter
+from schwab_api.resilience import CircuitBreakerRegistry, RetryPolicy, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+class SchwabSession:
+    """
+    Shared HTTP transport for all Schwab API calls.
+
+    Wraps a single ``requests.Session`` with a keep-alive connection pool so
+    that repeated calls to api.schwabapi.com reuse TCP/TLS connections instead
+    of paying a fresh handshake on every request.
+    """
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 16,
+                 pool_block: bool = False, timeout=(5, 30), headers: dict = None,
+                 rate_limiter: RateLimiter = None, rate_limit: bool = True,
+                 retry_policy: RetryPolicy = None, circuit_breakers: CircuitBreakerRegistry = None):
+        """
+        Initializes the pooled session.
+
+        :param pool_connections: Number of per-host connection pools to keep
+        :param pool_maxsize: Maximum number of connections kept alive per host
+        :param pool_block: Block when the pool is exhausted instead of opening a throwaway connection
+        :param timeout: Default (connect, read) timeout in seconds applied when a call passes none
+        :param headers: Default headers sent with every request
+        :param rate_limiter: RateLimiter shared with other sessions; a default one is created if omitted
+        :param rate_limit: Set to False to disable client-side rate limiting
+        :param retry_policy: RetryPolicy deciding retries and backoff; RetryPolicy(max_retries=0) disables retries
+        :param circuit_breakers: CircuitBreakerRegistry shared with other sessions; a default one is created if omitted
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.timeout = timeout
+        if rate_limiter is None and rate_limit:
+            rate_limiter = RateLimiter()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breakers = circuit_breakers if circuit_breakers is not None else CircuitBreakerRegistry()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Accept': 'application/json',
+                                     'Connection': 'keep-alive'})
+        if headers:
+            self.session.headers.update(headers)
+
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Sends a request through the pooled session.
+
+        Each attempt waits for the rate limiter and is checked against the
+        endpoint's circuit breaker. Connection errors and retryable statuses are
+        retried with jittered exponential backoff, honoring Retry-After. The last
+        response is returned as-is, so callers still decide how to treat error
+        statuses (see utils.handle_response).
+
+        :param method: HTTP method (e.g. 'GET', 'POST')
+        :param url: Full request URL
+        :param kwargs: Any keyword accepted by ``requests.Session.request``
+        :return: requests.Response
+        :raises CircuitOpenError: If the endpoint's circuit is open
+        :raises SchwabConnectionError: If the API could not be reached after all retries
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        policy = self.retry_policy
+        breaker = self.circuit_breakers.get(url)
+        attempt = 0
+        while True:
+            trial = breaker.before_request()
+            try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(method, url)
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as err:
+                breaker.record_failure()
+                if attempt >= policy.max_retries or not policy.should_retry_error(method):
+                    raise SchwabConnectionError(f"Could not reach {url}: {err}") from err
+                delay = policy.backoff(attempt)
+                logger.warning(f"{method} {url} failed ({err}); retrying in {delay:.2f}s")
+            except BaseException:
+                if trial:
+                    breaker.release_trial()
+                raise
+            else:
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if attempt >= policy.max_retries or not policy.should_retry_status(method, response.status_code):
+                    return response
+                delay = policy.backoff(attempt, parse_retry_after(response.headers.get('Retry-After')))
+                logger.warning(f"{method} {url} returned {response.status_code}; retrying in {delay:.2f}s")
+                response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        """
+        Closes all pooled connections.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
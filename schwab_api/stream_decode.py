@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+from schwab_api.stream_fields import FIELDS, field_numbers, record_dtype
+
+
+class StreamDecoder:
+    """
+    Decodes streamer data messages into preallocated NumPy structured buffers.
+
+    Level-one messages only carry the fields that changed, keyed by field
+    number. The decoder keeps the latest full record of every key in
+    ``state`` and appends a copy of the merged record to a tick buffer for
+    every update, so each tick is complete without building any Python
+    objects per message. drain() hands the buffered ticks over as a
+    structured array; DataFrames are only built by to_frame() and snapshot().
+
+    Missing values are NaN for float fields, 0 for int fields, False for
+    bool fields and None for string fields.
+    """
+
+    def __init__(self, service: str, fields=None, capacity: int = 1024):
+        """
+        :param service: Streamer service, e.g. 'LEVELONE_EQUITIES'
+        :param fields: Field names or numbers to keep; defaults to DEFAULT_FIELDS for the service.
+                       Other fields in the messages are ignored.
+        :param capacity: Initial number of rows of the state and tick buffers; both grow as needed
+        """
+        self.service = service
+        self.dtype = record_dtype(service, fields)
+        names = FIELDS[service]
+        self._names = {str(n): names[n] for n in field_numbers(service, fields)}
+        self.index = {}
+        self.state = self._empty(max(1, capacity))
+        self.ticks = self._empty(max(1, capacity))
+        self.count = 0
+        self._columns = None
+
+    def _empty(self, size):
+        buffer = np.zeros(size, dtype=self.dtype)
+        for name in self.dtype.names:
+            if self.dtype[name].kind == 'f':
+                buffer[name] = np.nan
+        return buffer
+
+    @staticmethod
+    def _grow(buffer, empty):
+        grown = empty(len(buffer) * 2)
+        grown[:len(buffer)] = buffer
+        return grown
+
+    def _state_columns(self):
+        # field number -> view of its state column; rebuilt when the state buffer grows
+        if self._columns is None:
+            self._columns = {key: self.state[name] for key, name in self._names.items()}
+        return self._columns
+
+    def _row(self, key):
+        row = self.index.get(key)
+        if row is None:
+            row = len(self.index)
+            if row == len(self.state):
+                self.state = self._grow(self.state, self._empty)
+                self._columns = None
+            self.index[key] = row
+            self.state['symbol'][row] = key
+        return row
+
+    def decode(self, content, timestamp: int = None):
+        """
+        Applies the entries of one data message and buffers one tick per entry.
+
+        :param content: The message's 'content' list of entries keyed by field number
+        :param timestamp: The message timestamp in epoch milliseconds
+        :return: Number of ticks added
+        """
+        for entry in content:
+            key = entry.get('key', entry.get('0'))
+            if key is None:
+                continue
+            row = self._row(key)
+            columns = self._state_columns()
+            for field, value in entry.items():
+                column = columns.get(field)
+                if column is not None and value is not None:
+                    column[row] = value
+            if timestamp is not None:
+                self.state['timestamp'][row] = timestamp
+            if self.count == len(self.ticks):
+                self.ticks = self._grow(self.ticks, self._empty)
+            self.ticks[self.count] = self.state[row]
+            self.count += 1
+        return len(content)
+
+    def __call__(self, service, content, timestamp=None):
+        # usable directly as a SchwabStreamer handler
+        self.decode(content, timestamp)
+
+    def __len__(self):
+        return self.count
+
+    def drain(self):
+        """
+        Returns the buffered ticks as a structured array and empties the buffer.
+        """
+        ticks = self.ticks[:self.count].copy()
+        self.count = 0
+        return ticks
+
+    def latest(self, key):
+        """
+        Returns a copy of the latest record of a key, or None if it has not been seen.
+        """
+        row = self.index.get(key)
+        return None if row is None else self.state[row].copy()
+
+    def records(self):
+        """
+        Returns the latest record of every key as a structured array, in first-seen order.
+        """
+        return self.state[:len(self.index)].copy()
+
+    def snapshot(self):
+        """
+        Returns the latest record of every key as a DataFrame indexed by symbol.
+        """
+        return self.to_frame(self.records()).set_index('symbol')
+
+    @staticmethod
+    def to_frame(records):
+        """
+        Converts drained ticks or records to a DataFrame in one batch.
+        """
+        return pd.DataFrame({name: records[name] for name in records.dtype.names})
+
+    def reset(self):
+        """
+        Forgets all keys and buffered ticks.
+        """
+        self.index.clear()
+        self.state = self._empty(len(self.state))
+        self._columns = None
+        self.count = 0
@@ -0,0 +1,121 @@
+import numpy as np
+
+# Field numbers of the streamer services. Data messages key each value by its number as a string;
+# field 0 is the key (symbol) and is also sent as 'key'.
+FIELDS = {
+    'LEVELONE_EQUITIES': [
+        'symbol', 'bidPrice', 'askPrice', 'lastPrice', 'bidSize', 'askSize', 'askId', 'bidId', 'totalVolume',
+        'lastSize', 'highPrice', 'lowPrice', 'closePrice', 'exchangeId', 'marginable', 'description', 'lastId',
+        'openPrice', 'netChange', 'high52Week', 'low52Week', 'peRatio', 'annualDividendAmount', 'dividendYield',
+        'nav', 'exchangeName', 'dividendDate', 'regularMarketQuote', 'regularMarketTrade',
+        'regularMarketLastPrice', 'regularMarketLastSize', 'regularMarketNetChange', 'securityStatus', 'mark',
+        'quoteTime', 'tradeTime', 'regularMarketTradeTime', 'bidTime', 'askTime', 'askMICId', 'bidMICId',
+        'lastMICId', 'netPercentChange', 'regularMarketPercentChange', 'markNetChange', 'markPercentChange',
+        'htbQuantity', 'htbRate', 'hardToBorrow', 'isShortable', 'postMarketNetChange',
+        'postMarketPercentChange',
+    ],
+    'LEVELONE_OPTIONS': [
+        'symbol', 'description', 'bidPrice', 'askPrice', 'lastPrice', 'highPrice', 'lowPrice', 'closePrice',
+        'totalVolume', 'openInterest', 'volatility', 'intrinsicValue', 'expirationYear', 'multiplier', 'digits',
+        'openPrice', 'bidSize', 'askSize', 'lastSize', 'netChange', 'strikePrice', 'contractType', 'underlying',
+        'expirationMonth', 'deliverables', 'timeValue', 'expirationDay', 'daysToExpiration', 'delta', 'gamma',
+        'theta', 'vega', 'rho', 'securityStatus', 'theoreticalOptionValue', 'underlyingPrice',
+        'uvExpirationType', 'mark', 'quoteTime', 'tradeTime', 'exchange', 'exchangeName', 'lastTradingDay',
+        'settlementType', 'netPercentChange', 'markNetChange', 'markPercentChange', 'impliedYield',
+        'isPennyPilot', 'optionRoot', 'high52Week', 'low52Week', 'indicativeAskPrice', 'indicativeBidPrice',
+        'indicativeQuoteTime', 'exerciseType',
+    ],
+    'LEVELONE_FUTURES': [
+        'symbol', 'bidPrice', 'askPrice', 'lastPrice', 'bidSize', 'askSize', 'bidId', 'askId', 'totalVolume',
+        'lastSize', 'quoteTime', 'tradeTime', 'highPrice', 'lowPrice', 'closePrice', 'exchangeId', 'description',
+        'lastId', 'openPrice', 'netChange', 'futurePercentChange', 'exchangeName', 'securityStatus',
+        'openInterest', 'mark', 'tick', 'tickAmount', 'product', 'futurePriceFormat', 'futureTradingHours',
+        'futureIsTradable', 'futureMultiplier', 'futureIsActive', 'futureSettlementPrice', 'futureActiveSymbol',
+        'futureExpirationDate', 'expirationStyle', 'askTime', 'bidTime', 'quotedInSession', 'settlementDate',
+    ],
+    'CHART_EQUITY': [
+        'symbol', 'openPrice', 'highPrice', 'lowPrice', 'closePrice', 'volume', 'sequence', 'chartTime',
+        'chartDay',
+    ],
+}
+
+# Kinds of the non-float fields, as in helper.QUOTE_SCHEMA: 'i' int64, 'b' bool, 'O' object (strings).
+# Fields not listed here are float64.
+FIELD_KINDS = {
+    'LEVELONE_EQUITIES': {
+        'symbol': 'O', 'bidSize': 'i', 'askSize': 'i', 'askId': 'O', 'bidId': 'O', 'totalVolume': 'i',
+        'lastSize': 'i', 'exchangeId': 'O', 'marginable': 'b', 'description': 'O', 'lastId': 'O',
+        'exchangeName': 'O', 'dividendDate': 'O', 'regularMarketQuote': 'b', 'regularMarketTrade': 'b',
+        'regularMarketLastSize': 'i', 'securityStatus': 'O', 'quoteTime': 'i', 'tradeTime': 'i',
+        'regularMarketTradeTime': 'i', 'bidTime': 'i', 'askTime': 'i', 'askMICId': 'O', 'bidMICId': 'O',
+        'lastMICId': 'O', 'htbQuantity': 'i', 'hardToBorrow': 'b', 'isShortable': 'b',
+    },
+    'LEVELONE_OPTIONS': {
+        'symbol': 'O', 'description': 'O', 'totalVolume': 'i', 'openInterest': 'i', 'expirationYear': 'i',
+        'digits': 'i', 'bidSize': 'i', 'askSize': 'i', 'lastSize': 'i', 'contractType': 'O', 'underlying': 'O',
+        'expirationMonth': 'i', 'deliverables': 'O', 'expirationDay': 'i', 'daysToExpiration': 'i',
+        'securityStatus': 'O', 'uvExpirationType': 'O', 'quoteTime': 'i', 'tradeTime': 'i', 'exchange': 'O',
+        'exchangeName': 'O', 'lastTradingDay': 'i', 'settlementType': 'O', 'isPennyPilot': 'b',
+        'optionRoot': 'O', 'indicativeQuoteTime': 'i', 'exerciseType': 'O',
+    },
+    'LEVELONE_FUTURES': {
+        'symbol': 'O', 'bidSize': 'i', 'askSize': 'i', 'bidId': 'O', 'askId': 'O', 'totalVolume': 'i',
+        'lastSize': 'i', 'quoteTime': 'i', 'tradeTime': 'i', 'exchangeId': 'O', 'description': 'O',
+        'lastId': 'O', 'exchangeName': 'O', 'securityStatus': 'O', 'openInterest': 'i', 'product': 'O',
+        'futurePriceFormat': 'O', 'futureTradingHours': 'O', 'futureIsTradable': 'b', 'futureIsActive': 'b',
+        'futureActiveSymbol': 'O', 'futureExpirationDate': 'i', 'expirationStyle': 'O', 'askTime': 'i',
+        'bidTime': 'i', 'quotedInSession': 'b', 'settlementDate': 'i',
+    },
+    'CHART_EQUITY': {'symbol': 'O', 'sequence': 'i', 'chartTime': 'i', 'chartDay': 'i'},
+}
+
+_KIND_DTYPES = {'f': np.float64, 'i': np.int64, 'b': np.bool_, 'O': object}
+
+# Fields requested when a subscription does not name any.
+DEFAULT_FIELDS = {
+    'LEVELONE_EQUITIES': list(range(0, 13)) + [17, 18, 33, 34, 35, 42],
+    'LEVELONE_OPTIONS': [0, 2, 3, 4, 8, 9, 10, 16, 17, 18, 19, 20, 21, 22, 28, 29, 30, 31, 32, 35, 37, 38, 39],
+    'LEVELONE_FUTURES': [0, 1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 13, 14, 18, 19, 23, 24],
+    'CHART_EQUITY': list(range(0, 9)),
+}
+
+
+def field_numbers(service: str, fields=None):
+    """
+    Converts field names or numbers to the sorted field numbers of a service.
+
+    :param service: Streamer service, e.g. 'LEVELONE_EQUITIES'
+    :param fields: Field names or numbers; defaults to DEFAULT_FIELDS for the service
+    :return: Sorted list of field numbers, always including 0
+    """
+    names = FIELDS.get(service)
+    if names is None:
+        raise ValueError("Service must be one of: " + ", ".join(FIELDS))
+    if fields is None:
+        return list(DEFAULT_FIELDS[service])
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(',') if f.strip()]
+    numbers = {0}
+    for field in fields:
+        if isinstance(field, str) and not field.isdigit():
+            if field not in names:
+                raise ValueError(f"Unknown {service} field {field!r}")
+            numbers.add(names.index(field))
+        else:
+            number = int(field)
+            if not 0 <= number < len(names):
+                raise ValueError(f"{service} field numbers run from 0 to {len(names) - 1}")
+            numbers.add(number)
+    return sorted(numbers)
+
+
+def record_dtype(service: str, fields=None):
+    """
+    Structured dtype holding the given fields of a service, plus the message 'timestamp' (epoch ms).
+
+    :param fields: Field names or numbers; defaults to DEFAULT_FIELDS for the service
+    """
+    numbers = field_numbers(service, fields)
+    names, kinds = FIELDS[service], FIELD_KINDS[service]
+    return np.dtype([(names[n], _KIND_DTYPES[kinds.get(names[n], 'f')]) for n in numbers]
+                    + [('timestamp', np.int64)])
@@ -0,0 +1,396 @@
+import asyncio
+import inspect
+import itertools
+import json
+import logging
+import time
+import websockets
+from schwab_api.async_session import AsyncTokenProvider
+from schwab_api.exceptions import SchwabAPIError, SchwabStreamError
+from schwab_api.resilience import RetryPolicy
+from schwab_api.stream_fields import FIELDS, field_numbers
+
+logger = logging.getLogger(__name__)
+
+SERVICES = tuple(FIELDS)
+
+
+class SchwabStreamer:
+    """
+    Async client for the Schwab streamer websocket.
+
+    start() reads streamerInfo from the user preferences, connects and sends
+    the ADMIN LOGIN request. Subscriptions use SUBS for a service's first
+    keys, ADD for later ones and UNSUBS to drop keys. Data messages are
+    dispatched to the callbacks registered for their service. Heartbeat
+    notifications keep ``last_heartbeat`` current, and the connection is
+    closed if nothing arrives for ``heartbeat_timeout`` seconds.
+
+    When the connection drops, the streamer reconnects with jittered
+    exponential backoff, logs in again with a fresh token and restores every
+    subscription. Each outage is recorded in ``gaps`` and passed to the gap
+    handlers, so consumers know which interval they missed.
+    """
+
+    def __init__(self, auth, trader=None, streamer_info: dict = None, connect=None,
+                 heartbeat_timeout: float = 60.0, request_timeout: float = 10.0, reconnect: bool = True,
+                 retry_policy: RetryPolicy = None, max_reconnect_attempts: int = None):
+        """
+        :param auth: SchwabAuth object; its access token authorizes the LOGIN request
+        :param trader: Trader or AsyncTrader whose get_user_preferences() supplies streamerInfo
+        :param streamer_info: streamerInfo entry to use instead of asking ``trader``
+        :param connect: Callable opening the websocket (defaults to websockets.connect)
+        :param heartbeat_timeout: Seconds without any message after which the connection is closed
+        :param request_timeout: Seconds to wait for the response to a request
+        :param reconnect: Reconnect and resubscribe when the connection is lost
+        :param retry_policy: RetryPolicy whose backoff() spaces the reconnect attempts
+        :param max_reconnect_attempts: Attempts per outage before giving up; None retries forever
+        """
+        if trader is None and streamer_info is None:
+            raise ValueError("SchwabStreamer needs a trader or streamer_info")
+        self.auth = auth
+        self.trader = trader
+        self.streamer_info = streamer_info
+        self.token_provider = AsyncTokenProvider(auth)
+        self.connect = connect or websockets.connect
+        self.heartbeat_timeout = heartbeat_timeout
+        self.request_timeout = request_timeout
+        self.reconnect = reconnect
+        self.retry_policy = retry_policy or RetryPolicy(backoff_factor=1.0, max_backoff=30)
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.websocket = None
+        self.subscriptions = {}
+        self.handlers = {}
+        self.gap_handlers = []
+        self.gaps = []
+        self.reconnects = 0
+        self.last_message = None
+        self.last_heartbeat = None
+        self.last_data_time = None
+        self._request_ids = itertools.count()
+        self._pending = {}
+        self._reader = None
+        self._watchdog = None
+        self._supervisor = None
+        self._connection = None
+        self._closed = None
+        self._stopping = False
+
+    async def _load_streamer_info(self):
+        if self.streamer_info is None:
+            if inspect.iscoroutinefunction(self.trader.get_user_preferences):
+                preferences = await self.trader.get_user_preferences()
+            else:
+                loop = asyncio.get_running_loop()
+                preferences = await loop.run_in_executor(None, self.trader.get_user_preferences)
+            info = (preferences or {}).get('streamerInfo')
+            if isinstance(info, list):
+                info = info[0] if info else None
+            if not info:
+                raise SchwabStreamError("User preferences do not contain streamerInfo")
+            self.streamer_info = info
+        return self.streamer_info
+
+    def _request(self, service: str, command: str, parameters: dict = None):
+        info = self.streamer_info
+        request = {
+            'service': service,
+            'requestid': str(next(self._request_ids)),
+            'command': command,
+            'SchwabClientCustomerId': info.get('schwabClientCustomerId'),
+            'SchwabClientCorrelId': info.get('schwabClientCorrelId'),
+        }
+        if parameters:
+            request['parameters'] = parameters
+        return request
+
+    async def _send(self, service: str, command: str, parameters: dict = None):
+        """
+        Sends one request and waits for its response; returns the response content.
+
+        :raises SchwabStreamError: If the server rejects the request or does not answer in time
+        """
+        if self.websocket is None or self._connection is None or self._connection.done():
+            raise SchwabStreamError("Streamer is not connected")
+        request = self._request(service, command, parameters)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request['requestid']] = future
+        try:
+            await self.websocket.send(json.dumps({'requests': [request]}))
+            response = await asyncio.wait_for(future, self.request_timeout)
+        except asyncio.TimeoutError as err:
+            raise SchwabStreamError(f"No response to {service} {command} within {self.request_timeout}s") from err
+        finally:
+            self._pending.pop(request['requestid'], None)
+        content = response.get('content') or {}
+        if content.get('code', 0) != 0:
+            raise SchwabStreamError(f"{service} {command} failed with code {content.get('code')}: "
+                                    f"{content.get('msg')}")
+        return content
+
+    async def _connect(self):
+        info = await self._load_streamer_info()
+        headers = await self.token_provider.get_headers()
+        self.websocket = await self.connect(info['streamerSocketUrl'])
+        self._connection = asyncio.get_running_loop().create_future()
+        self.last_message = time.monotonic()
+        self._reader = asyncio.ensure_future(self._read(self.websocket, self._connection))
+        if self.heartbeat_timeout:
+            self._watchdog = asyncio.ensure_future(self._watch(self.websocket, self._connection))
+        try:
+            await self._send('ADMIN', 'LOGIN', {
+                'Authorization': headers['Authorization'].split(' ', 1)[-1],
+                'SchwabClientChannel': info.get('schwabClientChannel'),
+                'SchwabClientFunctionId': info.get('schwabClientFunctionId'),
+            })
+        except BaseException:
+            await self._disconnect()
+            raise
+        logger.info(f"Logged in to streamer {info['streamerSocketUrl']}")
+
+    async def _disconnect(self):
+        for task in (self._watchdog, self._reader):
+            if task is not None:
+                task.cancel()
+        if self.websocket is not None:
+            try:
+                await self.websocket.close()
+            except (OSError, websockets.WebSocketException):
+                pass
+        if self._connection is not None and not self._connection.done():
+            self._connection.set_result(None)
+
+    async def start(self):
+        """
+        Connects and logs in; returns once the LOGIN request is accepted.
+
+        Only later connection losses are retried; a failure here is raised.
+        """
+        self._stopping = False
+        self._closed = asyncio.get_running_loop().create_future()
+        await self._connect()
+        self._supervisor = asyncio.ensure_future(self._supervise())
+        return self
+
+    async def _resubscribe(self):
+        for service, subscription in list(self.subscriptions.items()):
+            await self._send(service, 'SUBS', {'keys': ','.join(subscription['keys']),
+                                               'fields': ','.join(map(str, subscription['fields']))})
+
+    async def _reconnect(self, error):
+        """
+        Retries connect, login and resubscribe until one succeeds.
+
+        :return: (attempts, None) on success, or (None, last error) after giving up
+        """
+        attempt = 0
+        while self.max_reconnect_attempts is None or attempt < self.max_reconnect_attempts:
+            await asyncio.sleep(self.retry_policy.backoff(attempt))
+            attempt += 1
+            try:
+                await self._connect()
+                await self._resubscribe()
+                return attempt, None
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException, SchwabAPIError) as err:
+                logger.warning(f"Streamer reconnect attempt {attempt} failed: {err}")
+                error = err
+                await self._disconnect()
+        logger.error(f"Giving up on the streamer after {attempt} reconnect attempts: {error}")
+        return None, error
+
+    async def _supervise(self):
+        while True:
+            error = await asyncio.shield(self._connection)
+            if self._stopping:
+                return
+            disconnected = int(time.time() * 1000)
+            logger.warning(f"Streamer connection lost: {error!r}")
+            attempts = None
+            if self.reconnect:
+                attempts, error = await self._reconnect(error)
+            if attempts is None:
+                self._finish(error)
+                return
+            self.reconnects += 1
+            await self._flag_gap(disconnected, attempts)
+
+    async def _flag_gap(self, disconnected: int, attempts: int):
+        gap = {
+            'start': self.last_data_time or disconnected,
+            'end': int(time.time() * 1000),
+            'disconnected_at': disconnected,
+            'attempts': attempts,
+            'subscriptions': {service: list(sub['keys']) for service, sub in self.subscriptions.items()},
+        }
+        self.gaps.append(gap)
+        logger.warning(f"Streamer reconnected after {attempts} attempts; no data from {gap['start']} "
+                       f"to {gap['end']}")
+        for callback in list(self.gap_handlers):
+            try:
+                result = callback(gap)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Gap handler failed")
+
+    def _finish(self, error=None):
+        if self._closed is not None and not self._closed.done():
+            self._closed.set_result(error)
+
+    def add_handler(self, service: str, callback):
+        """
+        Registers ``callback(service, content, timestamp)`` for a service's data messages.
+
+        ``content`` is the message's list of entries, keyed by field number.
+        Coroutine functions are awaited.
+        """
+        self.handlers.setdefault(service, []).append(callback)
+
+    def remove_handler(self, service: str, callback):
+        if callback in self.handlers.get(service, []):
+            self.handlers[service].remove(callback)
+
+    def add_gap_handler(self, callback):
+        """
+        Registers ``callback(gap)`` for reconnects; coroutine functions are awaited.
+
+        ``gap`` is a dict with 'start' (timestamp of the last data message, or
+        the disconnect time), 'end', 'disconnected_at' and 'attempts' in epoch
+        milliseconds and counts, and the restored 'subscriptions' by service.
+        """
+        self.gap_handlers.append(callback)
+
+    async def subscribe(self, service: str, keys, fields=None, callback=None):
+        """
+        Subscribes keys to a service, adding to its existing keys.
+
+        :param service: One of SERVICES
+        :param keys: Symbols as a list or comma-separated string
+        :param fields: Field names or numbers (see stream_fields.FIELDS); defaults to DEFAULT_FIELDS.
+                       The service's field list is replaced for all its keys.
+        :param callback: Optional handler registered for the service
+        """
+        if isinstance(keys, str):
+            keys = [k.strip() for k in keys.split(',') if k.strip()]
+        numbers = field_numbers(service, fields)
+        if callback is not None:
+            self.add_handler(service, callback)
+        current = self.subscriptions.get(service)
+        command = 'ADD' if current else 'SUBS'
+        if current and fields is None:
+            numbers = current['fields']
+        await self._send(service, command, {'keys': ','.join(keys), 'fields': ','.join(map(str, numbers))})
+        subscribed = current['keys'] if current else []
+        self.subscriptions[service] = {'keys': list(dict.fromkeys(subscribed + list(keys))), 'fields': numbers}
+        logger.info(f"Subscribed {service} to {', '.join(keys)}")
+
+    async def unsubscribe(self, service: str, keys):
+        """
+        Removes keys from a service's subscription.
+        """
+        if isinstance(keys, str):
+            keys = [k.strip() for k in keys.split(',') if k.strip()]
+        await self._send(service, 'UNSUBS', {'keys': ','.join(keys)})
+        current = self.subscriptions.get(service)
+        if current is not None:
+            current['keys'] = [k for k in current['keys'] if k not in set(keys)]
+            if not current['keys']:
+                del self.subscriptions[service]
+
+    async def level_one_equities(self, keys, fields=None, callback=None):
+        await self.subscribe('LEVELONE_EQUITIES', keys, fields, callback)
+
+    async def level_one_options(self, keys, fields=None, callback=None):
+        await self.subscribe('LEVELONE_OPTIONS', keys, fields, callback)
+
+    async def level_one_futures(self, keys, fields=None, callback=None):
+        await self.subscribe('LEVELONE_FUTURES', keys, fields, callback)
+
+    async def chart_equity(self, keys, fields=None, callback=None):
+        await self.subscribe('CHART_EQUITY', keys, fields, callback)
+
+    async def _dispatch(self, item):
+        service = item.get('service')
+        content = item.get('content') or []
+        for callback in list(self.handlers.get(service, ())):
+            try:
+                result = callback(service, content, item.get('timestamp'))
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                # one failing handler must not stop the stream for the others
+                logger.exception(f"{service} handler failed")
+
+    async def _handle(self, message):
+        self.last_message = time.monotonic()
+        data = json.loads(message)
+        for response in data.get('response', ()):
+            future = self._pending.get(str(response.get('requestid')))
+            if future is not None and not future.done():
+                future.set_result(response)
+        for notify in data.get('notify', ()):
+            if 'heartbeat' in notify:
+                self.last_heartbeat = int(notify['heartbeat'])
+            else:
+                logger.warning(f"Streamer notification: {notify}")
+        for item in data.get('data', ()):
+            if item.get('timestamp'):
+                self.last_data_time = max(self.last_data_time or 0, int(item['timestamp']))
+            await self._dispatch(item)
+
+    async def _read(self, websocket, connection):
+        error = None
+        try:
+            async for message in websocket:
+                await self._handle(message)
+        except websockets.ConnectionClosed as err:
+            error = err
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            logger.exception("Streamer reader failed")
+            error = err
+        finally:
+            if not connection.done():
+                connection.set_result(error)
+            for future in list(self._pending.values()):
+                if not future.done():
+                    future.set_exception(SchwabStreamError("Streamer connection closed"))
+
+    async def _watch(self, websocket, connection):
+        while not connection.done():
+            await asyncio.sleep(self.heartbeat_timeout / 4)
+            if time.monotonic() - self.last_message > self.heartbeat_timeout:
+                logger.warning(f"No streamer message for {self.heartbeat_timeout}s; closing the connection")
+                await websocket.close()
+                return
+
+    async def wait_closed(self):
+        """
+        Waits until the streamer stops for good, after stop() or when reconnecting
+        is disabled or gives up; returns the error that ended it, if any.
+        """
+        return await asyncio.shield(self._closed) if self._closed is not None else None
+
+    async def stop(self):
+        """
+        Stops reconnecting, logs out and closes the connection.
+        """
+        self._stopping = True
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+        if self.websocket is None:
+            return
+        try:
+            await self._send('ADMIN', 'LOGOUT')
+        except SchwabStreamError:
+            pass
+        await self._disconnect()
+        self._finish()
+        self.websocket = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
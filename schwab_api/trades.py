@@ -1,6 +1,7 @@
-import requests
 import logging
 from .strategies import Strategies
+from .session import SchwabSession
+from .utils import handle_response
 
 logger = logging.getLogger(__name__)
 '''
@@ -8,8 +9,9 @@ Object for placing trades on Charles Schwab.
 
 '''
 class Trader:
-    def __init__(self, auth, override_base_url=None, override_paper_account=None):
+    def __init__(self, auth, override_base_url=None, override_paper_account=None, session=None):
         self.auth = auth
+        self.session = session if session is not None else SchwabSession()
         if override_base_url is not None:
             self.base_url = override_base_url
         else:
@@ -26,6 +28,15 @@ class Trader:
                                'NET_DEBIT','OCO', 'TRAILING_STOP_LIMIT']
         self.strategies = Strategies(self.auth)
 
+    def _request(self, method, url, description, **kwargs):
+        """
+        Send an authenticated request and return the decoded JSON body.
+
+        :raises SchwabAPIError: Typed error if the request fails after retries
+        """
+        response = self.session.request(method, url, headers=self.auth.get_headers(), **kwargs)
+        return handle_response(response, description)
+
     def _set_paper_account(self):
         """
         Set the account type to either paper or live.
@@ -33,9 +44,9 @@ class Trader:
         self.is_paper_account = self.auth.get_accType()
         logger.info(f"Set account to {'paper' if self.is_paper_account else 'live'}")
 
-    def place_order(self, account_id, asset_type='OPTION', trading_strategy='buy_market_stock',  **kwargs):
+    def _build_order_request(self, account_id, asset_type, trading_strategy, **kwargs):
         """
-        Place an order for a specific trading strategy and asset type.
+        Generate the order data for a trading strategy and return the order URL.
         """
         self._set_paper_account()
         
@@ -82,19 +93,16 @@ class Trader:
         else:
             self.base_url = 'https://api.schwabapi.com/trader/v1/accounts'
         
-        url = f"{self.base_url}/{account_id}/orders"
-        headers = self.auth.get_headers()
-        try:
-            response = requests.post(url, headers=headers, json=self.order_data)
-            response.raise_for_status()
-            logger.info(f"Placed order for account ID: {account_id}")
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while placing order: {http_err}")
-            raise SystemExit(f"HTTP error occurred while placing order: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while placing order: {err}")
-            raise SystemExit(f"An error occurred while placing order: {err}")
+        return f"{self.base_url}/{account_id}/orders"
+
+    def place_order(self, account_id, asset_type='OPTION', trading_strategy='buy_market_stock',  **kwargs):
+        """
+        Place an order for a specific trading strategy and asset type.
+        """
+        url = self._build_order_request(account_id, asset_type, trading_strategy, **kwargs)
+        data = self._request('POST', url, "placing order", json=self.order_data)
+        logger.info(f"Placed order for account ID: {account_id}")
+        return data
 
     def get_order_status(self, account_id, order_id):
 
@@ -104,10 +112,7 @@ class Trader:
             self.base_url = 'https://api.schwabapi.com/trader/v1/accounts'
         
         url = f"{self.base_url}/{account_id}/orders/{order_id}"
-        headers = self.auth.get_headers()
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return self._request('GET', url, "retrieving order status")
 
     # Private methods for Buy Market: Stock, Conditional orders, and forex
 
@@ -338,18 +343,9 @@ class Trader:
         :return: JSON response containing account information
         """
         url = f"{self.base_url}/accounts/{account_id}"
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            logger.info(f"Retrieved account info for account ID: {account_id}")
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while retrieving account info: {http_err}")
-            raise SystemExit(f"HTTP error occurred while retrieving account info: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while retrieving account info: {err}")
-            raise SystemExit(f"An error occurred while retrieving account info: {err}")
+        data = self._request('GET', url, "retrieving account info")
+        logger.info(f"Retrieved account info for account ID: {account_id}")
+        return data
 
     def get_all_accounts(self):
         """
@@ -358,18 +354,9 @@ class Trader:
         :return: JSON response containing all account information
         """
         url = f"{self.base_url}/accounts/"
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            logger.info("Retrieved all account info")
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while retrieving all accounts: {http_err}")
-            raise SystemExit(f"HTTP error occurred while retrieving all accounts: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while retrieving all accounts: {err}")
-            raise SystemExit(f"An error occurred while retrieving all accounts: {err}")
+        data = self._request('GET', url, "retrieving all accounts")
+        logger.info("Retrieved all account info")
+        return data
 
     def get_all_accountIDs(self):
         """
@@ -378,18 +365,9 @@ class Trader:
         :return: JSON response containing all account IDs
         """
         url = f"{self.base_url}/accounts/accountNumbers"
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            logger.info("Retrieved all account IDs")
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while retrieving account IDs: {http_err}")
-            raise SystemExit(f"HTTP error occurred while retrieving account IDs: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while retrieving account IDs: {err}")
-            raise SystemExit(f"An error occurred while retrieving account IDs: {err}")
+        data = self._request('GET', url, "retrieving account IDs")
+        logger.info("Retrieved all account IDs")
+        return data
 
     def get_all_transactions(self, account_id):
         """
@@ -399,18 +377,9 @@ class Trader:
         :return: JSON response containing all transactions for the account
         """
         url = f"{self.base_url}/accounts/{account_id}/transactions"
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            logger.info(f"Retrieved all transactions for account ID: {account_id}")
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while retrieving transactions: {http_err}")
-            raise SystemExit(f"HTTP error occurred while retrieving transactions: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while retrieving transactions: {err}")
-            raise SystemExit(f"An error occurred while retrieving transactions: {err}")
+        data = self._request('GET', url, "retrieving transactions")
+        logger.info(f"Retrieved all transactions for account ID: {account_id}")
+        return data
 
     def get_transaction(self, account_id, transaction_id):
         """
@@ -421,18 +390,9 @@ class Trader:
         :return: JSON response containing transaction details
         """
         url = f"{self.base_url}/accounts/{account_id}/transactions/{transaction_id}"
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            logger.info(f"Retrieved transaction details for transaction ID: {transaction_id}")
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(f"HTTP error occurred while retrieving transaction: {http_err}")
-            raise SystemExit(f"HTTP error occurred while retrieving transaction: {http_err}")
-        except Exception as err:
-            logger.error(f"An error occurred while retrieving transaction: {err}")
-            raise SystemExit(f"An error occurred while retrieving transaction: {err}")
+        data = self._request('GET', url, "retrieving transaction")
+        logger.info(f"Retrieved transaction details for transaction ID: {transaction_id}")
+        return data
 
     def get_user_preferences(self):
         """
@@ -441,15 +401,8 @@ class Trader:
         :return: JSON response containing user preferences
         """
         url = f"{self.base_url}/userPreferences"
-        headers = self.auth.get_headers()
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            raise SystemExit(f"HTTP error occurred while retrieving user preferences: {http_err}")
-        except Exception as err:
-            raise SystemExit(f"An error occurred while retrieving user preferences: {err}")
+        data = self._request('GET', url, "retrieving user preferences")
+        return data
 
     '''def set_trade_environment(self, trades_object, is_paper):
         """
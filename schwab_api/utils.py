@@ -1,14 +1,42 @@
-import requests
+import inspect
 import logging
+from schwab_api.exceptions import SchwabAPIError, error_for_status
+from schwab_api.resilience import parse_retry_after
 
 logger = logging.getLogger(__name__)
 
-def handle_response(response):
+def require_sync(client, method, owner):
+    """
+    Raises TypeError if ``client.method`` is a coroutine function.
+
+    Helpers that call a client from worker threads cannot use AsyncMarketData;
+    without this check they would silently receive coroutines.
+    """
+    if client is not None and inspect.iscoroutinefunction(getattr(client, method, None)):
+        raise TypeError(f"{owner} calls {method} synchronously and needs MarketData, "
+                        f"not {type(client).__name__}")
+
+def handle_response(response, description="processing request"):
+    """
+    Raises a typed SchwabHTTPError for error statuses and returns the decoded JSON body.
+
+    :param response: requests.Response or AsyncResponse
+    :param description: What the call was doing, used in the error message
+    :return: Decoded JSON body, or None for an empty body
+    """
+    status_code = response.status_code
+    if status_code >= 400:
+        body = response.text
+        method = getattr(getattr(response, 'request', None), 'method', None)
+        message = f"HTTP {status_code} error occurred while {description}: {body[:500]}"
+        logger.error(message)
+        raise error_for_status(status_code)(message, status_code=status_code, url=str(response.url),
+                                            method=method, body=body,
+                                            retry_after=parse_retry_after(response.headers.get('Retry-After')))
+    logger.info("Success")
+    if not response.content:
+        return None
     try:
-        response.raise_for_status()
-        logger.info("Success")
-    except requests.exceptions.HTTPError as err:
-        # Handle specific status codes if needed
-        logger.error(f"An error occurred while placing order: {err}")
-        raise SystemExit(err)   
-    return response.json()
+        return response.json()
+    except ValueError as err:
+        raise SchwabAPIError(f"Invalid JSON received while {description}: {err}") from err
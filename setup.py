@@ -23,6 +23,9 @@ setup(
         'blinker==1.4',
         'selenium-wire',
     ],
+    extras_require={
+        'async': ['aiohttp'],
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',
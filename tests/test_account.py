@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch
 from schwab_api.account import Account
+from schwab_api.exceptions import SchwabAPIError
 
 class TestAccount(unittest.TestCase):
     def setUp(self):
@@ -160,14 +161,14 @@ class TestAccount(unittest.TestCase):
         """
         A description of the entire function, its parameters, and its return types.
         """
-        with self.assertRaises(SystemExit):
+        with self.assertRaises(SchwabAPIError):
             self.account.get_account_info('invalid_account_id')
 
     def test_get_transaction_invalid_transaction(self):
         """
         Test case for the `get_transaction` method of the `Account` class.
 
-        This test case verifies that the `get_transaction` method raises a `SystemExit` exception when an invalid transaction ID is provided.
+        This test case verifies that the `get_transaction` method raises a `SchwabAPIError` exception when an invalid transaction ID is provided.
 
         Parameters:
             self (TestAccount): The test case instance.
@@ -175,7 +176,7 @@ class TestAccount(unittest.TestCase):
         Returns:
             None
         """
-        with self.assertRaises(SystemExit):
+        with self.assertRaises(SchwabAPIError):
             self.account.get_transaction('account_id', 'invalid_transaction_id')
 
 if __name__ == '__main__':
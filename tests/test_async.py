@@ -0,0 +1,134 @@
+import asyncio
+import inspect
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+from schwab_api.async_session import AsyncResponse, AsyncTokenProvider, _clean_params, aiohttp
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsyncClients(unittest.TestCase):
+    def setUp(self):
+        self.auth = MagicMock()
+        self.auth.token = 'token'
+        self.auth.refresh_token = 'refresh'
+        self.auth.token_expires_at = 0
+
+    def test_clean_params(self):
+        self.assertEqual(_clean_params({'a': None, 'b': True, 'c': 5}), {'b': 'true', 'c': 5})
+
+    def test_token_provider_refreshes_once(self):
+        self.auth.token = None
+
+        def refresh():
+            self.auth.token = 'fresh'
+
+        self.auth.get_headers.side_effect = refresh
+        provider = AsyncTokenProvider(self.auth)
+
+        async def run():
+            return await asyncio.gather(*[provider.get_headers() for _ in range(10)])
+
+        headers = asyncio.run(run())
+        self.assertEqual(self.auth.get_headers.call_count, 1)
+        self.assertTrue(all(h == {'Authorization': 'Bearer fresh'} for h in headers))
+
+    def test_get_quotes_is_awaitable(self):
+        from schwab_api.async_market_data import AsyncMarketData
+        payload = {'AAPL': {'quote': {'lastPrice': 1.0}, 'reference': {'cusip': 'x'}}}
+        session = MagicMock()
+        session.get = AsyncMock(return_value=AsyncResponse(200, 'OK', {}, json.dumps(payload).encode(), ''))
+        market_data = AsyncMarketData(self.auth, session=session)
+        df = asyncio.run(market_data.get_quotes(['AAPL']))
+        self.assertEqual(df['symbol'].tolist(), ['AAPL'])
+        self.assertEqual(session.get.call_args.kwargs['params']['symbols'], 'AAPL')
+
+    def test_place_order_is_awaitable(self):
+        from schwab_api.async_trades import AsyncTrader
+        self.auth.get_accType.return_value = False
+        session = MagicMock()
+        session.request = AsyncMock(return_value=AsyncResponse(200, 'OK', {}, b'{"order": "placed"}', ''))
+        trader = AsyncTrader(self.auth, session=session)
+        response = asyncio.run(trader.place_order('123', asset_type='EQUITY', trading_strategy='buy_market_stock',
+                                                  symbol='AAPL', quantity=1))
+        self.assertEqual(response, {'order': 'placed'})
+        self.assertTrue(session.request.call_args.args[1].endswith('/accounts/123/orders'))
+
+    def test_cancelled_trial_releases_the_circuit(self):
+        from schwab_api.async_session import AsyncSchwabSession
+        from schwab_api.exceptions import SchwabConnectionError
+        from schwab_api.resilience import CircuitBreaker, CircuitBreakerRegistry, RetryPolicy
+        url = 'https://api.schwabapi.com/marketdata/v1/quotes'
+        session = AsyncSchwabSession(rate_limit=False, retry_policy=RetryPolicy(max_retries=0),
+                                     circuit_breakers=CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=0))
+        breaker = session.circuit_breakers.get(url)
+        breaker.record_failure()
+
+        class Hanging:
+            async def __aenter__(self):
+                await asyncio.sleep(60)
+
+            async def __aexit__(self, *args):
+                pass
+
+        client = MagicMock()
+        session._get_session = lambda: client
+
+        async def run():
+            client.request.return_value = Hanging()
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(session.get(url), 0.01)
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            client.request.side_effect = aiohttp.ClientPayloadError('truncated')
+            with self.assertRaises(SchwabConnectionError):
+                await session.get(url)
+
+        asyncio.run(run())
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+class TestAsyncMarketDataSurface(unittest.TestCase):
+    def setUp(self):
+        from schwab_api.async_market_data import AsyncMarketData
+        self.market_data = AsyncMarketData(MagicMock(), session=MagicMock())
+
+    def test_iter_option_chains_is_rejected(self):
+        with self.assertRaisesRegex(TypeError, 'get_option_chains_by_expiration'):
+            self.market_data.iter_option_chains('AAPL', 'ALL')
+        self.market_data.session.get.assert_not_called()
+
+    def test_public_surface_is_listed(self):
+        from schwab_api.async_market_data import AsyncMarketData
+        from schwab_api.market_data import MarketData
+        public = {name for name, member in vars(MarketData).items() if not name.startswith('_') and callable(member)}
+        listed = set(AsyncMarketData.ASYNC_METHODS) | set(AsyncMarketData.SYNC_ONLY_METHODS)
+        # close only exists on the async client
+        self.assertEqual(public, listed - {'close'})
+        for name in AsyncMarketData.ASYNC_METHODS:
+            method = getattr(AsyncMarketData, name)
+            self.assertTrue(inspect.iscoroutinefunction(method) or inspect.isasyncgenfunction(method), name)
+        for name in AsyncMarketData.SYNC_ONLY_METHODS:
+            with self.assertRaises(TypeError):
+                getattr(self.market_data, name)(['AAPL'])
+        self.market_data.session.get.assert_not_called()
+
+    def test_signatures_match_market_data(self):
+        from schwab_api.async_market_data import AsyncMarketData
+        from schwab_api.market_data import MarketData
+        for name in AsyncMarketData.ASYNC_METHODS:
+            if name != 'close':
+                self.assertEqual(list(inspect.signature(getattr(AsyncMarketData, name)).parameters),
+                                 list(inspect.signature(getattr(MarketData, name)).parameters), name)
+
+    def test_sync_helpers_reject_async_market_data(self):
+        from schwab_api.history_store import CandleStore
+        from schwab_api.resample import market_sessions
+        from schwab_api.scanner import OptionChainScanner
+        with self.assertRaises(TypeError):
+            OptionChainScanner(self.market_data)
+        with self.assertRaises(TypeError):
+            CandleStore('unused', self.market_data)
+        with self.assertRaises(TypeError):
+            market_sessions(self.market_data, ['2024-01-02'])
+
+
+if __name__ == '__main__':
+    unittest.main()
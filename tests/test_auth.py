@@ -1,5 +1,6 @@
 import unittest
 from schwab_api.auth import SchwabAuth
+from schwab_api.exceptions import SchwabAPIError
 
 class TestSchwabAuth(unittest.TestCase):
     
@@ -73,9 +74,9 @@ class TestSchwabAuth(unittest.TestCase):
         Test the `refresh` method of the `SchwabAuth` class with an invalid token.
 
         This test case verifies that the `refresh` method of the `SchwabAuth` class
-        raises a `SystemExit` exception when the token is invalid. It sets the `token`
+        raises a `SchwabAPIError` exception when the token is invalid. It sets the `token`
         attribute of the `self.auth` instance to an invalid value, and then calls the
-        `refresh` method. The test asserts that the `refresh` method raises a `SystemExit`
+        `refresh` method. The test asserts that the `refresh` method raises a `SchwabAPIError`
         exception.
 
         Parameters:
@@ -85,7 +86,7 @@ class TestSchwabAuth(unittest.TestCase):
             None
         """
         self.auth.token = 'invalid'
-        with self.assertRaises(SystemExit):
+        with self.assertRaises(SchwabAPIError):
             self.auth.refresh()
 
 if __name__ == '__main__':
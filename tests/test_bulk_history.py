@@ -0,0 +1,104 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+from schwab_api.bulk_history import BulkHistoryJob
+from schwab_api.exceptions import SchwabNotFoundError
+from schwab_api.history_store import MmapCandleStore
+
+DAY = 86_400_000
+T0 = 1704430800000
+
+def fake_range(symbol, start_date, end_date, **kwargs):
+    if symbol == 'BAD':
+        raise SchwabNotFoundError("no such symbol")
+    times = np.arange(T0, T0 + 10 * DAY, DAY)
+    return pd.DataFrame({'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 5, 'datetime': times})
+
+class TestBulkHistoryJob(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.market_data = MagicMock()
+        self.market_data.get_historical_range.side_effect = fake_range
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def job(self, symbols, **kwargs):
+        return BulkHistoryJob(self.market_data, self.root, symbols, T0, T0 + 9 * DAY, max_workers=3, **kwargs)
+
+    def test_failures_are_recorded_and_run_continues(self):
+        seen = []
+        job = self.job(['AAPL', 'BAD', 'MSFT'], progress=lambda symbol, error, stats: seen.append(symbol))
+        stats = job.run()
+        self.assertEqual((stats['completed'], stats['failed'], stats['rows']), (2, 1, 20))
+        self.assertGreater(stats['bytes'], 0)
+        self.assertIn('SchwabNotFoundError', job.failures['BAD'])
+        self.assertEqual(sorted(seen), ['AAPL', 'BAD', 'MSFT'])
+        with open(job.manifest_path) as fh:
+            manifest = json.load(fh)
+        self.assertEqual(sorted(manifest['done']), ['AAPL', 'MSFT'])
+        self.assertEqual(list(manifest['failed']), ['BAD'])
+        self.assertTrue(os.path.exists(job.store.path('AAPL', 'daily_1')))
+
+    def test_resume_skips_finished_symbols(self):
+        self.job(['AAPL', 'BAD']).run()
+        self.market_data.get_historical_range.reset_mock()
+        job = self.job(['AAPL', 'BAD', 'MSFT'])
+        self.assertEqual(job.pending(), ['BAD', 'MSFT'])
+        stats = job.run()
+        self.assertEqual(stats['skipped'], 1)
+        fetched = {c.args[0] for c in self.market_data.get_historical_range.call_args_list}
+        self.assertEqual(fetched, {'BAD', 'MSFT'})
+
+    def test_open_end_job_resumes(self):
+        manifest = os.path.join(self.root, 'manifest.json')
+
+        def interrupt(symbol, error, stats):
+            raise KeyboardInterrupt
+
+        job = BulkHistoryJob(self.market_data, self.root, ['AAPL', 'MSFT', 'SPY'], T0, max_workers=1,
+                             progress=interrupt)
+        with self.assertRaises(KeyboardInterrupt):
+            job.run()
+        with open(job.manifest_path) as fh:
+            finished = list(json.load(fh)['done'])
+        self.assertEqual(len(finished), 1)
+
+        rerun = BulkHistoryJob(self.market_data, self.root, ['AAPL', 'MSFT', 'SPY'], T0)
+        self.assertEqual(rerun.manifest_path, job.manifest_path)
+        self.assertNotIn(finished[0], rerun.pending())
+        self.assertEqual(rerun.run()['skipped'], 1)
+        self.assertEqual(rerun.pending(), [])
+
+        # an explicit manifest path is accepted on rerun as well
+        BulkHistoryJob(self.market_data, self.root, ['AAPL'], T0, manifest=manifest).run()
+        self.assertEqual(BulkHistoryJob(self.market_data, self.root, ['AAPL'], T0, manifest=manifest).pending(), [])
+
+    def test_bytes_count_only_growth_of_the_store(self):
+        first = self.job(['AAPL']).run()['bytes']
+        other = BulkHistoryJob(self.market_data, self.root, ['AAPL'], T0, T0 + 12 * DAY)
+        # the fake returns the same candles, so the wider window adds nothing to the stored series
+        self.assertLess(other.run()['bytes'], first)
+
+    def test_store_market_data_must_match(self):
+        store = MmapCandleStore(self.root)
+        job = BulkHistoryJob(self.market_data, self.root, ['AAPL'], T0, store=store)
+        self.assertIs(job.store.market_data, self.market_data)
+        with self.assertRaises(ValueError):
+            BulkHistoryJob(MagicMock(), self.root, ['AAPL'], T0, store=store)
+        self.assertIs(BulkHistoryJob(None, self.root, ['AAPL'], T0, store=store).store, store)
+
+    def test_manifest_of_other_job_is_rejected(self):
+        manifest = os.path.join(self.root, 'manifest.json')
+        self.job(['AAPL'], manifest=manifest).run()
+        other = BulkHistoryJob(self.market_data, self.root, ['AAPL'], T0, T0 + 5 * DAY, manifest=manifest)
+        with self.assertRaises(ValueError):
+            other.run()
+
+if __name__ == '__main__':
+    unittest.main()
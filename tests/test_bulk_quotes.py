@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import MagicMock
+from schwab_api.helper import HelperFuncs
+from schwab_api.market_data import MarketData
+
+def quote_response(symbols):
+    response = MagicMock()
+    response.status_code = 200
+    response.content = b'{}'
+    # the server returns symbols in its own order
+    response.json.return_value = {symbol: {'quote': {'lastPrice': float(len(symbol))}, 'reference': {'cusip': symbol}}
+                                  for symbol in sorted(symbols)}
+    return response
+
+class TestBulkQuotes(unittest.TestCase):
+    def test_chunk_symbols_balances_batches(self):
+        symbols = [f"S{i}" for i in range(1001)]
+        batches = HelperFuncs._chunk_symbols(symbols, 500, 10000)
+        self.assertEqual([len(b) for b in batches], [334, 334, 333])
+        self.assertEqual(sum(batches, []), symbols)
+
+    def test_chunk_symbols_respects_encoded_length(self):
+        batches = HelperFuncs._chunk_symbols(['$SPX', 'AAPL', 'MSFT', 'IBM'], 500, 12)
+        for batch in batches:
+            self.assertLessEqual(len(','.join(batch).replace(',', '%2C').replace('$', '%24')), 12)
+        self.assertEqual(sum(batches, []), ['$SPX', 'AAPL', 'MSFT', 'IBM'])
+
+    def test_get_quotes_bulk_preserves_order(self):
+        session = MagicMock()
+        session.get.side_effect = lambda url, headers, params: quote_response(params['symbols'].split(','))
+        market_data = MarketData(MagicMock(), session=session)
+        symbols = [f"SYM{i}" for i in range(25, 0, -1)] + ['SYM3']
+        df = market_data.get_quotes_bulk(symbols, batch_size=10, max_workers=3)
+        self.assertEqual(df['symbol'].tolist(), symbols[:-1])
+        self.assertEqual(session.get.call_count, 3)
+        self.assertEqual([b['symbols'] for b in df.attrs['batches']], [9, 9, 7])
+        self.assertTrue(all(b['latency'] >= 0 for b in df.attrs['batches']))
+
+    def test_get_quotes_bulk_keeps_batch_errors(self):
+        def respond(url, headers, params):
+            symbols = params['symbols'].split(',')
+            response = quote_response([symbol for symbol in symbols if symbol != 'BAD'])
+            if 'BAD' in symbols:
+                response.json.return_value['errors'] = {'invalidSymbols': ['BAD']}
+            return response
+
+        session = MagicMock()
+        session.get.side_effect = respond
+        market_data = MarketData(MagicMock(), session=session)
+        df = market_data.get_quotes_bulk(['AAPL', 'BAD', 'MSFT', 'IBM'], batch_size=2, max_workers=2)
+        self.assertEqual(df['symbol'].tolist(), ['AAPL', 'MSFT', 'IBM'])
+        self.assertEqual(df.attrs['errors'], {'invalidSymbols': ['BAD']})
+        self.assertEqual(len(df.attrs['batches']), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+from schwab_api.cache import MISSING, MarketDataCache, TTLCache, history_ttl, make_key
+from schwab_api.market_data import MarketData
+
+class TestTTLCache(unittest.TestCase):
+    def test_make_key_normalizes_params(self):
+        self.assertEqual(make_key('url', {'b': 1, 'a': ' x ', 'c': None}),
+                         make_key('url', {'a': 'x', 'b': 1}))
+        hash(make_key('url', {'symbols': ['AAPL', 'MSFT']}))
+
+    def test_expiry_and_stats(self):
+        cache = TTLCache(maxsize=2, default_ttl=60)
+        cache.set('a', 1, ttl=0.01)
+        time.sleep(0.02)
+        self.assertIs(cache.get('a'), MISSING)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('b'), 2)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['expirations']), (1, 1, 1))
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIs(cache.get('b'), MISSING)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_history_ttl_past_window_lasts_until_end_of_day(self):
+        past = (time.time() - 7 * 86400) * 1000
+        self.assertGreater(history_ttl({'endDate': past, 'frequencyType': 'minute', 'frequency': 1}), 60)
+        self.assertLessEqual(history_ttl({'frequencyType': 'minute', 'frequency': 5}), 300)
+
+class TestMarketDataCaching(unittest.TestCase):
+    def setUp(self):
+        self.auth = MagicMock()
+        self.session = MagicMock()
+        response = self.session.get.return_value
+        response.status_code = 200
+        response.content = b'{}'
+        response.json.return_value = {'AAPL': {'quote': {'lastPrice': 1.0}, 'reference': {'cusip': 'x'}}}
+
+    def test_quotes_served_from_cache(self):
+        market_data = MarketData(self.auth, session=self.session)
+        first = market_data.get_quotes(['AAPL'])
+        first['symbol'] = 'changed'
+        second = market_data.get_quotes('AAPL')
+        self.assertEqual(self.session.get.call_count, 1)
+        self.assertEqual(second['symbol'].tolist(), ['AAPL'])
+        self.assertEqual(market_data.cache.stats()['quotes']['hits'], 1)
+
+    def test_zero_ttl_disables_endpoint(self):
+        market_data = MarketData(self.auth, session=self.session, cache=MarketDataCache(ttls={'quotes': 0}))
+        market_data.get_quotes(['AAPL'])
+        market_data.get_quotes(['AAPL'])
+        self.assertEqual(self.session.get.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
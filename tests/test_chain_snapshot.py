@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+import pandas as pd
+from schwab_api.chain_snapshot import ChainSnapshotStore
+from schwab_api.option_chain import OptionChain
+
+def chain(rows):
+    return pd.DataFrame({
+        'symbol': [r[0] for r in rows],
+        'putCall': 'CALL',
+        'exp_date': '2024-01-19:5',
+        'strikePrice': [r[1] for r in rows],
+        'bid': [r[2] for r in rows],
+        'ask': [r[3] for r in rows],
+        'delta': [r[4] for r in rows],
+    })
+
+class TestChainSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.store = ChainSnapshotStore(columns=('bid', 'ask', 'mark', 'delta'))
+        self.first = chain([('A 100', 100.0, 1.0, 1.1, 0.5), ('A 105', 105.0, 0.5, 0.6, 0.3),
+                            ('A 110', 110.0, 0.2, 0.3, np.nan)])
+
+    def test_first_snapshot_is_all_added(self):
+        diff = self.store.update('A', self.first)
+        self.assertEqual(len(diff.added), 3)
+        self.assertEqual(len(diff.changed), 0)
+        self.assertIn('A', self.store)
+
+    def test_diff_reports_added_removed_and_changed(self):
+        self.store.update('A', self.first)
+        second = chain([('A 100', 100.0, 1.0, 1.1, 0.5), ('A 105', 105.0, 0.55, 0.6, 0.3),
+                        ('A 110', 110.0, 0.2, 0.3, 0.1), ('A 115', 115.0, 0.1, 0.2, 0.05)])
+        second = second.iloc[::-1].reset_index(drop=True)
+        diff = self.store.update('A', second.iloc[:3])
+        self.assertEqual(diff.added.index.tolist(), ['A 115'])
+        self.assertEqual(diff.removed.index.tolist(), ['A 100'])
+        self.assertEqual(sorted(diff.changed.index), ['A 105', 'A 110'])
+        self.assertEqual(diff.changed.loc['A 105', 'bid'], 0.55)
+        self.assertTrue(diff.changed_mask.loc['A 105', 'bid'])
+        self.assertFalse(diff.changed_mask.loc['A 105', 'delta'])
+        self.assertTrue(diff.changed_mask.loc['A 110', 'delta'])
+        self.assertEqual(list(diff.changed.columns), ['bid', 'ask', 'delta'])
+        self.assertEqual(diff.unchanged, 0)
+
+    def test_unchanged_chain_and_tolerance(self):
+        self.store.update('A', self.first)
+        self.assertTrue(self.store.update('A', self.first.copy()).empty)
+        store = ChainSnapshotStore(columns=('bid',), tolerance=0.01)
+        store.update('A', self.first)
+        nudged = self.first.copy()
+        nudged['bid'] += 0.005
+        self.assertTrue(store.update('A', nudged).empty)
+
+    def test_accepts_option_chain(self):
+        self.store.update('A', OptionChain(self.first))
+        diff = self.store.update('A', self.first)
+        self.assertTrue(diff.empty)
+        self.assertEqual(diff.unchanged, 3)
+
+if __name__ == '__main__':
+    unittest.main()
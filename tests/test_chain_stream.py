@@ -0,0 +1,77 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+from schwab_api.chain_stream import ChainStreamParser
+from schwab_api.exceptions import SchwabAPIError
+from schwab_api.market_data import MarketData
+
+def make_chain():
+    def contract(side, strike):
+        return {'putCall': side, 'symbol': f'SPX "{side}" {strike}\\x', 'strikePrice': strike, 'bid': 1.5,
+                'totalVolume': 3, 'inTheMoney': True, 'optionDeliverablesList': [{'symbol': '$SPX'}],
+                # brackets inside strings must not confuse the scanner
+                'description': '}]}] weekly' if side == 'CALL' else '{[{[ AM'}
+    return {
+        'symbol': '$SPX', 'status': 'SUCCESS', 'underlying': {'symbol': '$SPX', 'last': 4500.0},
+        'isDelayed': False, 'underlyingPrice': 4500.0,
+        'callExpDateMap': {'2024-01-19:5': {'4500.0': [contract('CALL', 4500.0)],
+                                            '4510.0': [contract('CALL', 4510.0)]},
+                           '2024-01-26:12': {'4500.0': [contract('CALL', 4500.0)]}},
+        'putExpDateMap': {'2024-01-19:5': {'4500.0': [contract('PUT', 4500.0)]}},
+        'numberOfContracts': 4,
+    }
+
+def chunked(text, size):
+    data = text.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+class TestChainStreamParser(unittest.TestCase):
+    def test_matches_full_parse_for_any_chunk_size(self):
+        chain = make_chain()
+        text = json.dumps(chain, indent=1)
+        for size in (1, 2, 7, 64, len(text)):
+            parser = ChainStreamParser(chunked(text, size))
+            expirations = [(side, exp_date, strikes) for side, exp_date, strikes in parser]
+            self.assertEqual([(s, e) for s, e, _ in expirations],
+                             [('CALL', '2024-01-19:5'), ('CALL', '2024-01-26:12'), ('PUT', '2024-01-19:5')])
+            self.assertEqual(expirations[0][2], chain['callExpDateMap']['2024-01-19:5'])
+            self.assertEqual(parser.meta['underlying'], chain['underlying'])
+            self.assertEqual(parser.meta['numberOfContracts'], 4)
+            self.assertIs(parser.meta['isDelayed'], False)
+
+    def test_truncated_body_raises(self):
+        text = json.dumps(make_chain())
+        with self.assertRaises(SchwabAPIError):
+            list(ChainStreamParser(chunked(text[:len(text) // 2], 10)))
+
+    def test_iter_option_chains(self):
+        response = MagicMock()
+        response.status_code = 200
+        response.encoding = None
+        response.iter_content.return_value = chunked(json.dumps(make_chain()), 50)
+        session = MagicMock()
+        session.get.return_value = response
+        market_data = MarketData(MagicMock(), session=session)
+        frames = list(market_data.iter_option_chains('$SPX', 'ALL'))
+        self.assertEqual([len(df) for df in frames], [2, 1, 1])
+        self.assertEqual(frames[2].attrs['exp_date_type'], 'PUT')
+        self.assertEqual(frames[0]['exp_date'].tolist(), ['2024-01-19:5'] * 2)
+        self.assertEqual(frames[0].attrs['underlying']['last'], 4500.0)
+        self.assertTrue(session.get.call_args.kwargs['stream'])
+        response.close.assert_called_once()
+
+    def test_iter_option_chains_closes_error_response(self):
+        response = MagicMock()
+        response.status_code = 500
+        response.headers = {}
+        response.content = b'down'
+        response.text = 'down'
+        session = MagicMock()
+        session.get.return_value = response
+        market_data = MarketData(MagicMock(), session=session)
+        with self.assertRaises(SchwabAPIError):
+            list(market_data.iter_option_chains('$SPX', 'ALL'))
+        response.close.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from schwab_api.coalesce import AsyncSingleFlight, SingleFlight
+from schwab_api.market_data import MarketData
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def work():
+            calls.append(1)
+            release.wait(1)
+            return 'result'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do('key', work))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        while flight.stats()['coalesced'] < 7:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['result'] * 8)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_error_is_shared_and_not_remembered(self):
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do('key', lambda: (_ for _ in ()).throw(ValueError('boom')))
+        self.assertEqual(flight.do('key', lambda: 2), 2)
+
+    def test_async_calls_share_one_execution(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'result'
+
+        async def run():
+            return await asyncio.gather(*[flight.do('key', work) for _ in range(5)])
+
+        self.assertEqual(asyncio.run(run()), ['result'] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_cancelled_leader_does_not_fail_followers(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return 'result'
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do('key', work))
+            await asyncio.sleep(0)
+            followers = [asyncio.ensure_future(flight.do('key', work)) for _ in range(2)]
+            await asyncio.sleep(0)
+            leader.cancel()
+            results = await asyncio.gather(*followers, return_exceptions=True)
+            return leader.cancelled(), results, flight.in_flight()
+
+        cancelled, results, in_flight = asyncio.run(run())
+        self.assertTrue(cancelled)
+        self.assertEqual(results, ['result', 'result'])
+        self.assertEqual((len(calls), in_flight), (1, 0))
+
+    def test_market_data_coalesces_identical_chain_requests(self):
+        session = MagicMock()
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(1)
+            response = MagicMock()
+            response.status_code = 200
+            response.content = b'{}'
+            response.json.return_value = {'expirationList': [{'expirationDate': '2024-01-19'}]}
+            return response
+
+        session.get.side_effect = slow_get
+        market_data = MarketData(MagicMock(), session=session)
+        threads = [threading.Thread(target=market_data.get_option_expiration_chain, args=('AAPL',))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while market_data.inflight.stats()['coalesced'] < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(session.get.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import pandas as pd
+from schwab_api.greeks import bs_greeks, bs_price, implied_volatility, norm_cdf, revalue_chain
+
+class TestGreeks(unittest.TestCase):
+    def test_reference_price(self):
+        # Hull, Options Futures and Other Derivatives, example 15.6
+        call = bs_price(42, 40, 0.5, 0.10, 0.20, True)
+        put = bs_price(42, 40, 0.5, 0.10, 0.20, False)
+        self.assertAlmostEqual(float(call), 4.76, places=2)
+        self.assertAlmostEqual(float(put), 0.81, places=2)
+
+    def test_norm_cdf(self):
+        np.testing.assert_allclose(norm_cdf([-1.96, 0.0, 1.96]), [0.0249979, 0.5, 0.9750021], atol=1e-7)
+
+    def test_greeks_match_finite_differences(self):
+        args = dict(strike=np.array([90.0, 100.0, 110.0]), t=0.25, rate=0.03, vol=0.25, q=0.01)
+        for is_call in (True, False):
+            greeks = bs_greeks(100.0, is_call=is_call, **args)
+            h = 1e-3
+            up = bs_price(100.0 + h, is_call=is_call, **args)
+            down = bs_price(100.0 - h, is_call=is_call, **args)
+            np.testing.assert_allclose(greeks['delta'], (up - down) / (2 * h), atol=1e-6)
+            np.testing.assert_allclose(greeks['gamma'], (up - 2 * greeks['price'] + down) / h ** 2, atol=1e-4)
+            vega = (bs_price(100.0, is_call=is_call, **{**args, 'vol': 0.25 + h})
+                    - bs_price(100.0, is_call=is_call, **{**args, 'vol': 0.25 - h})) / (2 * h) / 100
+            np.testing.assert_allclose(greeks['vega'], vega, atol=1e-6)
+
+    def test_greeks_broadcast_is_call(self):
+        greeks = bs_greeks(42.0, 40.0, 0.5, 0.1, 0.2, [True, False])
+        np.testing.assert_allclose(greeks['price'], bs_price(42.0, 40.0, 0.5, 0.1, 0.2, [True, False]))
+        self.assertGreater(greeks['delta'][0], 0)
+        self.assertLess(greeks['delta'][1], 0)
+
+    def test_implied_volatility_round_trip(self):
+        rng = np.random.default_rng(1)
+        n = 2000
+        strike = rng.uniform(50, 150, n)
+        t = rng.uniform(0.01, 2.0, n)
+        vol = rng.uniform(0.05, 1.5, n)
+        is_call = rng.random(n) < 0.5
+        price = bs_price(100.0, strike, t, 0.04, vol, is_call)
+        solved = implied_volatility(price, 100.0, strike, t, 0.04, is_call)
+        # only contracts with meaningful time value can be inverted precisely
+        vega = bs_greeks(100.0, strike, t, 0.04, vol, is_call)['vega']
+        mask = vega > 1e-4
+        np.testing.assert_allclose(solved[mask], vol[mask], atol=1e-5)
+
+    def test_arbitrage_violations_are_nan(self):
+        iv = implied_volatility([0.5, 200.0], 100.0, 50.0, 0.5, 0.0, True)
+        self.assertTrue(np.isnan(iv).all())
+
+    def test_revalue_chain(self):
+        chain = pd.DataFrame({'strikePrice': [95.0, 105.0], 'putCall': ['CALL', 'PUT'],
+                              'daysToExpiration': [30, 30],
+                              'mark': [float(bs_price(100, 95, 30 / 365, 0.05, 0.3, True)),
+                                       float(bs_price(100, 105, 30 / 365, 0.05, 0.3, False))]})
+        chain.attrs['underlying'] = {'underlyingPrice': 100.0, 'interestRate': 5.0}
+        same = revalue_chain(chain)
+        np.testing.assert_allclose(same['bs_iv'], [0.3, 0.3], atol=1e-6)
+        np.testing.assert_allclose(same['bs_price'], chain['mark'], atol=1e-6)
+        moved = revalue_chain(chain, spot=101.0)
+        self.assertGreater(moved.loc[0, 'bs_price'], chain.loc[0, 'mark'])
+        self.assertLess(moved.loc[1, 'bs_price'], chain.loc[1, 'mark'])
+
+    def test_missing_server_volatility_is_nan(self):
+        chain = pd.DataFrame({'strikePrice': [95.0, 105.0, 100.0], 'putCall': ['CALL', 'CALL', 'PUT'],
+                              'daysToExpiration': [30, 30, 30], 'volatility': [-999.0, 30.0, np.nan]})
+        chain.attrs['underlying'] = {'underlyingPrice': 100.0, 'interestRate': 5.0}
+        result = revalue_chain(chain, vol='server')
+        self.assertTrue(result.loc[[0, 2]].isna().all().all())
+        self.assertAlmostEqual(result.loc[1, 'bs_iv'], 0.3)
+        self.assertTrue(np.isfinite(result.loc[1, 'bs_delta']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import numpy as np
+import pandas as pd
+from schwab_api.helper import HelperFuncs
+
+class TestQuoteParser(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            'AAPL': {'assetMainType': 'EQUITY', 'realtime': True, 'ssid': 1,
+                     'quote': {'lastPrice': 190.5, 'bidSize': 3, 'tradeTime': 1700000000000},
+                     'reference': {'cusip': '037833100', 'isShortable': True}},
+            '$SPX': {'assetMainType': 'INDEX', 'realtime': True, 'ssid': 2,
+                     'quote': {'lastPrice': 4500.0, 'tradeTime': 1700000000001, 'newField': 'x'}},
+            'errors': {'invalidSymbols': ['NOPE']},
+        }
+
+    def test_missing_section_and_errors(self):
+        df = HelperFuncs._parse_quotes_to_dataframe(self.data, 'quote,reference')
+        self.assertEqual(df['symbol'].tolist(), ['AAPL', '$SPX'])
+        self.assertEqual(df.loc[0, 'cusip'], '037833100')
+        self.assertTrue(pd.isna(df.loc[1, 'cusip']))
+        self.assertEqual(df.attrs['errors'], {'invalidSymbols': ['NOPE']})
+        self.assertEqual(df.loc[1, 'newField'], 'x')
+
+    def test_typed_columns(self):
+        df = HelperFuncs._parse_quotes_to_dataframe(self.data, ['quote', 'reference'])
+        self.assertEqual(df['lastPrice'].dtype, np.float64)
+        self.assertEqual(df['tradeTime'].dtype, np.int64)
+        # bidSize is missing for $SPX, so it stays a float column with NaN
+        self.assertTrue(np.isnan(df.loc[1, 'bidSize']))
+        self.assertEqual(df['ssid'].dtype, np.int64)
+
+    def test_fixed_schema_per_fields(self):
+        quote_only = HelperFuncs._parse_quotes_to_dataframe(self.data, 'quote')
+        self.assertNotIn('cusip', quote_only.columns)
+        self.assertIn('52WeekHigh', quote_only.columns)
+        extended = HelperFuncs._parse_quotes_to_dataframe(self.data, 'quote,extended')
+        self.assertIn('extended_lastPrice', extended.columns)
+
+    def test_empty_response(self):
+        df = HelperFuncs._parse_quotes_to_dataframe({}, 'quote')
+        self.assertEqual(len(df), 0)
+        self.assertIn('lastPrice', df.columns)
+
+class TestOptionChainParser(unittest.TestCase):
+    def setUp(self):
+        def contract(side, strike):
+            return {'putCall': side, 'symbol': f"AAPL {side[0]}{strike}", 'strikePrice': strike, 'bid': 1.0,
+                    'ask': 1.2, 'delta': 0.5 if side == 'CALL' else -0.5, 'totalVolume': 10,
+                    'inTheMoney': False, 'optionDeliverablesList': [{'symbol': 'AAPL', 'deliverableUnits': 100.0}]}
+        self.chain = {
+            'symbol': 'AAPL', 'status': 'SUCCESS', 'underlyingPrice': 190.0,
+            'underlying': {'symbol': 'AAPL', 'last': 190.0, 'mark': 190.1},
+            'callExpDateMap': {'2024-01-19:5': {'185.0': [contract('CALL', 185.0)], '190.0': [contract('CALL', 190.0)]}},
+            'putExpDateMap': {'2024-01-19:5': {'185.0': [contract('PUT', 185.0)]},
+                              '2024-01-26:12': {'190.0': [contract('PUT', 190.0)]}},
+        }
+
+    def test_frames(self):
+        contracts, underlying = HelperFuncs._optionchain_to_frames(self.chain)
+        self.assertEqual(len(contracts), 4)
+        self.assertEqual(contracts['exp_date_type'].tolist(), ['CALL', 'CALL', 'PUT', 'PUT'])
+        self.assertEqual(contracts['exp_date'].tolist()[-1], '2024-01-26:12')
+        self.assertEqual(contracts['strikePrice'].dtype, np.float64)
+        self.assertEqual(contracts['totalVolume'].dtype, np.int64)
+        self.assertIsInstance(contracts.loc[0, 'optionDeliverablesList'], list)
+        self.assertEqual(len(underlying), 1)
+        self.assertEqual(underlying.loc[0, 'last'], 190.0)
+        self.assertEqual(underlying.loc[0, 'underlyingPrice'], 190.0)
+
+    def test_dataframe_keeps_underlying_in_attrs(self):
+        df = HelperFuncs()._optionchain_to_dataframe(json_data=self.chain)
+        self.assertEqual(df.attrs['underlying']['mark'], 190.1)
+        self.assertNotIn('underlyingPrice', df.columns)
+
+    def test_empty_chain(self):
+        df = HelperFuncs()._optionchain_to_dataframe(json_data={'symbol': 'X', 'status': 'FAILED'})
+        self.assertEqual(len(df), 0)
+        self.assertEqual(df.attrs['underlying']['status'], 'FAILED')
+
+class TestDateFormat(unittest.TestCase):
+    def test_epoch_milliseconds(self):
+        # midnight in New York on 2024-01-05 is 05:00 UTC
+        self.assertEqual(HelperFuncs._date_format('2024-01-05'), 1704430800000)
+        self.assertEqual(HelperFuncs._date_format(1704430800000), 1704430800000)
+        self.assertEqual(HelperFuncs._date_format(pd.Timestamp('2024-01-05 05:00', tz='UTC')), 1704430800000)
+
+class TestCandleParser(unittest.TestCase):
+    def test_exchange_time_index_and_attrs(self):
+        data = {'symbol': 'AAPL', 'empty': False, 'previousClose': 181.18, 'previousCloseDate': 1704344400000,
+                'candles': [{'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 10, 'datetime': 1704465000000},
+                            {'open': 1.5, 'high': 2.5, 'low': 1.0, 'close': 2.0, 'volume': 20, 'datetime': 1704465060000}]}
+        df = HelperFuncs._candles_to_dataframe(data)
+        self.assertEqual(str(df.index.tz), 'America/New_York')
+        self.assertEqual(df.index[0], pd.Timestamp('2024-01-05 09:30', tz='America/New_York'))
+        self.assertEqual(df['volume'].dtype, np.int64)
+        self.assertEqual(df['datetime'].tolist(), [1704465000000, 1704465060000])
+        self.assertEqual(df.attrs['symbol'], 'AAPL')
+        self.assertEqual(df.attrs['previousClose'], 181.18)
+        self.assertEqual(df.attrs['previousCloseDate'], pd.Timestamp('2024-01-04', tz='America/New_York'))
+        self.assertNotIn('symbol', df.columns)
+
+    def test_empty_history(self):
+        df = HelperFuncs._candles_to_dataframe({'symbol': 'AAPL', 'empty': True, 'candles': []})
+        self.assertEqual(len(df), 0)
+        self.assertEqual(list(df.columns), ['open', 'high', 'low', 'close', 'volume', 'datetime'])
+        self.assertIsNone(df.attrs['previousCloseDate'])
+
+if __name__ == '__main__':
+    unittest.main()
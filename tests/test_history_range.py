@@ -0,0 +1,80 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+import numpy as np
+from schwab_api.helper import HelperFuncs
+from schwab_api.market_data import MarketData
+from schwab_api.async_session import AsyncResponse, aiohttp
+
+DAY = 86_400_000
+MINUTE = 60_000
+
+def history_response(params):
+    # one bar every 6 hours inside [startDate, endDate], padded with a bar on each side to overlap neighbours
+    step = 6 * 3600 * 1000
+    first = params['startDate'] - params['startDate'] % step - step
+    times = np.arange(first, params['endDate'] + step + 1, step)
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {'symbol': params['symbol'], 'empty': False, 'candles': [
+        {'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': float(t), 'volume': 10, 'datetime': int(t)} for t in times]}
+    return response
+
+class TestHistoryWindows(unittest.TestCase):
+    def test_minute_windows_follow_day_period_limit(self):
+        windows = HelperFuncs._history_windows(0, 25 * DAY, 'minute', 5)
+        self.assertEqual(windows, [(0, 10 * DAY - 1), (10 * DAY, 20 * DAY - 1), (20 * DAY, 25 * DAY)])
+        self.assertEqual(HelperFuncs._history_windows(0, DAY, 'daily', 1), [(0, DAY)])
+
+    def test_invalid_frequency(self):
+        with self.assertRaises(ValueError):
+            HelperFuncs._history_windows(0, DAY, 'minute', 2)
+        with self.assertRaises(ValueError):
+            HelperFuncs._history_windows(0, DAY, 'hourly', 1)
+
+class TestHistoricalRange(unittest.TestCase):
+    def setUp(self):
+        self.session = MagicMock()
+        self.session.get.side_effect = lambda url, headers, params: history_response(params)
+        self.market_data = MarketData(MagicMock(), session=self.session)
+
+    def test_range_is_split_fetched_and_merged(self):
+        start, end = 1_700_000_000_000, 1_700_000_000_000 + 35 * DAY
+        df = self.market_data.get_historical_range('AAPL', start, end, frequency_type='minute', frequency=1)
+        self.assertEqual(self.session.get.call_count, 4)
+        params = [call.kwargs['params'] for call in self.session.get.call_args_list]
+        self.assertEqual({(p['periodType'], p['frequencyType'], p['frequency']) for p in params}, {('day', 'minute', 1)})
+        self.assertTrue(df['datetime'].is_monotonic_increasing)
+        self.assertFalse(df['datetime'].duplicated().any())
+        self.assertEqual(len(df.attrs['windows']), 4)
+        self.assertEqual(df.attrs['symbol'], 'AAPL')
+        self.assertEqual(str(df.index.tz), 'America/New_York')
+        self.assertEqual(df.index[0].value // 1_000_000, df['datetime'].iloc[0])
+        self.assertEqual(sum(p['endDate'] - p['startDate'] for p in params) + 3, end - start)
+
+    @unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+    def test_async_range(self):
+        from schwab_api.async_market_data import AsyncMarketData
+
+        async def get(url, headers=None, params=None):
+            body = json.dumps(history_response(params).json.return_value).encode()
+            return AsyncResponse(200, 'OK', {}, body, '')
+
+        session = MagicMock()
+        session.get = AsyncMock(side_effect=get)
+        auth = MagicMock()
+        auth.token = 'token'
+        auth.token_expires_at = 0
+        market_data = AsyncMarketData(auth, session=session)
+        df = asyncio.run(market_data.get_historical_range('AAPL', 0, 25 * DAY, frequency_type='minute', frequency=1))
+        self.assertEqual(session.get.call_count, 3)
+        self.assertTrue(df['datetime'].is_monotonic_increasing)
+        self.assertFalse(df['datetime'].duplicated().any())
+
+    def test_start_after_end(self):
+        with self.assertRaises(ValueError):
+            self.market_data.get_historical_range('AAPL', 2 * DAY, DAY)
+
+if __name__ == '__main__':
+    unittest.main()
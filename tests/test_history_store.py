@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+from schwab_api.history_store import CANDLE_DTYPE, CandleStore, MmapCandleStore
+
+DAY = 86_400_000
+T0 = 1704430800000  # 2024-01-05 00:00 New York
+
+def fake_history(symbol, start_date, end_date, **kwargs):
+    times = np.arange(T0 - 100 * DAY, T0 + 100 * DAY, DAY)
+    times = times[(times >= start_date) & (times <= end_date)]
+    return pd.DataFrame({'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': times / DAY, 'volume': 100,
+                         'datetime': times})
+
+class TestCandleStore(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.market_data = MagicMock()
+        self.market_data.get_historical_range.side_effect = fake_history
+        self.store = CandleStore(self.root, self.market_data)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def ranges(self):
+        return [(c.kwargs['start_date'], c.kwargs['end_date'])
+                for c in self.market_data.get_historical_range.call_args_list]
+
+    def test_cached_window_is_not_downloaded_again(self):
+        first = self.store.get('AAPL', T0, T0 + 9 * DAY)
+        self.assertEqual(len(first), 10)
+        again = type(self.store)(self.root, self.market_data).get('AAPL', T0 + 2 * DAY, T0 + 5 * DAY)
+        self.assertEqual(again['datetime'].tolist(), [T0 + i * DAY for i in range(2, 6)])
+        self.assertEqual(self.market_data.get_historical_range.call_count, 1)
+        kwargs = self.market_data.get_historical_range.call_args.kwargs
+        self.assertEqual((kwargs['frequency_type'], kwargs['frequency']), ('daily', 1))
+
+    def test_only_missing_ranges_are_fetched(self):
+        self.store.get('AAPL', T0, T0 + 9 * DAY)
+        df = self.store.get('AAPL', T0 - 5 * DAY, T0 + 20 * DAY)
+        self.assertEqual(self.ranges()[1:], [(T0 - 5 * DAY, T0), (T0 + 9 * DAY, T0 + 20 * DAY)])
+        self.assertEqual(len(df), 26)
+        self.assertTrue(df['datetime'].is_monotonic_increasing)
+        self.assertFalse(df['datetime'].duplicated().any())
+        self.assertEqual(df['volume'].dtype, np.int64)
+
+    def test_gap_after_covered_range_is_filled(self):
+        self.store.get('AAPL', T0, T0 + 2 * DAY)
+        self.store.get('AAPL', T0 + 10 * DAY, T0 + 12 * DAY)
+        self.assertEqual(self.ranges()[1], (T0 + 2 * DAY, T0 + 12 * DAY))
+        self.assertEqual(len(self.store.load('AAPL')), 13)
+
+    def test_forming_bar_is_refetched(self):
+        now = int(time.time() * 1000)
+        self.market_data.get_historical_range.side_effect = lambda symbol, start_date, end_date, **kwargs: \
+            pd.DataFrame({'open': [1.0], 'high': [1.0], 'low': [1.0], 'close': [1.0], 'volume': [1],
+                          'datetime': [now - 1000]})
+        self.store.get('AAPL', now - 3 * DAY, now)
+        self.store.get('AAPL', now - 3 * DAY, now)
+        self.assertEqual(self.market_data.get_historical_range.call_count, 2)
+
+    def test_symbol_is_quoted_in_path(self):
+        self.store.get('$SPX', T0, T0 + DAY)
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'daily_1', '%24SPX.npz')))
+
+class TestMmapCandleStore(TestCandleStore):
+    """
+    Runs the CandleStore tests against the memory-mapped format, plus the mapping itself.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.store = MmapCandleStore(self.root, self.market_data)
+
+    def test_symbol_is_quoted_in_path(self):
+        self.store.get('$SPX', T0, T0 + DAY)
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'daily_1', '%24SPX.npy')))
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'daily_1', '%24SPX.json')))
+
+    def test_open_and_slice_share_the_mapping(self):
+        self.store.get('AAPL', T0, T0 + 9 * DAY)
+        reader = MmapCandleStore(self.root)
+        rows = reader.open('AAPL')
+        self.assertEqual(rows.dtype, CANDLE_DTYPE)
+        self.assertIsInstance(rows, np.memmap)
+        part = reader.slice('AAPL', T0 + 2 * DAY, T0 + 4 * DAY)
+        self.assertEqual(part['datetime'].tolist(), [T0 + 2 * DAY, T0 + 3 * DAY, T0 + 4 * DAY])
+        self.assertTrue(np.shares_memory(part, rows))
+        self.assertFalse(rows.flags.writeable)
+        self.assertEqual(len(reader.slice('AAPL', T0 + 20 * DAY)), 0)
+        self.assertEqual(MmapCandleStore.to_frame(part)['close'].tolist(), part['close'].tolist())
+
+    def test_reader_sees_updates(self):
+        self.store.get('AAPL', T0, T0 + 2 * DAY)
+        reader = MmapCandleStore(self.root)
+        self.assertEqual(len(reader.open('AAPL')), 3)
+        self.store.get('AAPL', T0, T0 + 5 * DAY)
+        self.assertEqual(len(reader.open('AAPL')), 6)
+        self.assertEqual(len(reader.slice('AAPL')), 6)
+
+    def test_missing_series(self):
+        self.assertEqual(len(self.store.open('NONE')), 0)
+        self.assertEqual(len(self.store.load('NONE')), 0)
+
+if __name__ == '__main__':
+    unittest.main()
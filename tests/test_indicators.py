@@ -0,0 +1,112 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from schwab_api.indicators import (ATR, EMA, RSI, SMA, VWAP, IndicatorSet, atr, ema, rsi, session_ids, sma,
+                                   true_range, vwap)
+from schwab_api.history_store import MmapCandleStore
+
+DAY = 86_400_000
+T0 = 1709906400000  # 2024-03-08 09:00 New York
+
+def candles(n=200, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.random(n)
+    low = close - rng.random(n)
+    times = T0 + np.arange(n) * 3_600_000  # hourly, so the bars span several trading days
+    return pd.DataFrame({'datetime': times, 'open': close, 'high': high, 'low': low, 'close': close,
+                         'volume': rng.integers(1, 1000, n)})
+
+class TestVectorized(unittest.TestCase):
+    def setUp(self):
+        self.df = candles()
+
+    def test_sma_and_ema_match_pandas(self):
+        close = self.df['close']
+        np.testing.assert_allclose(sma(close, 10), close.rolling(10).mean().to_numpy(), equal_nan=True)
+        seeded = close.copy()
+        seeded.iloc[9] = close.iloc[:10].mean()
+        expected = seeded.iloc[9:].ewm(span=10, adjust=False).mean().to_numpy()
+        np.testing.assert_allclose(ema(close, 10)[9:], expected)
+        self.assertTrue(np.isnan(ema(close, 10)[:9]).all())
+
+    def test_rsi_bounds_and_warmup(self):
+        values = rsi(self.df['close'], 14)
+        self.assertTrue(np.isnan(values[:14]).all())
+        self.assertTrue(((values[14:] >= 0) & (values[14:] <= 100)).all())
+        self.assertEqual(rsi(np.arange(30.0), 14)[-1], 100.0)
+
+    def test_true_range_and_atr(self):
+        tr = true_range([10, 11], [9, 10.5], [9.5, 11])
+        np.testing.assert_allclose(tr, [1.0, 1.5])
+        values = atr(self.df['high'], self.df['low'], self.df['close'], 14)
+        self.assertTrue(np.isnan(values[:13]).all())
+        self.assertAlmostEqual(values[13], true_range(self.df['high'], self.df['low'], self.df['close'])[:14].mean())
+
+    def test_vwap_restarts_each_session(self):
+        df = self.df
+        values = vwap(df['high'], df['low'], df['close'], df['volume'], df['datetime'])
+        sessions = session_ids(df['datetime'])
+        day = sessions == sessions[30]
+        typical = ((df['high'] + df['low'] + df['close']) / 3)[day]
+        volume = df['volume'][day]
+        self.assertAlmostEqual(values[day][-1], (typical * volume).sum() / volume.sum())
+        self.assertGreater(sessions[-1], 5)
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.df = candles()
+        self.history, self.live = self.df.iloc[:120], self.df.iloc[120:]
+
+    def check(self, indicator, expected):
+        got = [indicator.update_bar(bar) for bar in self.live.to_dict('records')]
+        np.testing.assert_allclose(got, expected[120:], rtol=1e-9)
+
+    def test_updates_match_vectorized(self):
+        df, h = self.df, self.history
+        self.check(SMA.from_history(h['close'], 20), sma(df['close'], 20))
+        self.check(EMA.from_history(h['close'], 20), ema(df['close'], 20))
+        self.check(RSI.from_history(h['close'], 14), rsi(df['close'], 14))
+        self.check(ATR.from_history(h['high'], h['low'], h['close'], 14), atr(df['high'], df['low'], df['close'], 14))
+        self.check(VWAP.from_history(h['high'], h['low'], h['close'], h['volume'], h['datetime']),
+                   vwap(df['high'], df['low'], df['close'], df['volume'], df['datetime']))
+
+    def test_from_scratch_matches_vectorized(self):
+        indicators = [EMA(10), RSI(14), ATR(14)]
+        rows = self.df.to_dict('records')
+        got = np.array([[ind.update_bar(bar) for ind in indicators] for bar in rows])
+        np.testing.assert_allclose(got[:, 0], ema(self.df['close'], 10), equal_nan=True)
+        np.testing.assert_allclose(got[:, 1], rsi(self.df['close'], 14), equal_nan=True)
+        np.testing.assert_allclose(got[:, 2], atr(self.df['high'], self.df['low'], self.df['close'], 14),
+                                   equal_nan=True)
+
+    def test_short_history_warms_up(self):
+        indicator = EMA.from_history(self.df['close'][:5], 10)
+        values = [indicator.update(v) for v in self.df['close'][5:12]]
+        np.testing.assert_allclose(values, ema(self.df['close'][:12], 10)[5:], equal_nan=True)
+
+    def test_indicator_set(self):
+        indicators = IndicatorSet.from_candles(self.history, sma_periods=(5,), ema_periods=(), atr_period=0)
+        values = indicators.update(self.live.iloc[0])
+        self.assertEqual(sorted(values), ['rsi_14', 'sma_5', 'vwap'])
+        self.assertAlmostEqual(values['sma_5'], sma(self.df['close'], 5)[120])
+        self.assertEqual(indicators.values(), values)
+
+    def test_indicator_set_on_mmap_records(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        store = MmapCandleStore(root)
+        store._write('AAPL', store.series_key('daily', 1, False), self.df, int(self.df['datetime'].iloc[0]),
+                     int(self.df['datetime'].iloc[-1]))
+        rows = store.slice('AAPL')
+        indicators = IndicatorSet.from_candles(rows[:120], sma_periods=(5,), ema_periods=(), atr_period=0)
+        got = [indicators.update(rows[i]) for i in range(120, len(rows))]
+        np.testing.assert_allclose([v['vwap'] for v in got],
+                                   vwap(self.df['high'], self.df['low'], self.df['close'], self.df['volume'],
+                                        self.df['datetime'])[120:], rtol=1e-9)
+        np.testing.assert_allclose([v['sma_5'] for v in got], sma(self.df['close'], 5)[120:], rtol=1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
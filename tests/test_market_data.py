@@ -2,6 +2,7 @@ import unittest
 from schwab_api.auth import SchwabAuth
 from schwab_api.market_data import MarketData
 import pandas as pd
+from schwab_api.exceptions import SchwabAPIError
 
 class TestMarketData(unittest.TestCase):
 
@@ -114,7 +115,7 @@ class TestMarketData(unittest.TestCase):
         """
         Test case for the `get_symbol_quotes` method of the `MarketData` class.
 
-        This test case verifies that the `get_symbol_quotes` method raises a `SystemExit` exception when an invalid symbol is provided.
+        This test case verifies that the `get_symbol_quotes` method raises a `SchwabAPIError` exception when an invalid symbol is provided.
 
         Parameters:
             self (TestMarketData): The test case instance.
@@ -122,14 +123,14 @@ class TestMarketData(unittest.TestCase):
         Returns:
             None
         """
-        with self.assertRaises(SystemExit):
+        with self.assertRaises(SchwabAPIError):
             self.market_data.get_symbol_quotes('INVALID')
 
     def test_get_historical_data_invalid_symbol(self):
         """
         Test case for the `get_historical_data_invalid_symbol` method of the `MarketData` class.
 
-        This test case verifies that the `get_historical_data_invalid_symbol` method raises a `SystemExit` exception when an invalid symbol is provided.
+        This test case verifies that the `get_historical_data_invalid_symbol` method raises a `SchwabAPIError` exception when an invalid symbol is provided.
 
         Parameters:
             self (TestMarketData): The test case instance.
@@ -137,5 +138,5 @@ class TestMarketData(unittest.TestCase):
         Returns:
             None
         """
-        with self.assertRaises(SystemExit):
+        with self.assertRaises(SchwabAPIError):
             self.market_data.get_historical_data('INVALID')
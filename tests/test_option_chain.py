@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+from schwab_api.market_data import MarketData
+from schwab_api.option_chain import OptionChain
+
+def make_chain():
+    def contract(side, strike, delta):
+        return {'putCall': side, 'symbol': f"SPY {side[0]}{strike}", 'strikePrice': strike, 'delta': delta,
+                'bid': 1.0, 'ask': 1.1}
+    calls = {'2024-01-19:5': {str(k): [contract('CALL', k, round(1 - (k - 90) / 20, 2))] for k in (110.0, 90.0, 100.0)},
+             '2024-02-16:33': {'100.0': [contract('CALL', 100.0, 0.52)]}}
+    puts = {'2024-01-19:5': {str(k): [contract('PUT', k, d)] for k, d in
+                             ((90.0, -0.1), (95.0, -0.28), (100.0, -0.5), (105.0, -999.0))}}
+    return {'symbol': 'SPY', 'underlyingPrice': 100.0, 'underlying': {'last': 100.0},
+            'callExpDateMap': calls, 'putExpDateMap': puts}
+
+class TestOptionChain(unittest.TestCase):
+    def setUp(self):
+        self.chain = OptionChain.from_json(make_chain())
+
+    def test_exact_lookup(self):
+        contract = self.chain.get('2024-01-19', 100, 'P')
+        self.assertEqual(contract['symbol'], 'SPY P100.0')
+        self.assertIsNone(self.chain.get('2024-01-19', 101, 'PUT'))
+        self.assertEqual(self.chain.get('2024-02-16:33', 100.0)['delta'], 0.52)
+
+    def test_sorted_strikes(self):
+        self.assertEqual(self.chain.expirations, ['2024-01-19', '2024-02-16'])
+        np.testing.assert_array_equal(self.chain.strikes('2024-01-19', 'CALL'), [90.0, 100.0, 110.0])
+
+    def test_nearest_strike(self):
+        self.assertEqual(self.chain.nearest_strike('2024-01-19', 103, 'CALL')['strikePrice'], 100.0)
+        self.assertEqual(self.chain.nearest_strike('2024-01-19', 1000, 'CALL')['strikePrice'], 110.0)
+        self.assertEqual(self.chain.nearest_strike('2024-01-19', 0, 'PUT')['strikePrice'], 90.0)
+        self.assertIsNone(self.chain.nearest_strike('2030-01-01', 100, 'PUT'))
+
+    def test_nearest_delta_skips_invalid(self):
+        self.assertEqual(self.chain.nearest_delta('2024-01-19', -0.30, 'PUT')['strikePrice'], 95.0)
+        self.assertEqual(self.chain.nearest_delta('2024-01-19', -1.0, 'PUT')['strikePrice'], 100.0)
+        self.assertEqual(self.chain.nearest_delta('2024-01-19', 0.5, 'CALL')['strikePrice'], 100.0)
+
+    def test_to_dataframe(self):
+        df = self.chain.to_dataframe()
+        self.assertEqual(len(df), len(self.chain))
+        self.assertEqual(df.attrs['underlying']['underlyingPrice'], 100.0)
+        self.assertEqual(df['strikePrice'].tolist()[:3], [90.0, 100.0, 110.0])
+
+class TestChainsByExpiration(unittest.TestCase):
+    def test_buckets_are_fetched_and_merged(self):
+        expirations = ['2024-01-05', '2024-01-12', '2024-01-19', '2024-01-26', '2024-02-16']
+
+        def get(url, headers, params):
+            response = MagicMock()
+            response.status_code = 200
+            response.content = b'{}'
+            if 'expirationchain' in url:
+                response.json.return_value = {'expirationList': [{'expirationDate': d} for d in expirations]}
+            else:
+                dates = [d for d in expirations if params['fromDate'] <= d <= params['toDate']]
+                response.json.return_value = {
+                    'symbol': 'SPY', 'underlyingPrice': 100.0, 'underlying': {},
+                    'callExpDateMap': {f"{d}:1": {'100.0': [{'putCall': 'CALL', 'symbol': f"SPY {d} C100",
+                                                             'strikePrice': 100.0}]} for d in dates},
+                    'putExpDateMap': {}}
+            return response
+
+        session = MagicMock()
+        session.get.side_effect = get
+        market_data = MarketData(MagicMock(), session=session)
+        df = market_data.get_option_chains_by_expiration('SPY', 'CALL', fromDate='2024-01-10',
+                                                         expirations_per_request=2, max_workers=2)
+        self.assertEqual(sorted(df['exp_date'].str[:10]), expirations[1:])
+        self.assertEqual([(b['fromDate'], b['toDate']) for b in df.attrs['buckets']],
+                         [('2024-01-12', '2024-01-19'), ('2024-01-26', '2024-02-16')])
+        self.assertEqual(df.attrs['underlying']['underlyingPrice'], 100.0)
+        chain = market_data.get_option_chains_by_expiration('SPY', 'CALL', indexed=True)
+        self.assertEqual(chain.expirations, expirations)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import asyncio
+import time
+import unittest
+from schwab_api.rate_limit import RateLimiter, TokenBucket
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_wait(self):
+        bucket = TokenBucket('test', rate=100, capacity=2)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        wait = bucket.reserve()
+        self.assertGreater(wait, 0.0)
+        self.assertLessEqual(wait, 0.011)
+
+    def test_queued_callers_wait_in_order(self):
+        bucket = TokenBucket('test', rate=10, capacity=1)
+        waits = [bucket.reserve() for _ in range(4)]
+        self.assertEqual(waits, sorted(waits))
+        self.assertAlmostEqual(waits[-1], 0.3, places=2)
+
+    def test_stats(self):
+        bucket = TokenBucket('test', rate=1000, capacity=1)
+        bucket.acquire()
+        bucket.acquire()
+        stats = bucket.stats()
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['delayed_requests'], 1)
+        self.assertGreater(stats['total_wait'], 0.0)
+        self.assertLessEqual(stats['fill_level'], 1.0)
+
+    def test_acquire_async(self):
+        bucket = TokenBucket('test', rate=50, capacity=1)
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(*[bucket.acquire_async() for _ in range(3)])
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(run()), 0.035)
+
+class TestRateLimiter(unittest.TestCase):
+    def test_bucket_routing(self):
+        self.assertEqual(RateLimiter.bucket_name('GET', 'https://api.schwabapi.com/marketdata/v1/quotes'),
+                         'market_data')
+        self.assertEqual(RateLimiter.bucket_name('POST', 'https://api.schwabapi.com/trader/v1/accounts/1/orders'),
+                         'orders')
+        self.assertEqual(RateLimiter.bucket_name('GET', 'https://api.schwabapi.com/trader/v1/accounts/1/orders'),
+                         'trader')
+        self.assertIsNone(RateLimiter.bucket_name('POST', 'https://api.schwabapi.com/v1/oauth/token'))
+
+    def test_budget_not_exceeded_within_period(self):
+        limiter = RateLimiter(limits={'market_data': (120, 60)})
+        bucket = limiter.buckets['market_data']
+        self.assertLessEqual(bucket.capacity + bucket.rate * 60, 120)
+
+if __name__ == '__main__':
+    unittest.main()
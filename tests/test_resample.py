@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+from schwab_api.cache import EXCHANGE_TZ
+from schwab_api.exceptions import SchwabAuthError, SchwabNotFoundError, SchwabRateLimitError, SchwabServerError
+from schwab_api.resample import (default_sessions, market_sessions, parse_rule, resample, resample_history,
+                                 sessions_from_market_hours)
+
+def minute_bars(*days, start='07:00', end='19:59'):
+    index = pd.DatetimeIndex([])
+    for day in days:
+        index = index.append(pd.date_range(f"{day} {start}", f"{day} {end}", freq='1min', tz=EXCHANGE_TZ))
+    times = ((index - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(milliseconds=1)).to_numpy()
+    n = len(times)
+    return pd.DataFrame({'datetime': times, 'open': np.arange(n, dtype=float), 'high': np.arange(n) + 0.5,
+                         'low': np.arange(n) - 0.5, 'close': np.arange(n) + 0.25, 'volume': 1})
+
+def local(times):
+    return [t.strftime('%Y-%m-%d %H:%M') for t in pd.to_datetime(np.asarray(times), unit='ms', utc=True).tz_convert(EXCHANGE_TZ)]
+
+MARKET_HOURS = {'equity': {'EQ': {'date': '2024-03-08', 'isOpen': True, 'sessionHours': {
+    'preMarket': [{'start': '2024-03-08T07:00:00-05:00', 'end': '2024-03-08T09:30:00-05:00'}],
+    'regularMarket': [{'start': '2024-03-08T09:30:00-05:00', 'end': '2024-03-08T13:00:00-05:00'}],
+    'postMarket': [{'start': '2024-03-08T13:00:00-05:00', 'end': '2024-03-08T17:00:00-05:00'}]}}}}
+
+class TestResample(unittest.TestCase):
+    def test_parse_rule(self):
+        self.assertEqual([parse_rule(r) for r in (5, '15min', '30m', '1h', '4H')], [5, 15, 30, 60, 240])
+        self.assertIsNone(parse_rule('1d'))
+        for bad in ('2d', '0min', 'weekly', -1):
+            with self.assertRaises(ValueError):
+                parse_rule(bad)
+
+    def test_hourly_bars_anchor_to_session_open(self):
+        bars = resample(minute_bars('2024-03-08'), '1h')
+        self.assertEqual(local(bars['datetime'])[:2], ['2024-03-08 09:30', '2024-03-08 10:30'])
+        self.assertEqual(len(bars), 7)
+        self.assertEqual(bars['volume'].tolist(), [60] * 6 + [30])
+        first = minute_bars('2024-03-08').iloc[150:210]
+        self.assertEqual(bars.loc[0, 'open'], first['open'].iloc[0])
+        self.assertEqual(bars.loc[0, 'high'], first['high'].max())
+        self.assertEqual(bars.loc[0, 'low'], first['low'].min())
+        self.assertEqual(bars.loc[0, 'close'], first['close'].iloc[-1])
+
+    def test_daily_bars_and_dst(self):
+        candles = minute_bars('2024-03-08', '2024-03-11')
+        daily = resample(candles, '1d')
+        self.assertEqual(local(daily['datetime']), ['2024-03-08 00:00', '2024-03-11 00:00'])
+        self.assertEqual(daily['volume'].tolist(), [390, 390])
+        extended = resample(candles, '1d', extended_hours=True)
+        self.assertEqual(extended['volume'].tolist(), [780, 780])
+        five = resample(candles, '5min')
+        self.assertEqual(local(five['datetime'])[78], '2024-03-11 09:30')
+
+    def test_market_hours_sessions(self):
+        regular = sessions_from_market_hours(MARKET_HOURS)
+        self.assertEqual(local(regular[0]), ['2024-03-08 09:30', '2024-03-08 13:00'])
+        extended = sessions_from_market_hours(MARKET_HOURS, extended_hours=True)
+        self.assertEqual(local(extended[0]), ['2024-03-08 07:00', '2024-03-08 17:00'])
+        closed = {'equity': {'EQ': {'isOpen': False, 'sessionHours': None}}}
+        self.assertEqual(len(sessions_from_market_hours(closed)), 0)
+        # a product without hours is skipped, not an error
+        with_empty = {'equity': {'EQO': None, **MARKET_HOURS['equity']}}
+        np.testing.assert_array_equal(sessions_from_market_hours(with_empty), regular)
+        daily = resample(minute_bars('2024-03-08'), '1d', sessions=regular)
+        self.assertEqual(daily['volume'].tolist(), [210])
+
+    def test_market_sessions_fall_back_to_default(self):
+        market_data = MagicMock()
+        market_data.get_market_hours.side_effect = lambda market_id, date: (
+            MARKET_HOURS if date == '2024-03-08' else (_ for _ in ()).throw(SchwabNotFoundError("old date")))
+        sessions = market_sessions(market_data, ['2024-03-11', '2024-03-08'])
+        self.assertEqual([local(s) for s in sessions], [['2024-03-08 09:30', '2024-03-08 13:00'],
+                                                        ['2024-03-11 09:30', '2024-03-11 16:00']])
+
+    def test_market_sessions_raise_other_errors(self):
+        for error in (SchwabAuthError("expired", status_code=401), SchwabRateLimitError("slow", status_code=429),
+                      SchwabServerError("down", status_code=503)):
+            market_data = MagicMock()
+            market_data.get_market_hours.side_effect = error
+            with self.assertRaises(type(error)):
+                market_sessions(market_data, ['2024-03-08'])
+
+    def test_resample_history_fetches_once(self):
+        store = MagicMock()
+        store.get.return_value = minute_bars('2024-03-08')
+        bars = resample_history(store, 'AAPL', '2024-03-08', '2024-03-09', rules=('5min', '1h', '1d'))
+        self.assertEqual(store.get.call_count, 1)
+        self.assertEqual(store.get.call_args.kwargs['frequency_type'], 'minute')
+        self.assertEqual([len(bars[r]) for r in ('5min', '1h', '1d')], [78, 7, 1])
+
+    def test_empty(self):
+        self.assertEqual(len(resample(pd.DataFrame(), '5min')), 0)
+        self.assertEqual(default_sessions([]).shape, (0, 2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import requests
+from schwab_api.exceptions import (CircuitOpenError, SchwabConnectionError, SchwabNotFoundError,
+                                   SchwabServerError)
+from schwab_api.resilience import CircuitBreaker, CircuitBreakerRegistry, RetryPolicy, parse_retry_after
+from schwab_api.session import SchwabSession
+from schwab_api.utils import handle_response
+
+QUOTES_URL = 'https://api.schwabapi.com/marketdata/v1/quotes'
+ORDERS_URL = 'https://api.schwabapi.com/trader/v1/accounts/123/orders'
+
+def make_response(status_code, body=b'{}', headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.content = body
+    response.text = body.decode()
+    response.url = QUOTES_URL
+    response.json.return_value = {}
+    return response
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+    def test_order_placement_only_retried_on_429(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.should_retry_status('POST', 429))
+        self.assertFalse(policy.should_retry_status('POST', 503))
+        self.assertTrue(policy.should_retry_status('GET', 503))
+        self.assertFalse(policy.should_retry_status('GET', 404))
+
+    def test_backoff_honors_retry_after(self):
+        policy = RetryPolicy(backoff_factor=0.1, max_backoff=1)
+        self.assertLessEqual(policy.backoff(10), 1)
+        self.assertGreaterEqual(policy.backoff(0, retry_after=2), 2)
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_and_recovers(self):
+        breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=0)
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        breaker.before_request()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_released_trial_lets_the_next_request_through(self):
+        breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        self.assertTrue(breaker.before_request())
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+        breaker.release_trial()
+        self.assertTrue(breaker.before_request())
+
+    def test_fails_fast_while_open(self):
+        breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=60)
+        breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+    def test_endpoint_key_collapses_ids(self):
+        self.assertEqual(CircuitBreakerRegistry.endpoint_key(ORDERS_URL),
+                         'api.schwabapi.com/trader/v1/accounts/{id}/orders')
+
+class TestSessionRetries(unittest.TestCase):
+    def setUp(self):
+        self.session = SchwabSession(rate_limit=False,
+                                     retry_policy=RetryPolicy(max_retries=2, backoff_factor=0))
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_retries_transient_errors(self, mock_request, mock_sleep):
+        mock_request.side_effect = [make_response(502), make_response(200)]
+        response = self.session.get(QUOTES_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_connection_errors_raise_typed_error(self, mock_request, mock_sleep):
+        mock_request.side_effect = requests.exceptions.ConnectionError('down')
+        with self.assertRaises(SchwabConnectionError):
+            self.session.get(QUOTES_URL)
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_order_not_retried_on_server_error(self, mock_request, mock_sleep):
+        mock_request.return_value = make_response(503)
+        response = self.session.post(ORDERS_URL)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_circuit_opens_after_repeated_failures(self, mock_request, mock_sleep):
+        session = SchwabSession(rate_limit=False, retry_policy=RetryPolicy(max_retries=0),
+                                circuit_breakers=CircuitBreakerRegistry(failure_threshold=2))
+        mock_request.return_value = make_response(500)
+        session.get(QUOTES_URL)
+        session.get(QUOTES_URL)
+        with self.assertRaises(CircuitOpenError):
+            session.get(QUOTES_URL)
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_half_open_trial_is_released_when_it_raises(self, mock_request, mock_sleep):
+        session = SchwabSession(rate_limit=False, retry_policy=RetryPolicy(max_retries=0),
+                                circuit_breakers=CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=0))
+        breaker = session.circuit_breakers.get(QUOTES_URL)
+        breaker.record_failure()
+        mock_request.side_effect = requests.exceptions.ChunkedEncodingError('truncated')
+        with self.assertRaises(SchwabConnectionError):
+            session.get(QUOTES_URL)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        mock_request.side_effect = RuntimeError('boom')
+        with self.assertRaises(RuntimeError):
+            session.get(QUOTES_URL)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        mock_request.side_effect = None
+        mock_request.return_value = make_response(200)
+        self.assertEqual(session.get(QUOTES_URL).status_code, 200)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+class TestHandleResponse(unittest.TestCase):
+    def test_typed_errors(self):
+        with self.assertRaises(SchwabNotFoundError):
+            handle_response(make_response(404, b'missing'))
+        with self.assertRaises(SchwabServerError) as ctx:
+            handle_response(make_response(503, b'', {'Retry-After': '5'}))
+        self.assertEqual(ctx.exception.retry_after, 5.0)
+
+    def test_empty_body(self):
+        self.assertIsNone(handle_response(make_response(201, b'')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import MagicMock
+from schwab_api.exceptions import SchwabNotFoundError
+from schwab_api.market_data import MarketData
+from schwab_api.scanner import OptionChainScanner
+
+def chain_response(symbol):
+    response = MagicMock()
+    response.content = b'{}'
+    if symbol == 'BAD':
+        response.status_code = 404
+        response.text = 'not found'
+        response.url = 'https://api.schwabapi.com/marketdata/v1/chains'
+        response.headers = {}
+        return response
+    response.status_code = 200
+    response.json.return_value = {
+        'symbol': symbol, 'underlyingPrice': 10.0, 'underlying': {},
+        'callExpDateMap': {'2024-01-19:5': {'10.0': [{'putCall': 'CALL', 'symbol': f"{symbol} C10", 'strikePrice': 10.0}],
+                                            '11.0': [{'putCall': 'CALL', 'symbol': f"{symbol} C11", 'strikePrice': 11.0}]}},
+        'putExpDateMap': {}}
+    return response
+
+class TestOptionChainScanner(unittest.TestCase):
+    def setUp(self):
+        self.session = MagicMock()
+        self.session.get.side_effect = lambda url, headers, params: chain_response(params['symbol'])
+        self.market_data = MarketData(MagicMock(), session=self.session)
+
+    def test_scan_streams_results_and_stats(self):
+        seen = []
+        scanner = OptionChainScanner(self.market_data, strike_count=4, min_dte=0, max_dte=45, max_workers=3,
+                                     progress=lambda result, stats: seen.append(stats['completed']))
+        results = scanner.scan_all(['AAPL', 'MSFT', 'BAD', 'AAPL'])
+        self.assertEqual(set(results), {'AAPL', 'MSFT', 'BAD'})
+        self.assertEqual(len(results['AAPL'].chain), 2)
+        self.assertIsInstance(results['BAD'].error, SchwabNotFoundError)
+        stats = scanner.stats()
+        self.assertEqual((stats['completed'], stats['failed'], stats['contracts']), (3, 1, 4))
+        self.assertEqual(sorted(seen), [1, 2, 3])
+        params = self.session.get.call_args.kwargs['params']
+        self.assertEqual(params['strikeCount'], 4)
+        self.assertIsNotNone(params['fromDate'])
+        self.assertIsNotNone(params['toDate'])
+
+    def test_scan_with_process_pool(self):
+        scanner = OptionChainScanner(self.market_data, max_workers=2, parse_processes=1)
+        results = scanner.scan_all(['AAPL', 'MSFT'])
+        self.assertEqual(results['MSFT'].chain['symbol'].tolist(), ['MSFT C10', 'MSFT C11'])
+        self.assertEqual(results['MSFT'].chain.attrs['underlying']['underlyingPrice'], 10.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from schwab_api.session import SchwabSession
+from schwab_api.market_data import MarketData
+from schwab_api.trades import Trader
+
+class TestSchwabSession(unittest.TestCase):
+    def setUp(self):
+        self.session = SchwabSession(pool_maxsize=8, timeout=(1, 2))
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_pool_configuration(self):
+        adapter = self.session.session.get_adapter('https://api.schwabapi.com')
+        self.assertEqual(adapter._pool_maxsize, 8)
+
+    @patch('requests.Session.request')
+    def test_default_timeout_applied(self, mock_request):
+        mock_request.return_value.status_code = 200
+        self.session.get('https://api.schwabapi.com/marketdata/v1/quotes')
+        mock_request.assert_called_once()
+        self.assertEqual(mock_request.call_args.kwargs['timeout'], (1, 2))
+
+    @patch('requests.Session.request')
+    def test_explicit_timeout_kept(self, mock_request):
+        mock_request.return_value.status_code = 200
+        self.session.post('https://api.schwabapi.com/v1/oauth/token', timeout=9)
+        self.assertEqual(mock_request.call_args.kwargs['timeout'], 9)
+
+    def test_session_is_shared(self):
+        auth = MagicMock()
+        market_data = MarketData(auth, session=self.session)
+        trader = Trader(auth, session=self.session)
+        self.assertIs(market_data.session, trader.session)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+import asyncio
+import functools
+import math
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+from schwab_api.async_market_data import AsyncMarketData
+from schwab_api.async_trades import AsyncTrader
+from schwab_api.exceptions import SchwabStreamError
+from schwab_api.helper import HelperFuncs
+from schwab_api.market_data import MarketData
+from schwab_api.resilience import RetryPolicy
+from schwab_api.stream_decode import StreamDecoder
+from schwab_api.streamer import SchwabStreamer
+from schwab_api.trades import Trader
+from tests.test_streamer import STREAMER_INFO, FakeWebSocket
+
+
+class TestStreamDecoder(unittest.TestCase):
+    def setUp(self):
+        self.decoder = StreamDecoder('LEVELONE_EQUITIES', fields=['bidPrice', 'askPrice', 'bidSize', 'description'],
+                                     capacity=1)
+
+    def test_merges_partial_updates(self):
+        self.decoder.decode([{'key': 'AAPL', '1': 190.0, '2': 190.1, '4': 3, '15': 'Apple'},
+                             {'key': 'MSFT', '1': 410.0}], timestamp=100)
+        self.decoder.decode([{'key': 'AAPL', '2': 190.2, '99': 'ignored', 'delayed': False}], timestamp=200)
+        ticks = self.decoder.drain()
+        self.assertEqual(len(ticks), 3)
+        self.assertEqual(list(ticks['symbol']), ['AAPL', 'MSFT', 'AAPL'])
+        self.assertEqual(list(ticks['askPrice'][[0, 2]]), [190.1, 190.2])
+        # the later tick carries the fields it did not change
+        self.assertEqual(ticks['bidPrice'][2], 190.0)
+        self.assertEqual(ticks['description'][2], 'Apple')
+        self.assertEqual(list(ticks['timestamp']), [100, 100, 200])
+        self.assertTrue(math.isnan(ticks['askPrice'][1]))
+        self.assertEqual(ticks['bidSize'][1], 0)
+        self.assertEqual(len(self.decoder), 0)
+
+    def test_drained_ticks_are_not_overwritten(self):
+        self.decoder.decode([{'key': 'AAPL', '1': 1.0}])
+        first = self.decoder.drain()
+        self.decoder.decode([{'key': 'AAPL', '1': 2.0}])
+        self.assertEqual(first['bidPrice'][0], 1.0)
+        self.assertEqual(self.decoder.latest('AAPL')['bidPrice'], 2.0)
+        self.assertIsNone(self.decoder.latest('SPY'))
+
+    def test_frames_on_request(self):
+        self.decoder.decode([{'key': f"S{i}", '1': float(i)} for i in range(5)])
+        self.decoder.decode([{'key': 'S1', '2': 9.0}])
+        snapshot = self.decoder.snapshot()
+        self.assertEqual(list(snapshot.index), ['S0', 'S1', 'S2', 'S3', 'S4'])
+        self.assertEqual(snapshot.loc['S1', 'askPrice'], 9.0)
+        frame = StreamDecoder.to_frame(self.decoder.drain())
+        self.assertEqual(len(frame), 6)
+        self.assertEqual(list(frame.columns), ['symbol', 'bidPrice', 'askPrice', 'bidSize', 'description',
+                                               'timestamp'])
+
+    def test_chart_entries(self):
+        decoder = StreamDecoder('CHART_EQUITY')
+        decoder.decode([{'seq': 1, 'key': 'AAPL', '1': 1.0, '2': 2.0, '3': 0.5, '4': 1.5, '5': 1000.0,
+                         '6': 7, '7': 1700000000000, '8': 19675}])
+        bar = decoder.drain()[0]
+        self.assertEqual((bar['closePrice'], bar['sequence'], bar['chartTime']), (1.5, 7, 1700000000000))
+
+
+class SubscribedWebSocket(FakeWebSocket):
+    """
+    Sends a data message right after the SUBS response.
+    """
+
+    def __init__(self, message):
+        super().__init__()
+        self.message = message
+
+    async def send(self, message):
+        await super().send(message)
+        if self.sent[-1]['requests'][0]['command'] == 'SUBS':
+            self.push(self.message)
+
+
+class TestStreamRealTimeData(unittest.TestCase):
+    def setUp(self):
+        self.auth = MagicMock()
+        self.auth.token = 'token'
+        self.auth.token_expires_at = 0
+
+    def streamer(self, *sockets):
+        connected = []
+
+        async def connect(url):
+            connected.append(url)
+            return sockets[len(connected) - 1]
+
+        return functools.partial(SchwabStreamer, streamer_info=STREAMER_INFO, connect=connect,
+                                 retry_policy=RetryPolicy(backoff_factor=0))
+
+    def test_yields_batches(self):
+        websocket = SubscribedWebSocket({'data': [{'service': 'LEVELONE_EQUITIES', 'timestamp': 5, 'content': [
+            {'key': 'AAPL', '3': 1.0}, {'key': 'AAPL', '3': 2.0}]}]})
+        streamer = self.streamer(websocket)
+
+        async def run():
+            batches = []
+            stream = MarketData(self.auth, session=MagicMock()).stream_real_time_data(['AAPL'],
+                                                                                      fields=['lastPrice'])
+            with patch('schwab_api.market_data.SchwabStreamer', streamer):
+                async for ticks in stream:
+                    batches.append(ticks)
+                    break
+                await stream.aclose()
+            return batches
+
+        batches = asyncio.run(run())
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(list(batches[0]['lastPrice']), [1.0, 2.0])
+
+    def test_gives_up_after_last_ticks(self):
+        websocket = SubscribedWebSocket({'data': [{'service': 'LEVELONE_EQUITIES', 'timestamp': 5, 'content': [
+            {'key': 'AAPL', '3': 1.0}]}]})
+
+        async def connect(url):
+            if websocket.sent:
+                raise OSError("connection refused")
+            return websocket
+
+        streamer = functools.partial(SchwabStreamer, streamer_info=STREAMER_INFO, connect=connect,
+                                     retry_policy=RetryPolicy(backoff_factor=0), max_reconnect_attempts=1)
+
+        async def run():
+            batches = []
+            stream = MarketData(self.auth, session=MagicMock()).stream_real_time_data(['AAPL'],
+                                                                                      fields=['lastPrice'])
+            with patch('schwab_api.market_data.SchwabStreamer', streamer):
+                with self.assertRaises(SchwabStreamError) as ctx:
+                    async for ticks in stream:
+                        batches.append(ticks)
+                        if len(batches) == 1:
+                            websocket.push({'data': [{'service': 'LEVELONE_EQUITIES', 'timestamp': 6,
+                                                      'content': [{'key': 'AAPL', '3': 2.0}]}]})
+                            await websocket.close()
+                            # let the reconnect give up before the next batch is requested
+                            await asyncio.sleep(0.05)
+            return batches, ctx.exception
+
+        with self.assertLogs('schwab_api.streamer', level='ERROR'):
+            batches, error = asyncio.run(run())
+        self.assertEqual([list(ticks['lastPrice']) for ticks in batches], [[1.0], [2.0]])
+        self.assertIsInstance(error.__cause__, OSError)
+
+    def backfill(self, market_data, history):
+        """
+        Streams CHART_EQUITY, drops the connection after the first bar and returns both batches and the gaps.
+        """
+        minute = int(time.time() // 60) * 60_000
+        first = minute - 5 * 60_000
+        sockets = [SubscribedWebSocket({'data': [{'service': 'CHART_EQUITY', 'timestamp': first + 60_000,
+                                                  'content': [{'key': 'AAPL', '4': 1.0, '6': 11, '7': first}]}]}),
+                   SubscribedWebSocket({'notify': [{'heartbeat': '1'}]})]
+        candles = [{'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 100, 'datetime': t}
+                   for t in range(first, minute + 60_000, 60_000)]
+        history.return_value = HelperFuncs._candles_to_dataframe({'symbol': 'AAPL', 'candles': candles})
+        market_data.get_historical_data = history
+        gaps, traders = [], []
+        streamer = self.streamer(*sockets)
+
+        def make_streamer(auth, trader=None):
+            traders.append(trader)
+            return streamer(auth)
+
+        async def run():
+            batches = []
+            stream = market_data.stream_real_time_data(['AAPL'], service='CHART_EQUITY', backfill=True,
+                                                       on_gap=gaps.append)
+            with patch('schwab_api.market_data.SchwabStreamer', make_streamer):
+                async for ticks in stream:
+                    batches.append(ticks)
+                    if len(batches) == 1:
+                        await sockets[0].close()
+                    else:
+                        break
+                await stream.aclose()
+            return batches
+
+        live, backfilled = asyncio.run(run())
+        self.assertEqual(list(live['chartTime']), [first])
+        self.assertEqual(len(gaps), 1)
+        self.assertEqual(history.call_args.kwargs['start_date'], first + 60_000)
+        # the bar still forming at reconnect time is left to the live stream
+        self.assertEqual(list(backfilled['chartTime']), list(range(first + 60_000, minute, 60_000)))
+        self.assertTrue((backfilled['sequence'] == 0).all())
+        self.assertTrue((backfilled['closePrice'] == 1.5).all())
+        return traders[0]
+
+    def test_reconnect_backfills_chart_bars(self):
+        trader = self.backfill(MarketData(self.auth, session=MagicMock()), MagicMock())
+        self.assertIsInstance(trader, Trader)
+
+    def test_async_market_data_awaits_backfill(self):
+        history = AsyncMock()
+        trader = self.backfill(AsyncMarketData(self.auth, session=MagicMock()), history)
+        history.assert_awaited()
+        self.assertIsInstance(trader, AsyncTrader)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,250 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import MagicMock
+from schwab_api.exceptions import SchwabStreamError
+from schwab_api.resilience import RetryPolicy
+from schwab_api.stream_fields import field_numbers
+from schwab_api.streamer import SchwabStreamer
+
+STREAMER_INFO = {
+    'streamerSocketUrl': 'wss://streamer.example/ws',
+    'schwabClientCustomerId': 'customer',
+    'schwabClientCorrelId': 'correl',
+    'schwabClientChannel': 'N9',
+    'schwabClientFunctionId': 'APIAPP',
+}
+
+
+class FakeWebSocket:
+    """
+    Answers every request with the given code and replays messages pushed by the test.
+    """
+
+    def __init__(self, codes=None):
+        self.sent = []
+        self.codes = codes or {}
+        self.incoming = asyncio.Queue()
+        self.closed = False
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+        for request in self.sent[-1]['requests']:
+            code = self.codes.get(request['command'], 0)
+            self.push({'response': [{'service': request['service'], 'command': request['command'],
+                                     'requestid': request['requestid'], 'content': {'code': code, 'msg': 'msg'}}]})
+
+    def push(self, message):
+        self.incoming.put_nowait(json.dumps(message))
+
+    async def close(self):
+        self.closed = True
+        self.incoming.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+class TestSchwabStreamer(unittest.TestCase):
+    def setUp(self):
+        self.auth = MagicMock()
+        self.auth.token = 'token'
+        self.auth.token_expires_at = 0
+
+    def make_streamer(self, websocket, **kwargs):
+        async def connect(url):
+            self.url = url
+            return websocket
+
+        trader = MagicMock()
+        trader.get_user_preferences.return_value = {'streamerInfo': [STREAMER_INFO]}
+        return SchwabStreamer(self.auth, trader=trader, connect=connect, **kwargs)
+
+    def requests(self, websocket):
+        return [request for message in websocket.sent for request in message['requests']]
+
+    def test_login_uses_streamer_info(self):
+        websocket = FakeWebSocket()
+
+        async def run():
+            streamer = self.make_streamer(websocket)
+            await streamer.start()
+            await streamer.stop()
+
+        asyncio.run(run())
+        login, logout = self.requests(websocket)
+        self.assertEqual(self.url, 'wss://streamer.example/ws')
+        self.assertEqual(login['service'], 'ADMIN')
+        self.assertEqual(login['command'], 'LOGIN')
+        self.assertEqual(login['SchwabClientCustomerId'], 'customer')
+        self.assertEqual(login['SchwabClientCorrelId'], 'correl')
+        self.assertEqual(login['parameters'], {'Authorization': 'token', 'SchwabClientChannel': 'N9',
+                                               'SchwabClientFunctionId': 'APIAPP'})
+        self.assertEqual(logout['command'], 'LOGOUT')
+        self.assertTrue(websocket.closed)
+
+    def test_rejected_login_raises(self):
+        websocket = FakeWebSocket(codes={'LOGIN': 3})
+
+        async def run():
+            with self.assertRaises(SchwabStreamError):
+                await self.make_streamer(websocket).start()
+            await websocket.close()
+
+        asyncio.run(run())
+
+    def test_missing_streamer_info_raises(self):
+        trader = MagicMock()
+        trader.get_user_preferences.return_value = {'accounts': []}
+        streamer = SchwabStreamer(self.auth, trader=trader, connect=MagicMock())
+        with self.assertRaises(SchwabStreamError):
+            asyncio.run(streamer.start())
+
+    def test_subs_add_unsubs(self):
+        websocket = FakeWebSocket()
+
+        async def run():
+            async with self.make_streamer(websocket) as streamer:
+                await streamer.level_one_equities(['AAPL', 'MSFT'], fields=['bidPrice', 'askPrice'])
+                await streamer.level_one_equities('SPY')
+                await streamer.chart_equity(['AAPL'])
+                await streamer.unsubscribe('LEVELONE_EQUITIES', ['MSFT'])
+                return dict(streamer.subscriptions)
+
+        subscriptions = asyncio.run(run())
+        subs, add, chart, unsubs = self.requests(websocket)[1:5]
+        self.assertEqual((subs['service'], subs['command']), ('LEVELONE_EQUITIES', 'SUBS'))
+        self.assertEqual(subs['parameters'], {'keys': 'AAPL,MSFT', 'fields': '0,1,2'})
+        self.assertEqual(add['command'], 'ADD')
+        self.assertEqual(add['parameters'], {'keys': 'SPY', 'fields': '0,1,2'})
+        self.assertEqual((chart['service'], chart['command']), ('CHART_EQUITY', 'SUBS'))
+        self.assertEqual(chart['parameters']['fields'], '0,1,2,3,4,5,6,7,8')
+        self.assertEqual(unsubs['command'], 'UNSUBS')
+        self.assertEqual(unsubs['parameters'], {'keys': 'MSFT'})
+        self.assertEqual(subscriptions['LEVELONE_EQUITIES']['keys'], ['AAPL', 'SPY'])
+
+    def test_callbacks_per_service_and_heartbeat(self):
+        websocket = FakeWebSocket()
+        equities, charts = [], []
+
+        async def on_chart(service, content, timestamp):
+            charts.append((service, content, timestamp))
+
+        async def run():
+            async with self.make_streamer(websocket) as streamer:
+                await streamer.level_one_equities(['AAPL'], callback=lambda *args: equities.append(args))
+                await streamer.chart_equity(['AAPL'], callback=on_chart)
+                streamer.add_handler('CHART_EQUITY', lambda *args: 1 / 0)
+                websocket.push({'notify': [{'heartbeat': '1700000000000'}]})
+                websocket.push({'data': [
+                    {'service': 'LEVELONE_EQUITIES', 'timestamp': 1, 'command': 'SUBS',
+                     'content': [{'key': 'AAPL', '1': 190.1, '2': 190.2}]},
+                    {'service': 'CHART_EQUITY', 'timestamp': 2, 'command': 'SUBS',
+                     'content': [{'key': 'AAPL', '0': 'AAPL', '4': 190.15, '7': 1700000000000}]},
+                ]})
+                for _ in range(50):
+                    if equities and charts:
+                        break
+                    await asyncio.sleep(0.01)
+                return streamer.last_heartbeat
+
+        with self.assertLogs('schwab_api.streamer', level='ERROR'):
+            heartbeat = asyncio.run(run())
+        self.assertEqual(heartbeat, 1700000000000)
+        self.assertEqual(equities, [('LEVELONE_EQUITIES', [{'key': 'AAPL', '1': 190.1, '2': 190.2}], 1)])
+        self.assertEqual(charts[0][1][0]['4'], 190.15)
+
+    def test_watchdog_closes_silent_connection(self):
+        websocket = FakeWebSocket()
+
+        async def run():
+            streamer = self.make_streamer(websocket, heartbeat_timeout=0.05, reconnect=False)
+            await streamer.start()
+            await asyncio.wait_for(streamer.wait_closed(), 1)
+            await streamer.stop()
+
+        asyncio.run(run())
+        self.assertTrue(websocket.closed)
+
+    def test_reconnect_restores_subscriptions(self):
+        sockets = [FakeWebSocket(), FakeWebSocket()]
+        gaps = []
+
+        connected = []
+
+        async def connect(url):
+            connected.append(url)
+            return sockets[len(connected) - 1]
+
+        async def run():
+            streamer = SchwabStreamer(self.auth, streamer_info=STREAMER_INFO, connect=connect,
+                                      retry_policy=RetryPolicy(backoff_factor=0))
+            streamer.add_gap_handler(gaps.append)
+            await streamer.start()
+            await streamer.level_one_equities(['AAPL'], fields=['lastPrice'])
+            await streamer.level_one_equities(['MSFT'])
+            await streamer.chart_equity(['SPY'])
+            sockets[0].push({'data': [{'service': 'CHART_EQUITY', 'timestamp': 1000, 'content': []}]})
+            await asyncio.sleep(0.01)
+            await sockets[0].close()
+            for _ in range(100):
+                if gaps:
+                    break
+                await asyncio.sleep(0.01)
+            await streamer.stop()
+            return streamer
+
+        streamer = asyncio.run(run())
+        self.assertEqual(streamer.reconnects, 1)
+        login, *subs, logout = self.requests(sockets[1])
+        self.assertEqual(login['command'], 'LOGIN')
+        self.assertEqual(logout['command'], 'LOGOUT')
+        self.assertEqual([(r['service'], r['command'], r['parameters']['keys'], r['parameters']['fields'])
+                          for r in subs],
+                         [('LEVELONE_EQUITIES', 'SUBS', 'AAPL,MSFT', '0,3'),
+                          ('CHART_EQUITY', 'SUBS', 'SPY', '0,1,2,3,4,5,6,7,8')])
+        self.assertEqual(len(gaps), 1)
+        self.assertEqual(gaps[0]['start'], 1000)
+        self.assertEqual(gaps[0]['attempts'], 1)
+        self.assertEqual(gaps[0]['subscriptions'], {'LEVELONE_EQUITIES': ['AAPL', 'MSFT'], 'CHART_EQUITY': ['SPY']})
+        self.assertIs(streamer.gaps[0], gaps[0])
+
+    def test_gives_up_after_max_attempts(self):
+        websocket = FakeWebSocket()
+        attempts = []
+
+        async def connect(url):
+            attempts.append(url)
+            if len(attempts) > 1:
+                raise OSError("connection refused")
+            return websocket
+
+        async def run():
+            streamer = SchwabStreamer(self.auth, streamer_info=STREAMER_INFO, connect=connect,
+                                      retry_policy=RetryPolicy(backoff_factor=0), max_reconnect_attempts=3)
+            await streamer.start()
+            await websocket.close()
+            return await asyncio.wait_for(streamer.wait_closed(), 1)
+
+        with self.assertLogs('schwab_api.streamer', level='ERROR'):
+            error = asyncio.run(run())
+        self.assertIsInstance(error, OSError)
+        self.assertEqual(len(attempts), 4)
+
+    def test_field_numbers(self):
+        self.assertEqual(field_numbers('LEVELONE_EQUITIES', ['askPrice', 1]), [0, 1, 2])
+        self.assertEqual(field_numbers('CHART_EQUITY', '4,7'), [0, 4, 7])
+        with self.assertRaises(ValueError):
+            field_numbers('LEVELONE_EQUITIES', ['nope'])
+        with self.assertRaises(ValueError):
+            field_numbers('QUOTE')
+
+
+if __name__ == '__main__':
+    unittest.main()